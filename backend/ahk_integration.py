@@ -278,7 +278,7 @@ class AhkToBoardTranslator:
 
         # Наполняем строки функций.
         for fn_name, fn in script.functions.items():
-            row = next((r for r in board.rows if r.id == function_row_ids[fn_name]), None)
+            row = board.find_row(function_row_ids[fn_name])
             if row is None:
                 continue
             for cmd in fn.body:
@@ -183,16 +183,57 @@ class TaskBoard:
     rows: List[TaskRow] = field(default_factory=list)
     created_at: datetime = field(default_factory=datetime.now)
     modified_at: datetime = field(default_factory=datetime.now)
+    # action_id -> строка; строится лениво и перестраивается при промахе,
+    # поэтому правки row.actions в обход доски его не ломают
+    _action_index: Dict[str, TaskRow] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # row_id -> позиция в rows; проверяется при обращении и перестраивается при промахе
+    _row_index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def add_row(self, row: TaskRow) -> None:
+        self._row_index[row.id] = len(self.rows)
         self.rows.append(row)
+        for action in row.actions:
+            self._action_index[action.id] = row
+
+    def _find_row_position(self, row_id: str) -> int:
+        i = self._row_index.get(row_id, -1)
+        if 0 <= i < len(self.rows) and self.rows[i].id == row_id:
+            return i
+        self._row_index = {r.id: i for i, r in enumerate(self.rows)}
+        return self._row_index.get(row_id, -1)
+
+    def find_row(self, row_id: str) -> Optional[TaskRow]:
+        """Строка по id или None"""
+        i = self._find_row_position(row_id)
+        return self.rows[i] if i >= 0 else None
 
     def remove_row(self, row_id: str) -> bool:
-        for i, row in enumerate(self.rows):
-            if row.id == row_id:
-                self.rows.pop(i)
-                return True
-        return False
+        i = self._find_row_position(row_id)
+        if i < 0:
+            return False
+        row = self.rows.pop(i)
+        # Позиции строк правее сдвинулись: индекс перестроится при следующем промахе
+        del self._row_index[row_id]
+        for action in row.actions:
+            if self._action_index.get(action.id) is row:
+                del self._action_index[action.id]
+        return True
+
+    def find_action_row(self, action_id: str) -> Optional[TaskRow]:
+        """Строка, содержащая действие, или None"""
+        row = self._action_index.get(action_id)
+        if row is not None and any(a.id == action_id for a in row.actions):
+            return row
+        self._action_index = {a.id: r for r in self.rows for a in r.actions}
+        return self._action_index.get(action_id)
+
+    def remove_action(self, action_id: str) -> Optional[TaskRow]:
+        """Удалить действие с доски; вернуть строку, из которой оно удалено"""
+        row = self.find_action_row(action_id)
+        if row is None or not row.remove_action(action_id):
+            return None
+        self._action_index.pop(action_id, None)
+        return row
 
     def get_all_actions(self) -> List[Action]:
         actions = []
@@ -862,11 +903,25 @@ class BackendApplication:
         if not self.current_board:
             raise ValueError("Нет активной доски")
 
-        for row in self.current_board.rows:
-            if row.id == row_id:
+        row = self.current_board.find_row(row_id)
+        if row is not None:
+            row.add_action(action)
+            self.current_board.modified_at = datetime.now()
+            return
+
+        raise ValueError(f"Строка {row_id} не найдена")
+
+    def add_actions(self, row_id: str, actions: List[Action]) -> None:
+        """Добавить несколько действий в строку за один поиск строки"""
+        if not self.current_board:
+            raise ValueError("Нет активной доски")
+
+        row = self.current_board.find_row(row_id)
+        if row is not None:
+            for action in actions:
                 row.add_action(action)
-                self.current_board.modified_at = datetime.now()
-                return
+            self.current_board.modified_at = datetime.now()
+            return
 
         raise ValueError(f"Строка {row_id} не найдена")
 
@@ -257,11 +257,7 @@ class RunRowHandler(BaseActionHandler):
                     error="Доска не доступна для запуска строки"
                 )
 
-            target_row = None
-            for row in board.rows:
-                if row.id == row_id:
-                    target_row = row
-                    break
+            target_row = board.find_row(row_id)
 
             if not target_row:
                 return ExecutionResult(
@@ -0,0 +1,58 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtWidgets import QApplication, QWidget
+    from ui.action_property_panels import PANELS, BaseActionPanel, get_panel
+    HAS_PYQT = True
+except ModuleNotFoundError:
+    HAS_PYQT = False
+
+from backend import ActionType
+
+
+@unittest.skipUnless(HAS_PYQT, "PyQt6 is not installed in the current environment")
+class TestActionPropertyPanels(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_every_panel_round_trips_its_values(self):
+        parent = QWidget()
+        try:
+            for action_type, panel_class in PANELS.items():
+                with self.subTest(action_type=action_type):
+                    self.assertTrue(issubclass(panel_class, BaseActionPanel))
+                    panel = get_panel(action_type)
+                    widget = panel.create_panel(parent)
+                    widget.setParent(parent)
+                    values = panel.get_values()
+                    self.assertIsInstance(values, dict)
+                    panel.set_values(values)
+                    self.assertEqual(panel.get_values(), values)
+        finally:
+            parent.deleteLater()
+
+    def test_any_change_toggle_disables_color_fields(self):
+        parent = QWidget()
+        try:
+            panel = get_panel(ActionType.WAIT_PIXEL_COLOR)
+            panel.create_panel(parent).setParent(parent)
+            panel.any_change_check.setChecked(True)
+            self.assertFalse(panel.color_r.isEnabled())
+            self.assertFalse(panel.tolerance_spin.isEnabled())
+            panel.any_change_check.setChecked(False)
+            self.assertTrue(panel.color_r.isEnabled())
+        finally:
+            parent.deleteLater()
+
+    def test_unknown_type_has_no_panel(self):
+        missing = [t for t in ActionType if t not in PANELS]
+        for action_type in missing:
+            self.assertIsNone(get_panel(action_type))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -223,6 +223,45 @@ class TestTaskBoard(unittest.TestCase):
         self.assertEqual(len(result["rows"]), 1)
         self.assertEqual(len(result["rows"][0]["actions"]), 1)
 
+    def test_remove_action_finds_row_by_index(self):
+        """Удаление действия по индексу action_id -> строка"""
+        board = TaskBoard(id="board_5", name="Доска")
+        row1 = TaskRow(id="row_1", name="Строка 1")
+        row1.add_action(Action(id="act_1", action_type=ActionType.MOUSE_CLICK, name="Клик"))
+        row2 = TaskRow(id="row_2", name="Строка 2")
+        board.add_row(row1)
+        board.add_row(row2)
+        # действие добавлено в обход доски — индекс перестраивается при промахе
+        row2.add_action(Action(id="act_2", action_type=ActionType.WAIT_TIME, name="Ожидание"))
+        # перенос между строками тоже не ломает поиск
+        row1.actions.append(row2.actions.pop())
+
+        self.assertIs(board.find_action_row("act_2"), row1)
+        self.assertIs(board.remove_action("act_2"), row1)
+        self.assertEqual([a.id for a in row1.actions], ["act_1"])
+        self.assertIsNone(board.remove_action("act_2"))
+        self.assertIsNone(board.find_action_row("missing"))
+
+        board.remove_row("row_1")
+        self.assertIsNone(board.remove_action("act_1"))
+
+    def test_find_and_remove_row_by_index(self):
+        """Поиск и удаление строки по индексу row_id -> позиция"""
+        board = TaskBoard(id="board_6", name="Доска")
+        for i in range(4):
+            board.add_row(TaskRow(id=f"row_{i}", name=f"Строка {i}"))
+
+        self.assertEqual(board.find_row("row_2").name, "Строка 2")
+        self.assertTrue(board.remove_row("row_1"))
+        self.assertFalse(board.remove_row("row_1"))
+        # позиции правее сдвинулись — индекс перестраивается при промахе
+        self.assertIs(board.find_row("row_3"), board.rows[2])
+        # строки, переставленные в обход доски, тоже находятся
+        board.rows.reverse()
+        self.assertTrue(board.remove_row("row_0"))
+        self.assertEqual([r.id for r in board.rows], ["row_3", "row_2"])
+        self.assertIsNone(board.find_row("missing"))
+
 
 # =============================================================================
 # ТЕСТЫ ОБРАБОТЧИКОВ ДЕЙСТВИЙ
@@ -581,6 +620,21 @@ class TestBackendApplication(unittest.TestCase):
                 name="Клик"
             ))
 
+    def test_add_actions_bulk(self):
+        """Пакетное добавление действий сохраняет порядок"""
+        self.app.create_board("Доска")
+        row = self.app.add_row("Строка")
+        actions = [
+            Action(id=f"act_{i}", action_type=ActionType.WAIT_TIME, name="Ожидание")
+            for i in range(3)
+        ]
+
+        self.app.add_actions(row.id, actions)
+        self.assertEqual([a.id for a in row.actions], ["act_0", "act_1", "act_2"])
+
+        with self.assertRaises(ValueError):
+            self.app.add_actions("nonexistent_row", actions)
+
     def test_save_and_load_board(self):
         """Сохранение и загрузка доски"""
         import tempfile
@@ -28,6 +28,25 @@ class TestRecordingBuffer(unittest.TestCase):
         self.assertEqual(len(produced), 1)
         self.assertEqual(produced[0].type, "double_click")
 
+    def test_double_click_radius(self):
+        b = ActionBuffer(min_wait_ms=50, double_click_ms=350)
+        b.feed({"type": "click", "button": "left", "x": 100, "y": 100, "ts": 1000})
+        produced = b.feed({"type": "click", "button": "left", "x": 104, "y": 104, "ts": 1100})
+        self.assertEqual([e.type for e in produced], ["double_click"])
+
+        produced = b.feed({"type": "click", "button": "left", "x": 200, "y": 200, "ts": 2000})
+        produced.extend(b.feed({"type": "click", "button": "left", "x": 206, "y": 200, "ts": 2100}))
+        produced.extend(b.flush())
+        self.assertNotIn("double_click", [e.type for e in produced])
+
+    def test_different_buttons_never_merge(self):
+        b = ActionBuffer(min_wait_ms=50, double_click_ms=350)
+        produced = b.feed({"type": "click", "button": "left", "x": 10, "y": 10, "ts": 1000})
+        produced.extend(b.feed({"type": "click", "button": "right", "x": 10, "y": 10, "ts": 1050}))
+        produced.extend(b.flush())
+        clicks = [(e.type, e.button) for e in produced if e.type != "wait"]
+        self.assertEqual(clicks, [("click", "left"), ("click", "right")])
+
     def test_flush_single_click(self):
         b = ActionBuffer(min_wait_ms=50, double_click_ms=350)
         produced = []
@@ -36,6 +55,70 @@ class TestRecordingBuffer(unittest.TestCase):
         self.assertEqual(len(produced), 1)
         self.assertEqual(produced[0].type, "click")
 
+    def test_key_and_unknown_events_flush_pending_click(self):
+        b = ActionBuffer(min_wait_ms=50, double_click_ms=350)
+        produced = []
+        produced.extend(b.feed({"type": "click", "button": "left", "x": 1, "y": 2, "ts": 1000}))
+        produced.extend(b.feed({"type": "key", "key": "a", "ts": 1100}))
+        produced.extend(b.feed({"type": "click", "button": "right", "x": 3, "y": 4, "ts": 1120}))
+        produced.extend(b.feed({"type": "move", "ts": 1130}))
+
+        self.assertEqual([e.type for e in produced], ["click", "wait", "key", "click"])
+
+    def test_max_events_keeps_latest(self):
+        b = ActionBuffer(min_wait_ms=50, double_click_ms=350, max_events=2)
+        for ts, key in ((1000, "a"), (1010, "b"), (1020, "c")):
+            b.feed({"type": "key", "key": key, "ts": ts})
+        self.assertEqual([e.key for e in b.events()], ["b", "c"])
+        self.assertEqual(len(b), 2)
+
+    def test_reset_recycles_events(self):
+        b = ActionBuffer(min_wait_ms=50, double_click_ms=350)
+        b.feed({"type": "key", "key": "a", "ts": 1000})
+        b.feed({"type": "key", "key": "b", "ts": 1200})
+        old = b.events()
+        b.reset()
+        self.assertEqual(len(b), 0)
+
+        produced = b.feed({"type": "click", "button": "right", "x": 5, "y": 6, "ts": 5000})
+        produced.extend(b.flush())
+        self.assertEqual(len(produced), 1)
+        event = produced[0]
+        self.assertTrue(any(event is o for o in old))
+        self.assertEqual(
+            (event.type, event.button, event.x, event.y, event.key, event.delay_before),
+            ("click", "right", 5, 6, "", 0),
+        )
+
+
+@unittest.skipUnless(HAS_PYQT, "PyQt6 is not installed in the current environment")
+class TestRecordedActionFactories(unittest.TestCase):
+    """Позиционные фабрики должны совпадать с построением Action по именам полей."""
+
+    def test_factories_match_keyword_construction(self):
+        from backend import Action, ActionType, Coordinates
+        from ui.recording_manager import _make_click_action, _make_key_action, _make_wait_action
+
+        self.assertEqual(
+            _make_wait_action("w", 120),
+            Action(id="w", action_type=ActionType.WAIT_TIME, name="WAIT 120ms", delay_before_ms=120),
+        )
+        self.assertEqual(
+            _make_click_action("c", "Двойной клик", 5, 6, "right", 2),
+            Action(
+                id="c",
+                action_type=ActionType.MOUSE_CLICK,
+                name="Двойной клик",
+                coordinates=Coordinates(5, 6),
+                mouse_button="right",
+                metadata={"click_count": 2},
+            ),
+        )
+        self.assertEqual(
+            _make_key_action("k", "ctrl+s"),
+            Action(id="k", action_type=ActionType.KEY_PRESS, name="Клавиша: ctrl+s", key="ctrl+s"),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
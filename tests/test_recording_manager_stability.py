@@ -1,15 +1,20 @@
 import os
+import socket
+import sys
+import time
 import unittest
+import uuid
 from unittest.mock import patch
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 from PyQt6.QtCore import QThread, QTimer, pyqtSignal
 from PyQt6.QtWidgets import QApplication, QMainWindow
 
 from backend import BackendApplication
 from backend.core import IDatabaseService, IKeyboardService, IMouseService, IScreenService
-from ui.recording_manager import RecordingManager
+from ui.recording_manager import InputListenerThread, RecordingManager
 
 
 class _DummyMouse(IMouseService):
@@ -78,6 +83,9 @@ class _FakeInputListenerThread(QThread):
     def stop(self):
         return None
 
+    def shutdown(self):
+        return None
+
     def wait(self, msecs: int = 0):
         return True
 
@@ -140,6 +148,265 @@ class TestRecordingManagerStability(unittest.TestCase):
         board = self.backend.current_board
         self.assertIsNotNone(board)
         self.assertGreaterEqual(len(board.rows), 1)
+        recorded = board.rows[-1].actions
+        self.assertEqual([a.coordinates.to_tuple() for a in recorded], [(12, 34)])
+
+    def test_hud_updates_are_coalesced(self):
+        from ui.recording_manager import RecordingEvent
+
+        captured = []
+        self.manager.hud_updated.connect(captured.append)
+        for ts in (1000, 1010, 1020):
+            self.manager._update_hud(RecordingEvent(type="key", ts=ts, key="a"))
+        self.assertEqual(captured, [])
+
+        deadline = time.monotonic() + 1.0
+        while not captured and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        self._drain_events()
+
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(captured[0]["ts"], 1020)
+
+    @patch("ui.recording_manager.InputListenerThread", _FakeInputListenerThread)
+    def test_board_has_recorded_actions_when_hud_updates(self):
+        _FakeInputListenerThread.scenario = "idle"
+        seen = []
+        self.manager.hud_updated.connect(
+            lambda _event: seen.append(len(self.backend.current_board.find_row(self.manager.target_row_id).actions))
+        )
+        self.manager.start()
+        self.manager._on_raw_event({"type": "click", "x": 5, "y": 6, "button": "left", "ts": 1000})
+        self.manager._on_raw_event({"type": "move", "ts": 1500})
+        # Событие пришло сразу после тика таймера действий: он сработает позже HUD
+        self.manager._action_flush_timer.start()
+
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+        self.assertEqual(seen, [1])
+        row = self.backend.current_board.find_row(self.manager.target_row_id)
+        self.assertEqual([a.coordinates.to_tuple() for a in row.actions], [(5, 6)])
+        self.manager.stop()
+
+    @patch("ui.recording_manager.InputListenerThread", _FakeInputListenerThread)
+    def test_debug_flag_follows_logger_level_on_start(self):
+        import logging
+        from ui import recording_manager
+
+        _FakeInputListenerThread.scenario = "idle"
+        rm_logger = logging.getLogger(recording_manager.__name__)
+        previous = rm_logger.level
+        rm_logger.setLevel(logging.DEBUG)
+        try:
+            self.manager.start()
+            self.assertTrue(recording_manager._DEBUG)
+            self.manager.stop()
+        finally:
+            rm_logger.setLevel(previous)
+            recording_manager._refresh_debug_flag()
+        self.assertEqual(recording_manager._DEBUG, rm_logger.isEnabledFor(logging.DEBUG))
+
+    def test_recorded_action_ids_are_unique_uuid4(self):
+        ids = [self.manager._next_id() for _ in range(1500)]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(all(uuid.UUID(i).version == 4 for i in ids))
+
+
+class TestMiniActionHUD(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_text_keeps_last_lines_in_order(self):
+        from ui.recording_manager import MiniActionHUD, RecordingEvent
+
+        hud = MiniActionHUD(max_lines=3)
+        for ts, key in enumerate(["a", "", "b", "c", "d"]):
+            hud.add_event(RecordingEvent(type="key", ts=ts, key=key))
+        hud._flush()
+
+        self.assertEqual(hud.body.text(), "B\nC\nD")
+        hud.deleteLater()
+
+    def test_single_line_ring(self):
+        from ui.recording_manager import MiniActionHUD, RecordingEvent
+
+        hud = MiniActionHUD(max_lines=1)
+        for ts, key in enumerate(["a", "b", "c"]):
+            hud.add_event(RecordingEvent(type="key", ts=ts, key=key))
+        hud._flush()
+
+        self.assertEqual(hud.body.text(), "C")
+        hud.deleteLater()
+
+
+class _ScriptedListener(InputListenerThread):
+    """Listener, запускающий вместо pynput-воркера короткий скрипт."""
+
+    script = ""
+
+    def _worker_command(self, ipc_fd):
+        if ipc_fd is None:
+            open_channel = "worker._open_shared_channel(sys.stdin.buffer.read())\n"
+        else:
+            open_channel = "worker._open_channel(int(sys.argv[1]))\n"
+        prelude = (
+            "import sys, time\n"
+            f"sys.path.insert(0, {_PROJECT_ROOT!r})\n"
+            "from ui import recording_listener_worker as worker\n"
+            + open_channel
+        )
+        return [sys.executable, "-c", prelude + self.script, str(ipc_fd)]
+
+
+class TestInputListenerWorkerIO(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def _run_until_stopped(self, listener, timeout_s: float = 5.0):
+        codes = []
+        listener.listener_stopped.connect(codes.append)
+        listener.start()
+        deadline = time.monotonic() + timeout_s
+        while not codes and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        listener.shutdown()
+        return codes
+
+    def test_frames_split_across_writes_are_reassembled(self):
+        listener = _ScriptedListener()
+        listener.script = (
+            "body = worker._dumps({'type': 'event', 'event': {'type': 'key', 'key': 'я', 'ts': 1}})\n"
+            "frame = worker._FRAME_HEADER.pack(len(body)) + body\n"
+            "worker._channel.sendall(frame[:3])\n"
+            "time.sleep(0.05)\n"
+            "worker._channel.sendall(frame[3:])\n"
+            "worker._emit({'type': 'stop_requested'})\n"
+        )
+        events, stops = [], []
+        listener.input_event.connect(events.append)
+        listener.stop_requested.connect(lambda: stops.append(True))
+
+        codes = self._run_until_stopped(listener)
+
+        self.assertEqual(codes, [0])
+        self.assertEqual(events, [{"type": "key", "key": "я", "ts": 1}])
+        self.assertEqual(stops, [True])
+
+    @unittest.skipUnless(hasattr(socket.socket, "share"), "socket.share() is Windows-only")
+    def test_shared_socket_channel(self):
+        listener = _ScriptedListener()
+        listener.script = "worker._emit({'type': 'event', 'event': {'type': 'key', 'key': 'a', 'ts': 1}})\n"
+        events = []
+        listener.input_event.connect(events.append)
+
+        with patch("ui.recording_manager._PASS_FDS", False):
+            codes = self._run_until_stopped(listener)
+
+        self.assertEqual(codes, [0])
+        self.assertEqual(events, [{"type": "key", "key": "a", "ts": 1}])
+
+    def test_worker_command_selects_channel_transport(self):
+        listener = InputListenerThread()
+        self.assertEqual(listener._worker_command(7)[-2:], ["--ipc-fd", "7"])
+        command = listener._worker_command(None)
+        self.assertEqual(command[-1], "--ipc-share")
+        self.assertNotIn("--ipc-fd", command)
+
+    def test_nonzero_exit_reports_stderr_tail(self):
+        listener = _ScriptedListener()
+        listener.script = "sys.stderr.write('worker boom'); sys.exit(3)"
+        errors = []
+        listener.listener_error.connect(errors.append)
+
+        codes = self._run_until_stopped(listener)
+
+        self.assertEqual(codes, [3])
+        self.assertTrue(errors)
+        self.assertIn("worker boom", errors[0])
+
+    def test_stderr_thread_fallback_reports_stderr_tail(self):
+        listener = _ScriptedListener()
+        listener.script = "sys.stderr.write('worker boom'); sys.exit(3)"
+        errors = []
+        listener.listener_error.connect(errors.append)
+
+        with patch("ui.recording_manager._SELECT_PIPES", False):
+            codes = self._run_until_stopped(listener)
+
+        self.assertEqual(codes, [3])
+        self.assertTrue(errors)
+        self.assertIn("worker boom", errors[0])
+
+    def test_worker_stays_alive_between_sessions(self):
+        listener = _ScriptedListener()
+        listener.script = (
+            "for command in worker._read_commands():\n"
+            "    worker._emit({'type': 'event', 'event': {'type': 'key', 'key': command['cmd'], 'ts': 1}})\n"
+            "    if command['cmd'] == 'exit':\n"
+            "        break\n"
+        )
+        keys = []
+        listener.input_event.connect(lambda event: keys.append(event["key"]))
+
+        listener.start()
+        pid = listener._process.pid
+        listener.stop()
+        listener.start()
+        deadline = time.monotonic() + 5.0
+        while len(keys) < 3 and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+        self.assertEqual(keys, ["start", "stop", "start"])
+        self.assertEqual(listener._process.pid, pid)
+        proc = listener._process
+        listener.shutdown()
+        self.assertEqual(proc.returncode, 0)
+
+    def test_respawn_after_worker_died_ignores_stale_channel_close(self):
+        listener = _ScriptedListener()
+        listener.script = "pass"
+        stopped, keys = [], []
+        listener.listener_stopped.connect(stopped.append)
+        listener.input_event.connect(lambda event: keys.append(event["key"]))
+
+        listener.start()
+        old_proc = listener._process
+        old_thread = listener._reader_thread
+        old_proc.wait(timeout=5.0)
+        # channel_closed старого читателя ещё не доставлен: события не обрабатывались
+        listener.script = (
+            "for command in worker._read_commands():\n"
+            "    worker._emit({'type': 'event', 'event': {'type': 'key', 'key': command['cmd'], 'ts': 1}})\n"
+            "    if command['cmd'] == 'exit':\n"
+            "        break\n"
+        )
+        listener.start()
+        self.assertFalse(old_thread.isRunning())
+        self.assertIsNot(listener._process, old_proc)
+
+        checks = []
+        listener._check_process_exit = lambda: checks.append(True)
+        deadline = time.monotonic() + 5.0
+        while not keys and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        for _ in range(10):
+            self.app.processEvents()
+            time.sleep(0.005)
+
+        self.assertEqual(keys, ["start"])
+        self.assertEqual(checks, [])
+        self.assertEqual(stopped, [])
+        self.assertTrue(listener.is_running())
+        listener.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,355 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtTest import QTest
+    from PyQt6.QtWidgets import QApplication
+    from ui.right_panel import RightPanel
+    HAS_PYQT = True
+except ModuleNotFoundError:
+    HAS_PYQT = False
+
+from backend import Action, ActionType, BackendApplication, Coordinates, TaskRow
+from backend.core import IDatabaseService, IKeyboardService, IMouseService, IScreenService
+
+
+class _DummyMouse(IMouseService):
+    def get_position(self):
+        return Coordinates(7, 9)
+
+    def move_to(self, x: int, y: int, duration_ms: int = 0):
+        return None
+
+    def click(self, button: str = "left"):
+        return None
+
+
+class _DummyKeyboard(IKeyboardService):
+    def press(self, key: str):
+        return None
+
+    def press_hotkey(self, keys):
+        return None
+
+
+class _DummyScreen(IScreenService):
+    def get_pixel_color(self, x: int, y: int):
+        return None
+
+    def take_screenshot(self, region=None):
+        return None
+
+    def find_image(self, template_path: str, threshold: float = 0.9):
+        return None
+
+
+class _DummyDb(IDatabaseService):
+    def add_database(self, name: str, filepath: str):
+        return None
+
+    def search(self, database_name: str, query: str):
+        return []
+
+    def get_value(self, database_name: str, row: int, column: str):
+        return None
+
+    def get_columns(self, database_name: str):
+        return []
+
+
+@unittest.skipUnless(HAS_PYQT, "PyQt6 is not installed in the current environment")
+class TestRightPanel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.backend = BackendApplication(
+            mouse=_DummyMouse(),
+            keyboard=_DummyKeyboard(),
+            screen=_DummyScreen(),
+            database=_DummyDb(),
+        )
+        self.panel = RightPanel(self.backend)
+
+    def tearDown(self):
+        self.panel.deleteLater()
+        self.backend.shutdown()
+        self.app.processEvents()
+
+    def _click_action(self, x: int = 10, y: int = 20) -> Action:
+        return Action(
+            id="a1",
+            action_type=ActionType.MOUSE_CLICK,
+            name="Клик",
+            coordinates=Coordinates(x, y),
+            delay_before_ms=15,
+        )
+
+    def test_pages_are_built_on_first_use(self):
+        self.assertIsNone(self.panel.properties_widget)
+        self.assertIsNone(self.panel.row_properties_widget)
+
+        self.panel.set_action(self._click_action())
+        self.assertIs(self.panel.stack.currentWidget(), self.panel.properties_widget)
+        self.assertIsNone(self.panel.row_properties_widget)
+
+        self.panel.set_row(TaskRow(id="r1", name="Строка"))
+        self.assertIs(self.panel.stack.currentWidget(), self.panel.row_properties_widget)
+        self.assertEqual(self.panel.row_name_input.text(), "Строка")
+
+    def test_layouts_are_enabled_after_build(self):
+        self.panel.set_action(self._click_action())
+        self.assertTrue(self.panel.add_action_widget.layout().isEnabled())
+        self.assertTrue(self.panel.properties_widget.layout().isEnabled())
+        self.assertTrue(self.panel.prop_content_layout.isEnabled())
+
+    def test_selection_change_restores_updates(self):
+        self.panel.set_action(self._click_action())
+        self.assertTrue(self.panel.updatesEnabled())
+        self.panel.set_row(TaskRow(id="r1", name="Строка"))
+        self.assertTrue(self.panel.updatesEnabled())
+        self.assertTrue(self.panel.prop_content.updatesEnabled())
+
+    def test_set_action_shows_action_values(self):
+        self.panel.set_action(self._click_action(10, 20))
+        self.assertEqual((self.panel.prop_x_spin.value(), self.panel.prop_y_spin.value()), (10, 20))
+        self.assertEqual(self.panel.prop_delay_before_spin.value(), 15)
+
+    def test_spin_edits_are_applied_in_one_batch(self):
+        action = self._click_action(10, 20)
+        self.panel.set_action(action)
+        modified = []
+        self.panel.action_modified.connect(modified.append)
+
+        for value in (11, 12, 13):
+            self.panel.prop_x_spin.setValue(value)
+        self.panel.prop_repeat_spin.setValue(3)
+        self.assertEqual(modified, [])
+        self.assertEqual(action.coordinates.x, 10)
+
+        self.panel._spin_debounce.timeout.emit()
+        self.assertEqual((action.coordinates.x, action.repeat_count), (13, 3))
+        self.panel._emit_timer.timeout.emit()
+        self.assertEqual(modified, [action])
+
+    def test_spin_editing_finished_applies_immediately(self):
+        action = self._click_action(10, 20)
+        self.panel.set_action(action)
+        spin = self.panel.prop_delay_after_spin
+        self.assertFalse(spin.keyboardTracking())
+
+        spin.setValue(250)
+        spin.editingFinished.emit()
+        self.assertEqual(action.delay_after_ms, 250)
+        self.assertFalse(self.panel._spin_debounce.isActive())
+
+    def test_unchanged_values_do_not_notify(self):
+        action = self._click_action(10, 20)
+        self.panel.set_action(action)
+        modified = []
+        self.panel.action_modified.connect(modified.append)
+
+        self.panel.prop_x_spin.setValue(11)
+        self.panel.prop_x_spin.setValue(10)
+        self.panel._flush_pending_spin()
+        self.panel._queue_text("name", "Клик")
+        self.panel._flush_pending_text()
+        self.panel._on_enabled_changed(True)
+
+        self.assertFalse(self.panel._emit_timer.isActive())
+        self.panel._emit_pending_modified()
+        self.assertEqual(modified, [])
+
+    def test_capture_updates_action_once(self):
+        action = self._click_action(10, 20)
+        self.panel.set_action(action)
+        modified = []
+        self.panel.action_modified.connect(modified.append)
+
+        self.panel._capture_coordinates()
+
+        self.assertEqual(action.coordinates.to_tuple(), (7, 9))
+        self.assertEqual(self.panel.prop_x_spin.value(), 7)
+        self.assertEqual(modified, [action])
+        self.assertFalse(self.panel._spin_debounce.isActive())
+
+    def test_capture_in_add_mode_fills_add_form(self):
+        captured = []
+        self.panel.coordinates_captured.connect(lambda x, y: captured.append((x, y)))
+
+        self.panel._capture_coordinates()
+
+        self.assertIsNone(self.panel.prop_x_spin)
+        self.assertEqual((self.panel.x_spin.value(), self.panel.y_spin.value()), (7, 9))
+        self.assertEqual(captured, [(7, 9)])
+
+    def test_capture_shortcut_is_application_wide(self):
+        shortcut = self.panel.capture_shortcut
+        self.assertEqual(shortcut.context(), Qt.ShortcutContext.ApplicationShortcut)
+        shortcut.activated.emit()
+        self.assertEqual((self.panel.x_spin.value(), self.panel.y_spin.value()), (7, 9))
+
+    def test_type_panel_is_reused_and_metadata_kept_per_action(self):
+        first = self._click_action()
+        first.metadata = {"click_count": 2}
+        second = Action(id="a2", action_type=ActionType.MOUSE_CLICK, name="Второй", coordinates=Coordinates(1, 1))
+
+        self.panel.set_action(first)
+        panel = self.panel.current_action_panel
+        self.assertEqual(panel.clicks_spin.value(), 2)
+
+        self.panel.set_action(second)
+        self.assertIs(self.panel.current_action_panel, panel)
+        self.assertEqual(panel.clicks_spin.value(), 1)  # значения по умолчанию, не от first
+        self.assertEqual(first.metadata["click_count"], 2)
+
+    def test_name_is_applied_when_editing_finishes(self):
+        action = self._click_action()
+        self.panel.set_action(action)
+        modified = []
+        self.panel.action_modified.connect(modified.append)
+
+        QTest.keyClicks(self.panel.prop_name_input, "abc")
+        self.assertEqual(modified, [])
+        self.assertEqual(action.name, "Клик")
+
+        self.panel.prop_name_input.editingFinished.emit()
+        self.assertEqual(action.name, "Кликabc")
+        self.panel._emit_timer.timeout.emit()
+        self.assertEqual(modified, [action])
+
+    def test_pending_row_name_is_kept_on_selection_change(self):
+        row = TaskRow(id="r1", name="Строка")
+        self.panel.set_row(row)
+        QTest.keyClicks(self.panel.row_name_input, "1")
+
+        self.panel.set_action(self._click_action())
+        self.assertEqual(row.name, "Строка1")
+        self.assertFalse(self.panel._text_debounce.isActive())
+
+    def test_set_row_does_not_echo_modified(self):
+        modified = []
+        self.panel.row_modified.connect(modified.append)
+        row = TaskRow(id="r1", name="Строка", enabled=False)
+
+        self.panel.set_row(row)
+        self.assertEqual(modified, [])
+        self.assertFalse(self.panel.row_enabled_cb.isChecked())
+
+        self.panel.row_enabled_cb.setChecked(True)
+        self.assertTrue(row.enabled)
+        self.panel._emit_timer.timeout.emit()
+        self.assertEqual(modified, [row])
+
+    def test_enabled_toggles_are_coalesced(self):
+        action = self._click_action()
+        self.panel.set_action(action)
+        modified = []
+        self.panel.action_modified.connect(modified.append)
+
+        self.panel.prop_enabled_cb.setChecked(False)
+        self.assertFalse(action.enabled)
+        self.panel.prop_enabled_cb.setChecked(True)
+        self.assertTrue(action.enabled)
+        self.assertEqual(modified, [])
+
+        self.panel.reset()
+        self.assertEqual(modified, [action])
+        self.assertFalse(self.panel._emit_timer.isActive())
+
+    def test_same_type_selection_skips_panel_lookup(self):
+        self.panel.set_action(self._click_action())
+        calls = []
+        original = self.panel._cached_panel
+        self.panel._cached_panel = lambda *args: calls.append(args[-1]) or original(*args)
+
+        shown = []
+        show_type = self.panel._show_properties_type
+        self.panel._show_properties_type = lambda t: shown.append(t) or show_type(t)
+
+        second = Action(id="a2", action_type=ActionType.MOUSE_CLICK, name="Второй", coordinates=Coordinates(3, 4))
+        self.panel.set_action(second)
+        self.assertEqual(calls, [])
+        self.assertEqual(shown, [])
+        self.assertEqual(self.panel.prop_x_spin.value(), 3)
+        self.panel.set_action(Action(id="a3", action_type=ActionType.KEY_PRESS, name="Клавиша"))
+        self.assertEqual(calls, [ActionType.KEY_PRESS])
+        self.assertEqual(shown, [ActionType.KEY_PRESS])
+
+    def test_action_type_model_is_shared(self):
+        other = RightPanel(self.backend)
+        try:
+            self.assertIs(other.action_type_combo.model(), self.panel.action_type_combo.model())
+            combo = self.panel.action_type_combo
+            self.panel.select_action_type(ActionType.LOOP)
+            self.assertIs(combo.currentData(), ActionType.LOOP)
+            self.assertEqual(other.action_type_combo.currentData(), ActionType.MOUSE_CLICK)
+        finally:
+            other.deleteLater()
+
+    def test_add_mode_panel_follows_combo(self):
+        self.panel.select_action_type(ActionType.KEY_PRESS)
+        key_panel = self.panel.add_action_panel
+        self.assertIn("press_count", key_panel.get_values())
+
+        self.panel.select_action_type(ActionType.MOUSE_CLICK)
+        self.panel.select_action_type(ActionType.KEY_PRESS)
+        self.assertIs(self.panel.add_action_panel, key_panel)
+        pages = self.panel.add_dynamic_stack.count()
+        self.panel.select_action_type(ActionType.MOUSE_CLICK)
+        self.assertEqual(self.panel.add_dynamic_stack.count(), pages)
+
+    def test_type_search_selects_matching_type(self):
+        search = self.panel.action_type_search
+        search.completer().activated.emit("📸 Скриншот")
+        self.assertIs(self.panel.action_type_combo.currentData(), ActionType.SCREENSHOT)
+
+        search.setText("цикл")
+        search.completer().setCompletionPrefix("цикл")
+        search.returnPressed.emit()
+        self.assertIs(self.panel.action_type_combo.currentData(), ActionType.LOOP)
+
+    def test_added_actions_get_distinct_coordinates(self):
+        added = []
+        self.panel.action_added.connect(added.append)
+
+        self.panel._add_action()
+        self.panel._add_action()
+
+        first, second = added
+        self.assertEqual(len(first.id), 32)
+        self.assertNotEqual(first.id, second.id)
+        self.assertIsNot(first.coordinates, second.coordinates)
+        self.assertEqual(first.name, "Клик")
+
+    def test_delete_action_removes_it_from_board(self):
+        board = self.backend.create_board("Доска")
+        row = self.backend.add_row()
+        action = self._click_action()
+        self.backend.add_action(row.id, action)
+        stamp = board.modified_at
+        modified = []
+        self.panel.action_modified.connect(modified.append)
+
+        self.panel.set_action(action)
+        self.panel._on_delete_action()
+
+        self.assertEqual(row.actions, [])
+        self.assertEqual(modified, [action])
+        self.assertGreaterEqual(board.modified_at, stamp)
+        self.assertIsNone(self.panel.current_action)
+
+    def test_select_action_type_matches_combo_rows(self):
+        combo = self.panel.action_type_combo
+        for action_type in (ActionType.RUN_ROW, ActionType.DB_SAVE, ActionType.MOUSE_CLICK):
+            self.panel.select_action_type(action_type)
+            self.assertIs(combo.currentData(), action_type)
+            self.assertEqual(combo.currentIndex(), combo.findData(action_type))
+
+
+if __name__ == "__main__":
+    unittest.main()
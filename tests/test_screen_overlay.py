@@ -0,0 +1,127 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtCore import QEvent, QPoint, QPointF, Qt
+    from PyQt6.QtGui import QCursor, QImage, QMouseEvent, QPainter
+    from PyQt6.QtWidgets import QApplication
+    from ui.screen_overlay import ScreenOverlay, _coord_text
+    HAS_PYQT = True
+except ModuleNotFoundError:
+    HAS_PYQT = False
+
+from backend import Coordinates
+
+
+class _Mouse:
+    def __init__(self):
+        self.pos = Coordinates(100, 100)
+
+    def get_position(self):
+        return self.pos
+
+
+class _Backend:
+    def __init__(self):
+        self.mouse = _Mouse()
+
+
+@unittest.skipUnless(HAS_PYQT, "PyQt6 is not installed in the current environment")
+class TestScreenOverlay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        QCursor.setPos(QPoint(100, 100))
+        self.backend = _Backend()
+        self.overlay = ScreenOverlay(self.backend, interactive=False)
+        self.updates = []
+        self.overlay.update = lambda *args: self.updates.append(args)
+
+    def tearDown(self):
+        self.overlay.close()
+        self.overlay.deleteLater()
+        self.app.processEvents()
+
+    def test_idle_mouse_does_not_repaint(self):
+        self.overlay._update_mouse_pos()
+        self.assertEqual(len(self.updates), 1)
+
+        self.overlay._update_mouse_pos()
+        self.assertEqual(len(self.updates), 1)
+
+        QCursor.setPos(QPoint(150, 120))
+        self.overlay._update_mouse_pos()
+        self.assertEqual(len(self.updates), 2)
+        self.assertEqual(self.overlay.mouse_pos, self.overlay.mapFromGlobal(QPoint(150, 120)))
+
+    def test_repaint_is_limited_to_dirty_region(self):
+        self.overlay._update_mouse_pos()
+        (dirty,) = self.updates[-1]
+        expected = self.overlay.mapFromGlobal(QPoint(100, 100))
+        self.assertTrue(dirty.contains(expected))
+        self.assertTrue(dirty.contains(QPoint(20, 20)))
+        self.assertNotEqual(dirty.boundingRect(), self.overlay.rect())
+
+    def test_far_jump_repaints_only_both_crosshairs(self):
+        self.overlay._update_mouse_pos()
+        QCursor.setPos(QPoint(500, 500))
+        self.overlay._update_mouse_pos()
+        (dirty,) = self.updates[-1]
+        old = self.overlay.mapFromGlobal(QPoint(100, 100))
+        new = self.overlay.mapFromGlobal(QPoint(500, 500))
+        self.assertTrue(dirty.contains(old))
+        self.assertTrue(dirty.contains(new))
+        self.assertFalse(dirty.contains((old + new) / 2))
+
+    def test_paint_renders_overlay(self):
+        self.overlay._update_mouse_pos()
+        image = self.overlay.grab().toImage()
+        self.assertFalse(image.isNull())
+        pixmap = self.overlay._panel_pixmap
+        self.assertIsNotNone(pixmap)
+
+        self.overlay.grab()
+        self.assertIs(self.overlay._panel_pixmap, pixmap)
+
+    def test_antialiasing_is_limited_to_crosshair_circle(self):
+        image = QImage(200, 200, QImage.Format.Format_ARGB32_Premultiplied)
+        painter = QPainter(image)
+        try:
+            self.overlay._draw_crosshair(painter, QPoint(100, 100))
+            self.assertFalse(painter.testRenderHint(QPainter.RenderHint.Antialiasing))
+        finally:
+            painter.end()
+
+    def test_coordinate_labels_are_cached(self):
+        self.assertIs(_coord_text("X", 100), _coord_text("X", 100))
+        self.assertEqual(_coord_text("Y", 7).text(), "Y: 7")
+
+    def test_interactive_overlay_follows_mouse_events(self):
+        overlay = ScreenOverlay(self.backend, interactive=True)
+        try:
+            self.assertIsNone(overlay.update_timer)
+            self.assertTrue(overlay.hasMouseTracking())
+            event = QMouseEvent(
+                QEvent.Type.MouseMove, QPointF(30, 40), QPointF(30, 40),
+                Qt.MouseButton.NoButton, Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier,
+            )
+            overlay.mouseMoveEvent(event)
+            self.assertEqual(overlay.mouse_pos, QPoint(30, 40))
+        finally:
+            overlay.close()
+            overlay.deleteLater()
+
+    def test_timer_runs_only_while_shown(self):
+        self.assertFalse(self.overlay.update_timer.isActive())
+        self.overlay.show()
+        self.assertTrue(self.overlay.update_timer.isActive())
+        self.overlay.hide()
+        self.assertFalse(self.overlay.update_timer.isActive())
+
+
+if __name__ == "__main__":
+    unittest.main()
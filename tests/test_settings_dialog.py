@@ -0,0 +1,95 @@
+import os
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QApplication, QFileDialog
+    from ui.settings_dialog import SettingsDialog
+    HAS_PYQT = True
+except ModuleNotFoundError:
+    HAS_PYQT = False
+
+
+@unittest.skipUnless(HAS_PYQT, "PyQt6 is not installed in the current environment")
+class TestSettingsDialog(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.dialog = SettingsDialog(databases=["/data/first.xlsx"])
+
+    def tearDown(self):
+        self.dialog.deleteLater()
+        self.app.processEvents()
+
+    def _pick(self, path: str):
+        return patch.object(QFileDialog, "getOpenFileName", return_value=(path, ""))
+
+    def _paths(self):
+        db_list = self.dialog.db_list
+        return [db_list.item(i).data(Qt.ItemDataRole.UserRole) for i in range(db_list.count())]
+
+    def test_add_database_appends_to_existing_list(self):
+        db_list = self.dialog.db_list
+        with self._pick("/data/second.csv"):
+            self.dialog._add_database()
+
+        self.assertIs(self.dialog.db_list, db_list)
+        self.assertEqual(self._paths(), ["/data/first.xlsx", "/data/second.csv"])
+        self.assertEqual(db_list.item(1).text(), "📄 second.csv")
+        self.assertEqual(db_list.currentRow(), 1)
+
+    def test_duplicate_database_is_ignored(self):
+        with self._pick("/data/first.xlsx"):
+            self.dialog._add_database()
+        self.assertEqual(self._paths(), ["/data/first.xlsx"])
+        self.assertEqual(self.dialog.get_databases(), ["/data/first.xlsx"])
+
+    def test_category_rebuild_uses_cached_names(self):
+        with self._pick("/data/second.csv"):
+            self.dialog._add_database()
+        with patch("ui.settings_dialog.os.path.basename", side_effect=AssertionError):
+            self.dialog.settings_list.setCurrentRow(1)
+            self.dialog.settings_list.setCurrentRow(0)
+        db_list = self.dialog.db_list
+        self.assertEqual([db_list.item(i).text() for i in range(db_list.count())],
+                         ["📄 first.xlsx", "📄 second.csv"])
+
+    def test_database_list_is_filled_in_one_batch(self):
+        dialog = SettingsDialog(databases=[f"/data/{i}.xlsx" for i in range(5)])
+        try:
+            db_list = dialog.db_list
+            self.assertEqual(db_list.count(), 5)
+            self.assertTrue(db_list.uniformItemSizes())
+            self.assertTrue(db_list.updatesEnabled())
+            self.assertFalse(db_list.signalsBlocked())
+        finally:
+            dialog.deleteLater()
+
+    def test_category_panels_are_built_once(self):
+        stack = self.dialog.settings_stack
+        self.assertEqual(stack.count(), 1)
+        db_page = stack.currentWidget()
+
+        self.dialog.settings_list.setCurrentRow(3)
+        self.dialog.screenshot_path_input.setText("/tmp/shots")
+        self.dialog.settings_list.setCurrentRow(0)
+        self.assertIs(stack.currentWidget(), db_page)
+        self.dialog.settings_list.setCurrentRow(3)
+
+        self.assertEqual(stack.count(), 2)
+        self.assertEqual(self.dialog.screenshot_path_input.text(), "/tmp/shots")
+
+    def test_remove_database(self):
+        self.dialog.db_list.setCurrentRow(0)
+        self.dialog._remove_database()
+        self.assertEqual(self._paths(), [])
+        self.assertEqual(self.dialog.get_databases(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
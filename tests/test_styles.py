@@ -0,0 +1,44 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtWidgets import QApplication, QWidget
+    from ui.styles import (
+        PROFESSIONAL_DARK_STYLESHEET, PROFESSIONAL_LIGHT_STYLESHEET, apply_stylesheet, get_stylesheet
+    )
+    HAS_PYQT = True
+except ModuleNotFoundError:
+    HAS_PYQT = False
+
+
+@unittest.skipUnless(HAS_PYQT, "PyQt6 is not installed in the current environment")
+class TestStyles(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_theme_lookup(self):
+        self.assertIs(get_stylesheet("light"), PROFESSIONAL_LIGHT_STYLESHEET)
+        self.assertIs(get_stylesheet("dark"), PROFESSIONAL_DARK_STYLESHEET)
+        self.assertIs(get_stylesheet("unknown"), PROFESSIONAL_DARK_STYLESHEET)
+
+    def test_same_theme_is_applied_once(self):
+        widget = QWidget()
+        calls = []
+        set_style_sheet = widget.setStyleSheet
+        widget.setStyleSheet = lambda sheet: calls.append(sheet) or set_style_sheet(sheet)
+
+        apply_stylesheet(widget, "dark")
+        apply_stylesheet(widget, "dark")
+        self.assertEqual(len(calls), 1)
+
+        apply_stylesheet(widget, "light")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(widget.styleSheet(), PROFESSIONAL_LIGHT_STYLESHEET)
+        widget.deleteLater()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,450 @@
+import os
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtCore import QMimeData, QPoint, QPointF, QSignalBlocker, Qt
+    from PyQt6.QtGui import QDragLeaveEvent, QDragMoveEvent, QDropEvent
+    from PyQt6.QtTest import QTest
+    from PyQt6.QtWidgets import QApplication, QMenu, QPushButton
+    from ui.task_board_widget import ActionChip, TaskBoardWidget, TaskRowWidget
+    HAS_PYQT = True
+except ModuleNotFoundError:
+    HAS_PYQT = False
+
+from backend import Action, ActionType, BackendApplication, Coordinates
+from backend.core import IDatabaseService, IKeyboardService, IMouseService, IScreenService
+
+
+class _DummyMouse(IMouseService):
+    def get_position(self):
+        return Coordinates(7, 9)
+
+    def move_to(self, x: int, y: int, duration_ms: int = 0):
+        return None
+
+    def click(self, button: str = "left"):
+        return None
+
+
+class _DummyKeyboard(IKeyboardService):
+    def press(self, key: str):
+        return None
+
+    def press_hotkey(self, keys):
+        return None
+
+
+class _DummyScreen(IScreenService):
+    def get_pixel_color(self, x: int, y: int):
+        return None
+
+    def take_screenshot(self, region=None):
+        return None
+
+    def find_image(self, template_path: str, threshold: float = 0.9):
+        return None
+
+
+class _DummyDb(IDatabaseService):
+    def add_database(self, name: str, filepath: str):
+        return None
+
+    def search(self, database_name: str, query: str):
+        return []
+
+    def get_value(self, database_name: str, row: int, column: str):
+        return None
+
+    def get_columns(self, database_name: str):
+        return []
+
+
+@unittest.skipUnless(HAS_PYQT, "PyQt6 is not installed in the current environment")
+class TestTaskBoardWidget(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.backend = BackendApplication(
+            mouse=_DummyMouse(),
+            keyboard=_DummyKeyboard(),
+            screen=_DummyScreen(),
+            database=_DummyDb(),
+        )
+        self.backend.create_board("Доска")
+        for i in range(40):
+            row = self.backend.add_row(f"Строка {i}")
+            self.backend.add_action(row.id, Action(id=f"a{i}", action_type=ActionType.WAIT_TIME, name=f"Ждать {i}"))
+        self.widget = TaskBoardWidget(self.backend)
+        self.widget.resize(900, 400)
+        self.widget.show()
+        self.app.processEvents()
+
+    def tearDown(self):
+        self.widget.close()
+        self.widget.deleteLater()
+        self.backend.shutdown()
+        self.app.processEvents()
+
+    def _shown_rows(self):
+        return [w.row.name for w in self.widget._row_widgets.values()]
+
+    def test_only_visible_rows_are_built(self):
+        built = self.widget.findChildren(TaskRowWidget)
+        self.assertLess(len(built), 10)
+        self.assertIn("Строка 0", self._shown_rows())
+        self.assertNotIn("Строка 39", self._shown_rows())
+
+    def test_scrolling_rebinds_pooled_widgets(self):
+        built = len(self.widget.findChildren(TaskRowWidget))
+        bar = self.widget.scroll_area.horizontalScrollBar()
+        self.assertGreater(bar.maximum(), 0)
+
+        bar.setValue(bar.maximum())
+        self.app.processEvents()
+        self.widget._update_visible_rows()
+
+        self.assertIn("Строка 39", self._shown_rows())
+        self.assertNotIn("Строка 0", self._shown_rows())
+        self.assertLessEqual(len(self.widget.findChildren(TaskRowWidget)), built + 2)
+
+    def test_refresh_shows_board_changes(self):
+        board = self.backend.current_board
+        board.rows[0].name = "Переименована"
+        self.widget.refresh()
+        self.assertIn("Переименована", self._shown_rows())
+
+        self.backend.current_board = None
+        self.widget.refresh()
+        self.assertEqual(self._shown_rows(), [])
+        self.assertIs(self.widget._stack.currentWidget(), self.widget.empty_label)
+        self.assertEqual(self.widget.rows_layout.indexOf(self.widget.empty_label), -1)
+
+        self.backend.current_board = board
+        self.widget.refresh()
+        self.assertIs(self.widget._stack.currentWidget(), self.widget.scroll_area)
+        self.assertIn("Переименована", self._shown_rows())
+
+
+    def test_rebinding_row_reuses_chip_widgets(self):
+        board = self.backend.current_board
+        row_widget = self.widget._row_widgets[board.rows[0].id]
+        chip = row_widget._action_chips[0]
+        other = board.rows[5]
+        self.backend.add_action(other.id, Action(id="b5", action_type=ActionType.LOG, name="Лог"))
+
+        row_widget.bind(other)
+
+        chips = row_widget._action_chips
+        self.assertIs(chips[0], chip)
+        self.assertEqual(chip.action.id, "a5")
+        self.assertEqual([c.action.id for c in chips], ["a5", "b5"])
+        self.assertEqual(len(row_widget.findChildren(ActionChip)), 2)
+
+
+    def test_menu_actions_share_icon_and_name_from_meta(self):
+        from ui.task_board_widget import _ACTION_META
+        for text, action_type in TaskRowWidget._ACTION_MENU_ITEMS:
+            with self.subTest(action_type=action_type):
+                icon, _name = _ACTION_META[action_type]
+                self.assertTrue(text.startswith(icon))
+
+        row_widget = self.widget._row_widgets[self.backend.current_board.rows[0].id]
+        row_widget._add_action(ActionType.KEY_PRESS)
+        chip = row_widget._action_chips[-1]
+        self.assertEqual(chip.action.name, "Нажатие клавиши")
+        self.assertEqual(chip.icon_label.text(), "⌨")
+
+
+    def test_refresh_reuses_widgets_of_unchanged_rows_and_actions(self):
+        board = self.backend.current_board
+        row = board.rows[0]
+        row_widget = self.widget._row_widgets[row.id]
+        chip = row_widget._action_chips[0]
+        self.backend.add_action(row.id, Action(id="extra", action_type=ActionType.KEY_PRESS, name="Клавиша", key="a"))
+        row.actions[0].name = "Изменено"
+
+        self.widget.refresh()
+
+        self.assertIs(self.widget._row_widgets[row.id], row_widget)
+        chips = row_widget._action_chips
+        self.assertIs(chips[0], chip)
+        self.assertEqual(chip.name_label.text(), "Изменено")
+        self.assertEqual(chips[1].detail_label.text(), "⌨ a")
+
+        row.actions.reverse()
+        self.widget.refresh()
+        self.assertEqual([c.action.id for c in row_widget._action_chips], ["extra", "a0"])
+        self.assertIs(row_widget._action_chips[1], chip)
+        self.assertEqual(row_widget.actions_layout.indexOf(chip), 1)
+
+        row.remove_action("a0")
+        self.widget.refresh()
+        self.assertEqual([c.action.id for c in row_widget._action_chips], ["extra"])
+
+
+    def test_each_edit_refreshes_and_notifies_once(self):
+        modified = []
+        self.widget.board_modified.connect(lambda: modified.append(True))
+        refreshes = []
+        refresh = self.widget.refresh
+        self.widget.refresh = lambda: refreshes.append(True) or refresh()
+
+        self.widget._add_row()
+        self.assertEqual((len(modified), len(refreshes)), (1, 1))
+        self.assertEqual(len(self.backend.current_board.rows), 41)
+
+        self.widget._delete_row(self.backend.current_board.rows[-1].id)
+        self.assertEqual((len(modified), len(refreshes)), (2, 2))
+
+
+    def test_menus_are_built_once(self):
+        row = self.backend.current_board.rows[0]
+        row_widget = self.widget._row_widgets[row.id]
+        with patch.object(QMenu, "exec"):
+            row_widget._show_add_action_menu()
+            menu = row_widget._add_action_menu
+            row_widget._show_add_action_menu()
+            self.assertIs(row_widget._add_action_menu, menu)
+
+            key_item = next(a for a in menu.actions() if a.text() == "⌨ Клавиша")
+            key_item.trigger()
+            self.assertIs(row.actions[-1].action_type, ActionType.KEY_PRESS)
+
+            chip = row_widget._action_chips[0]
+            chip._show_context_menu(chip.rect().center())
+            context_menu = chip._context_menu
+            self.assertFalse(chip._move_up_action.isEnabled())
+            self.assertTrue(chip._move_down_action.isEnabled())
+            chip._show_context_menu(chip.rect().center())
+            self.assertIs(chip._context_menu, context_menu)
+
+
+    def test_enabled_toggle_switches_style_state(self):
+        row = self.backend.current_board.rows[0]
+        row_widget = self.widget._row_widgets[row.id]
+        chip = row_widget._action_chips[0]
+        self.assertEqual((row_widget.property("state"), chip.property("state")), ("on", "on"))
+        on_color = row_widget.grab().toImage().pixelColor(5, 5)
+        self.assertEqual(on_color.name(), "#323232")
+
+        row_widget.enabled_cb.setChecked(False)
+        self.assertFalse(row.enabled)
+        self.assertEqual(row_widget.property("state"), "off")
+        self.assertEqual(row_widget.styleSheet(), "")
+        self.assertEqual(row_widget.grab().toImage().pixelColor(5, 5).name(), "#2b2b2b")
+
+
+    def test_chip_moves_use_cached_position(self):
+        row = self.backend.current_board.rows[0]
+        for i in range(1, 4):
+            row.add_action(Action(id=f"x{i}", action_type=ActionType.LOG, name=f"Лог {i}"))
+        self.widget.refresh()
+        row_widget = self.widget._row_widgets[row.id]
+        chip = row_widget._action_chips[2]
+        self.assertEqual(chip._index, 2)
+
+        chip._move_up()
+        self.assertEqual([a.id for a in row.actions], ["a0", "x2", "x1", "x3"])
+        self.assertIs(row_widget._action_chips[1], chip)
+        self.assertEqual(chip._index, 1)
+
+        row.actions.reverse()  # правка в обход виджета
+        self.assertEqual(chip._position(), 2)
+        self.assertTrue(chip._can_move_down())
+        chip._copy_action()
+        self.assertEqual(row.actions[3].name, "Лог 2 (copy)")
+
+
+    def test_drop_index_follows_chip_centers(self):
+        row = self.backend.current_board.rows[0]
+        for i in range(1, 4):
+            row.add_action(Action(id=f"x{i}", action_type=ActionType.LOG, name=f"Лог {i}"))
+        self.widget.refresh()
+        self.app.processEvents()
+        row_widget = self.widget._row_widgets[row.id]
+        centers = [chip.geometry().center().y() for chip in row_widget._action_chips]
+        self.assertEqual(centers, sorted(centers))
+
+        self.assertEqual(row_widget._drop_index_for_pos(QPoint(10, 0)), 0)
+        self.assertEqual(row_widget._drop_index_for_pos(QPoint(10, centers[1] + 1)), 2)
+        self.assertEqual(row_widget._drop_index_for_pos(QPoint(10, centers[-1] + 1)), 4)
+        self.assertEqual(row_widget._chip_centers_y, centers)
+        self.assertEqual(row_widget._drop_index_for_pos(QPoint(10, centers[2])), 3)
+
+        row.actions.pop()
+        self.widget.refresh()
+        self.assertIsNone(row_widget._chip_centers_y)
+
+
+    def test_drag_hover_is_computed_once_per_tick(self):
+        row_widget = self.widget._row_widgets[self.backend.current_board.rows[0].id]
+        calls = []
+        drop_index = row_widget._drop_index_for_pos
+        row_widget._drop_index_for_pos = lambda pos: calls.append(pos) or drop_index(pos)
+
+        mime = QMimeData()
+        mime.setData("application/x-ahk-action-id", b"a0")
+        for y in (5, 10, 200):
+            event = QDragMoveEvent(QPoint(10, y), Qt.DropAction.MoveAction, mime,
+                                   Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+            row_widget.dragMoveEvent(event)
+            self.assertTrue(event.isAccepted())
+        self.assertEqual(calls, [])
+
+        with patch.object(row_widget, "update") as update:
+            row_widget._hover_timer.timeout.emit()
+            self.assertEqual(calls, [QPoint(10, 200)])
+            self.assertEqual(row_widget._drag_hover_index, 1)
+            self.assertEqual(update.call_count, 1)
+
+            # Та же позиция вставки — маркер не перерисовывается
+            row_widget.dragMoveEvent(event)
+            row_widget._hover_timer.timeout.emit()
+            self.assertEqual(update.call_count, 1)
+
+        marker = row_widget._drop_marker_rect()
+        self.assertGreater(marker.top(), row_widget._action_chips[0].geometry().bottom())
+        self.assertFalse(row_widget.grab().isNull())
+
+        row_widget.dragLeaveEvent(QDragLeaveEvent())
+        self.assertIsNone(row_widget._drop_marker_rect())
+
+
+    def test_copy_action_owns_mutable_fields(self):
+        row = self.backend.current_board.rows[0]
+        original = Action(id="src", action_type=ActionType.MOUSE_CLICK, name="Клик",
+                          coordinates=Coordinates(1, 2), delay_after_ms=40, metadata={"click_count": 2})
+        row.actions.insert(0, original)
+        self.widget.refresh()
+        chip = self.widget._row_widgets[row.id]._action_chips[0]
+
+        chip._copy_action()
+
+        copy = row.actions[1]
+        self.assertEqual((copy.name, copy.delay_after_ms, copy.metadata), ("Клик (copy)", 40, {"click_count": 2}))
+        self.assertNotEqual(copy.id, original.id)
+        self.assertIsNot(copy.coordinates, original.coordinates)
+        self.assertIsNot(copy.metadata, original.metadata)
+
+
+    def test_chip_children_are_styled_by_the_board(self):
+        row_widget = self.widget._row_widgets[self.backend.current_board.rows[0].id]
+        chip = row_widget._action_chips[0]
+        for widget in (row_widget.name_label, chip.name_label, chip.detail_label,
+                       chip.findChild(QPushButton, "chipDeleteButton")):
+            self.assertEqual(widget.styleSheet(), "")
+        self.assertTrue(chip.name_label.font().bold())
+        self.assertEqual(chip.name_label.font().pixelSize(), 12)
+
+
+    def test_reorder_moves_existing_chip(self):
+        row = self.backend.current_board.rows[0]
+        for i in range(1, 4):
+            row.add_action(Action(id=f"x{i}", action_type=ActionType.LOG, name=f"Лог {i}"))
+        self.widget.refresh()
+        row_widget = self.widget._row_widgets[row.id]
+        chips = list(row_widget._action_chips)
+        refreshed = []
+        row_widget._refresh_actions = lambda: refreshed.append(True)
+
+        # Без row_modified доска не перепривязывает строку: проверяется только сам перенос
+        with QSignalBlocker(row_widget):
+            chips[1]._move_down()
+            self.assertEqual(refreshed, [])
+            self.assertEqual(row_widget._action_chips, [chips[0], chips[2], chips[1], chips[3]])
+            self.assertEqual([c._index for c in row_widget._action_chips], [0, 1, 2, 3])
+            self.assertEqual(row_widget.actions_layout.indexOf(chips[1]), 2)
+
+            mime = QMimeData()
+            mime.setData("application/x-ahk-action-id", b"x3")
+            mime.setData("application/x-ahk-source-row", row.id.encode())
+            drop = QDropEvent(QPointF(10, 0), Qt.DropAction.MoveAction, mime,
+                              Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+            row_widget.dropEvent(drop)
+            self.assertEqual(refreshed, [])
+            self.assertEqual([a.id for a in row.actions], ["x3", "a0", "x2", "x1"])
+            self.assertIs(row_widget._action_chips[0], chips[3])
+
+    def test_drop_from_other_row_is_ignored(self):
+        board = self.backend.current_board
+        row = board.rows[0]
+        row.add_action(Action(id="x1", action_type=ActionType.LOG, name="Лог"))
+        self.widget.refresh()
+        row_widget = self.widget._row_widgets[row.id]
+
+        mime = QMimeData()
+        mime.setData("application/x-ahk-action-id", b"x1")
+        mime.setData("application/x-ahk-source-row", board.rows[1].id.encode())
+        drop = QDropEvent(QPointF(10, 0), Qt.DropAction.MoveAction, mime,
+                          Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+        row_widget.dropEvent(drop)
+
+        self.assertFalse(drop.isAccepted())
+        self.assertEqual([a.id for a in row.actions], ["a0", "x1"])
+
+
+    def test_click_on_chip_label_selects_action(self):
+        row = self.backend.current_board.rows[0]
+        chip = self.widget._row_widgets[row.id]._action_chips[0]
+        selected = []
+        self.widget.action_selected.connect(selected.append)
+
+        label = chip.name_label
+        self.assertIsNone(chip.childAt(label.geometry().center()))  # клик уходит самому чипу
+        QTest.mouseClick(chip, Qt.MouseButton.LeftButton, pos=label.geometry().center())
+        self.assertEqual(selected, [row.actions[0]])
+        self.assertEqual(chip._drag_start_pos, label.geometry().center())
+
+
+    def test_rebuild_suspends_updates(self):
+        row = self.backend.current_board.rows[0]
+        row_widget = self.widget._row_widgets[row.id]
+        seen = []
+        bind = ActionChip.bind
+
+        def spy(chip, *args):
+            seen.append((self.widget.rows_container.updatesEnabled(), row_widget.updatesEnabled()))
+            return bind(chip, *args)
+
+        with patch.object(ActionChip, "bind", spy):
+            self.widget.refresh()
+        self.assertIn((False, False), seen)
+        self.assertTrue(self.widget.rows_container.updatesEnabled())
+        self.assertTrue(row_widget.updatesEnabled())
+
+
+    def test_scroll_and_noop_refresh_do_not_repaint_everything(self):
+        import ui.task_board_widget as module
+        suspended = []
+        original = module._updates_suspended
+
+        def spy(widget):
+            suspended.append(widget)
+            return original(widget)
+
+        with patch.object(module, "_updates_suspended", spy):
+            self.widget._update_visible_rows()
+            window = self.widget._rows_window
+            suspended.clear()
+            bar = self.widget.scroll_area.horizontalScrollBar()
+            bar.setValue(bar.value() + 1)
+            self.assertEqual(self.widget._rows_window, window)
+            self.assertEqual(suspended, [])
+
+            self.widget.refresh()
+            self.assertEqual(suspended, [self.widget.rows_container])
+
+            row = self.backend.current_board.rows[0]
+            row.add_action(Action(id="new", action_type=ActionType.LOG, name="Лог"))
+            suspended.clear()
+            self.widget.refresh()
+            self.assertIn(self.widget._row_widgets[row.id], suspended)
+
+
+if __name__ == "__main__":
+    unittest.main()
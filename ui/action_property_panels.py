@@ -3,19 +3,24 @@
 """
 
 import os
+from typing import Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QSpinBox, QComboBox, QCheckBox,
     QGroupBox, QFormLayout, QLineEdit, QDoubleSpinBox,
     QFileDialog, QListWidget, QListWidgetItem
 )
-from PyQt6.QtCore import Qt
 
 from backend import ActionType
 
 
 class BaseActionPanel:
-    """Базовый класс панели свойств действия"""
+    """Базовый класс панели свойств действия
+
+    Контракт: после create_panel() методы get_values()/set_values() только
+    читают и пишут свои виджеты и не бросают исключений — RightPanel вызывает
+    их без try/except при каждой смене выбора.
+    """
     
     def __init__(self):
         self.widgets = {}
@@ -182,7 +187,7 @@ class WaitPixelColorPanel(BaseActionPanel):
         # Чекбокс "любое изменение"
         self.any_change_check = QCheckBox("Любое изменение (не конкретный цвет)")
         self.any_change_check.setToolTip("Если отмечено, действие завершится при любом изменении пикселя")
-        self.any_change_check.stateChanged.connect(self._on_any_change_changed)
+        self.any_change_check.toggled.connect(self._on_any_change_changed)
         layout.addRow("", self.any_change_check)
 
         self.tolerance_spin = QSpinBox()
@@ -198,9 +203,8 @@ class WaitPixelColorPanel(BaseActionPanel):
         group.setLayout(layout)
         return group
 
-    def _on_any_change_changed(self, state):
+    def _on_any_change_changed(self, checked: bool):
         """Включить/выключить поля цвета"""
-        checked = state == Qt.CheckState.Checked
         self.color_r.setEnabled(not checked)
         self.color_g.setEnabled(not checked)
         self.color_b.setEnabled(not checked)
@@ -1051,9 +1055,11 @@ PANELS = {
 }
 
 
-def get_panel(action_type: ActionType) -> BaseActionPanel:
-    """Получить панель для типа действия"""
+def get_panel(action_type: ActionType) -> Optional[BaseActionPanel]:
+    """Получить новую панель для типа действия (None, если панели у типа нет).
+
+    Каждый вызов создаёт отдельный экземпляр со своими виджетами;
+    переиспользованием занимается вызывающая сторона (RightPanel кэширует по типу).
+    """
     panel_class = PANELS.get(action_type)
-    if panel_class:
-        return panel_class()
-    return None
+    return panel_class() if panel_class else None
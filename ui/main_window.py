@@ -18,7 +18,7 @@ from ui.task_board_widget import TaskBoardWidget
 from ui.right_panel import RightPanel
 from ui.screen_overlay import ScreenOverlay
 from ui.settings_dialog import SettingsDialog
-from ui.styles import get_stylesheet
+from ui.styles import apply_stylesheet
 from ui.recording_manager import RecordingManager
 from ui.recording_manager import DEFAULT_RECORDING_STOP_COMBO
 
@@ -62,7 +62,7 @@ class MainWindow(QMainWindow):
         self.resize(1200, 800)
         
         # Применяем профессиональный стиль
-        self.setStyleSheet(get_stylesheet("dark"))
+        apply_stylesheet(self, "dark")
 
         # Центральный виджет
         central_widget = QWidget()
@@ -225,8 +225,7 @@ class MainWindow(QMainWindow):
     # ===== Обработчики UI =====
 
     def _on_board_modified(self):
-        """Обработчик изменения доски"""
-        self.task_board_widget.refresh()
+        """Обработчик изменения доски (виджет доски уже обновил себя сам)"""
         self.statusBar.showMessage("Доска изменена")
 
     def _on_action_added(self, action):
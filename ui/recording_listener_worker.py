@@ -2,6 +2,16 @@
 """
 Subprocess worker for global input recording via pynput.
 Runs outside the Qt process to isolate native crashes on macOS.
+
+Messages are sent to the parent as length-prefixed frames:
+little-endian uint32 body size followed by a UTF-8 JSON body.
+
+The channel is one end of a socketpair: inherited as --ipc-fd on POSIX,
+or received on Windows as socket.share() data on stdin (--ipc-share).
+
+The process is long-lived: the parent sends line-delimited JSON commands
+({"cmd": "start"|"stop"|"exit"}) over the same channel, and pynput hooks
+are attached only between "start" and "stop".
 """
 
 from __future__ import annotations
@@ -9,19 +19,69 @@ from __future__ import annotations
 import argparse
 import json
 import signal
+import socket
+import struct
 import sys
 import threading
 import time
-from typing import Set
+from typing import Iterator, Optional, Set
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_FRAME_HEADER = struct.Struct("<I")
+_channel: Optional[socket.socket] = None
+_emit_lock = threading.Lock()
 
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+def _dumps(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _open_channel(fd: Optional[int]) -> None:
+    global _channel
+    _channel = socket.socket(fileno=fd) if fd is not None else None
+
+
+def _open_shared_channel(data: bytes) -> None:
+    """Windows: сокет, переданный родителем через socket.share()."""
+    global _channel
+    _channel = socket.fromshare(data)
+
+
 def _emit(payload: dict) -> None:
-    sys.stdout.write(json.dumps(payload, ensure_ascii=False) + "\n")
-    sys.stdout.flush()
+    body = _dumps(payload)
+    frame = _FRAME_HEADER.pack(len(body)) + body
+    # pynput вызывает колбэки из разных потоков — кадры не должны перемешиваться.
+    with _emit_lock:
+        if _channel is not None:
+            _channel.sendall(frame)
+        else:
+            sys.stdout.buffer.write(frame)
+            sys.stdout.buffer.flush()
+
+
+def _read_commands() -> Iterator[dict]:
+    """Команды от родителя построчно; конец потока означает выход."""
+    stream = _channel.makefile("rb") if _channel is not None else sys.stdin.buffer
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(payload, dict):
+            yield payload
 
 
 def _normalize_key_name(key_obj) -> str:
@@ -49,41 +109,58 @@ def _normalize_key_name(key_obj) -> str:
     return low
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--stop-combo", default="cmd+1")
-    parser.add_argument("--startup-ignore-ms", type=int, default=500)
-    args = parser.parse_args()
+class _RecordingSession:
+    """pynput-хуки одной сессии записи; подключаются только на время записи."""
 
-    stop_event = threading.Event()
-    started_ts = _now_ms()
-    pressed_mods: Set[str] = set()
-    pressed_keys: Set[str] = set()
+    _MODIFIERS = {"ctrl", "shift", "alt", "cmd"}
 
-    def _sigterm_handler(_signum, _frame):
-        stop_event.set()
+    def __init__(self, keyboard, mouse, stop_combo: str, startup_ignore_ms: int):
+        self._keyboard = keyboard
+        self._mouse = mouse
+        self.stop_combo = stop_combo
+        self.startup_ignore_ms = startup_ignore_ms
+        self._active = threading.Event()
+        self._started_ts = 0
+        self._pressed_mods: Set[str] = set()
+        self._pressed_keys: Set[str] = set()
+        self._mouse_listener = None
+        self._keyboard_listener = None
 
-    signal.signal(signal.SIGTERM, _sigterm_handler)
-    signal.signal(signal.SIGINT, _sigterm_handler)
+    def start(self) -> None:
+        if self._mouse_listener is not None:
+            return
+        self._started_ts = _now_ms()
+        self._pressed_mods.clear()
+        self._pressed_keys.clear()
+        self._active.set()
+        self._mouse_listener = self._mouse.Listener(on_click=self._on_click)
+        self._keyboard_listener = self._keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
+        self._mouse_listener.start()
+        self._keyboard_listener.start()
 
-    try:
-        from pynput import keyboard, mouse
-    except Exception as exc:
-        _emit({"type": "error", "message": f"pynput import failed: {exc}"})
-        return 2
+    def stop(self) -> None:
+        self._active.clear()
+        for listener in (self._mouse_listener, self._keyboard_listener):
+            if listener is not None:
+                try:
+                    listener.stop()
+                except Exception:
+                    pass
+        self._mouse_listener = None
+        self._keyboard_listener = None
 
-    def on_click(x, y, button, pressed):
-        if stop_event.is_set():
+    def _on_click(self, x, y, button, pressed):
+        if not self._active.is_set():
             return False
         if not pressed:
             return
         now = _now_ms()
-        if now - started_ts < args.startup_ignore_ms:
+        if now - self._started_ts < self.startup_ignore_ms:
             return
         btn = "left"
-        if button == mouse.Button.right:
+        if button == self._mouse.Button.right:
             btn = "right"
-        elif button == mouse.Button.middle:
+        elif button == self._mouse.Button.middle:
             btn = "middle"
         _emit({
             "type": "event",
@@ -96,63 +173,86 @@ def main() -> int:
             },
         })
 
-    def on_press(key):
-        if stop_event.is_set():
+    def _on_press(self, key):
+        if not self._active.is_set():
             return False
         now = _now_ms()
-        if now - started_ts < args.startup_ignore_ms:
+        if now - self._started_ts < self.startup_ignore_ms:
             return
 
         key_name = _normalize_key_name(key)
-        if key_name in {"ctrl", "shift", "alt", "cmd"}:
-            pressed_mods.add(key_name)
+        if key_name in self._MODIFIERS:
+            self._pressed_mods.add(key_name)
             return
 
-        if key_name in pressed_keys:
+        if key_name in self._pressed_keys:
             return
-        pressed_keys.add(key_name)
+        self._pressed_keys.add(key_name)
 
         combo_parts = []
         for mod in ("ctrl", "alt", "shift", "cmd"):
-            if mod in pressed_mods:
+            if mod in self._pressed_mods:
                 combo_parts.append(mod)
         combo_parts.append(key_name)
         combo = "+".join(combo_parts)
 
-        if combo == args.stop_combo:
+        if combo == self.stop_combo:
+            # Хуки снимет команда "stop" от родителя; до неё события не шлём.
+            self._active.clear()
             _emit({"type": "stop_requested"})
-            stop_event.set()
             return False
 
         _emit({"type": "event", "event": {"type": "key", "key": combo, "ts": now}})
 
-    def on_release(key):
+    def _on_release(self, key):
         key_name = _normalize_key_name(key)
-        if key_name in {"ctrl", "shift", "alt", "cmd"}:
-            pressed_mods.discard(key_name)
+        if key_name in self._MODIFIERS:
+            self._pressed_mods.discard(key_name)
         else:
-            pressed_keys.discard(key_name)
+            self._pressed_keys.discard(key_name)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stop-combo", default="cmd+1")
+    parser.add_argument("--startup-ignore-ms", type=int, default=500)
+    parser.add_argument("--ipc-fd", type=int, default=None)
+    parser.add_argument("--ipc-share", action="store_true")
+    args = parser.parse_args()
+    if args.ipc_share:
+        # Родитель пишет описание сокета и закрывает stdin.
+        _open_shared_channel(sys.stdin.buffer.read())
+    else:
+        _open_channel(args.ipc_fd)
+
+    def _sigterm_handler(_signum, _frame):
+        # Прерываем блокирующее чтение команд; хуки снимаются в finally.
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _sigterm_handler)
+    signal.signal(signal.SIGINT, _sigterm_handler)
 
-    mouse_listener = None
-    keyboard_listener = None
     try:
-        mouse_listener = mouse.Listener(on_click=on_click)
-        keyboard_listener = keyboard.Listener(on_press=on_press, on_release=on_release)
-        mouse_listener.start()
-        keyboard_listener.start()
+        from pynput import keyboard, mouse
+    except Exception as exc:
+        _emit({"type": "error", "message": f"pynput import failed: {exc}"})
+        return 2
 
-        while not stop_event.is_set():
-            time.sleep(0.02)
+    session = _RecordingSession(keyboard, mouse, args.stop_combo, args.startup_ignore_ms)
+    try:
+        for command in _read_commands():
+            cmd = command.get("cmd")
+            if cmd == "start":
+                session.start()
+            elif cmd == "stop":
+                session.stop()
+            elif cmd == "exit":
+                break
     except Exception as exc:
         _emit({"type": "error", "message": f"listener runtime error: {exc}"})
         return 3
     finally:
-        for listener in (mouse_listener, keyboard_listener):
-            if listener is not None:
-                try:
-                    listener.stop()
-                except Exception:
-                    pass
+        session.stop()
     return 0
 
 
@@ -1,6 +1,6 @@
 """
 Менеджер записи пользовательских действий:
-- InputListenerThread (pynput)
+- InputListenerThread (pynput) + ListenerReader (поток чтения IPC)
 - ActionBuffer
 - OverlayController
 - MiniActionHUD
@@ -11,26 +11,66 @@ from __future__ import annotations
 import logging
 import json
 import os
+import selectors
+import socket
+import struct
 import subprocess
 import sys
 import uuid
 from collections import deque
+from itertools import islice
 from dataclasses import dataclass
-from threading import RLock
-from typing import Deque, Dict, List, Optional
+from threading import RLock, Thread
+from typing import Deque, Dict, List, NamedTuple, Optional
 
-from PyQt6.QtCore import QObject, pyqtSignal, Qt, QTimer
+from PyQt6.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QApplication
 from PyQt6.QtGui import QGuiApplication
 
+try:
+    import orjson
+except ImportError:  # orjson опционален: без него используем stdlib json
+    orjson = None
+
 from backend import Action, ActionType, BackendApplication, Coordinates
 from ui.screen_overlay import ScreenOverlay
 
 logger = logging.getLogger(__name__)
 DEFAULT_RECORDING_STOP_COMBO = "cmd+1"
-
-
-@dataclass
+_PIPE_READ_CHUNK = 65536
+_STDERR_TAIL_LIMIT = 4096
+# Кадр IPC: little-endian uint32 длины + JSON-тело (см. recording_listener_worker).
+_FRAME_HEADER = struct.Struct("<I")
+_MAX_FRAME_SIZE = 16 * 1024 * 1024
+_IPC_COMPACT_THRESHOLD = 1024 * 1024
+_ID_POOL_SIZE = 1024
+_EVENT_POOL_LIMIT = 4096
+_DOUBLE_CLICK_RADIUS_SQ = 32
+# HUD и hud_updated обновляются не чаще ~30 раз в секунду.
+_HUD_FLUSH_INTERVAL_MS = 33
+# Записанные действия передаются в backend пачками.
+_ACTION_FLUSH_INTERVAL_MS = 50
+# Оба парсера принимают bytes напрямую, отдельный decode не нужен.
+_json_loads = orjson.loads if orjson is not None else json.loads
+# POSIX передаёт воркеру конец socketpair как унаследованный fd (pass_fds).
+# На Windows нет ни pass_fds, ни AF_UNIX: socketpair() там TCP-пара на loopback,
+# а сокет передаётся через socket.share() в stdin воркера.
+_PASS_FDS = os.name != "nt"
+# select() на Windows принимает только сокеты: stderr-пайп воркера там читает отдельный поток.
+_SELECT_PIPES = os.name != "nt"
+_WORKER_COMMANDS = {cmd: json.dumps({"cmd": cmd}).encode("ascii") + b"\n" for cmd in ("start", "stop", "exit")}
+# Горячие пути записи (_on_raw_event, ActionBuffer.feed, _append_action, _update_hud,
+# MiniActionHUD.add_event) логируют только под `if _DEBUG:`, чтобы при выключенном
+# DEBUG не тратить время на аргументы. Флаг обновляется в начале каждой записи.
+_DEBUG = logger.isEnabledFor(logging.DEBUG)
+
+
+def _refresh_debug_flag() -> None:
+    global _DEBUG
+    _DEBUG = logger.isEnabledFor(logging.DEBUG)
+
+
+@dataclass(slots=True)
 class RecordingEvent:
     type: str  # click|double_click|key|wait
     ts: int
@@ -41,6 +81,19 @@ class RecordingEvent:
     delay_before: int = 0
     metadata: Optional[dict] = None
 
+    def _reset(self, type: str, ts: int, button: str = "", x: int = 0, y: int = 0,
+               key: str = "", delay_before: int = 0) -> "RecordingEvent":
+        """Переинициализировать экземпляр из пула ActionBuffer на месте."""
+        self.type = type
+        self.ts = ts
+        self.button = button
+        self.x = x
+        self.y = y
+        self.key = key
+        self.delay_before = delay_before
+        self.metadata = None
+        return self
+
     def to_dict(self) -> dict:
         return {
             "type": self.type,
@@ -54,92 +107,370 @@ class RecordingEvent:
         }
 
 
+class _PendingClick(NamedTuple):
+    """Одиночный клик, ожидающий возможного второго клика."""
+    ts: int
+    button: str
+    x: int
+    y: int
+    key: int  # упакованные (кнопка, x, y), см. _click_key
+
+
+def _click_key(button: str, x: int, y: int) -> int:
+    """Упаковать первую букву кнопки и координаты в одно целое.
+
+    Координаты берутся по модулю 2**24 — для экранных значений этого достаточно;
+    кнопки различаются по первой букве (left/right/middle).
+    """
+    head = ord(button[0]) if button else 0
+    return (head << 48) | ((x & 0xFFFFFF) << 24) | (y & 0xFFFFFF)
+
+
 class ActionBuffer:
     """Преобразует поток сырых событий в последовательные action+wait."""
 
-    def __init__(self, min_wait_ms: int = 50, double_click_ms: int = 350):
+    __slots__ = (
+        "min_wait_ms",
+        "double_click_ms",
+        "_events",
+        "_last_action_ts",
+        "_pending_click",
+        "_feed_table",
+        "_pool",
+    )
+
+    def __init__(self, min_wait_ms: int = 50, double_click_ms: int = 350, max_events: Optional[int] = None):
         self.min_wait_ms = min_wait_ms
         self.double_click_ms = double_click_ms
-        self._events: List[RecordingEvent] = []
+        # max_events ограничивает память долгой сессии: старые события вытесняются.
+        self._events: Deque[RecordingEvent] = deque(maxlen=max_events)
         self._last_action_ts: Optional[int] = None
-        self._pending_click: Optional[dict] = None
+        self._pending_click: Optional[_PendingClick] = None
+        self._feed_table = {"click": self._feed_click, "key": self._feed_key}
+        # Свободные RecordingEvent прошлых сессий: переиспользуются вместо новых объектов.
+        self._pool: List[RecordingEvent] = []
 
     def feed(self, raw: dict) -> List[RecordingEvent]:
+        handler = self._feed_table.get(raw.get("type"))
+        if handler is None:
+            return self._flush_pending_click()
+        return handler(raw)
+
+    def _feed_click(self, raw: dict) -> List[RecordingEvent]:
+        button = raw.get("button", "left")
+        x = int(raw.get("x", 0))
+        y = int(raw.get("y", 0))
+        click = _PendingClick(int(raw["ts"]), button, x, y, _click_key(button, x, y))
+        prev = self._pending_click
         produced: List[RecordingEvent] = []
-        raw_type = raw.get("type")
-        if raw_type == "click":
-            click = {
-                "ts": int(raw["ts"]),
-                "button": raw.get("button", "left"),
-                "x": int(raw.get("x", 0)),
-                "y": int(raw.get("y", 0)),
-            }
-            if self._pending_click:
-                prev = self._pending_click
-                if (
-                    prev["button"] == click["button"]
-                    and abs(prev["x"] - click["x"]) <= 4
-                    and abs(prev["y"] - click["y"]) <= 4
-                    and (click["ts"] - prev["ts"]) <= self.double_click_ms
-                ):
-                    self._pending_click = None
-                    produced.extend(self._commit_action(RecordingEvent(
-                        type="double_click",
-                        ts=click["ts"],
-                        button=click["button"],
-                        x=click["x"],
-                        y=click["y"],
-                    )))
-                    return produced
-
-                produced.extend(self._flush_pending_click())
-
-            self._pending_click = click
-            return produced
-
-        produced.extend(self._flush_pending_click())
-
-        if raw_type == "key":
-            produced.extend(self._commit_action(RecordingEvent(
-                type="key",
-                ts=int(raw["ts"]),
-                key=str(raw.get("key", "")),
-            )))
+        if prev:
+            diff = prev.key ^ click.key
+            # Старшие биты ключа — кнопка: разные кнопки отсекаются одним сдвигом,
+            # равные ключи означают ту же точку без подсчёта расстояния.
+            if diff >> 48 == 0 and (click.ts - prev.ts) <= self.double_click_ms:
+                if diff == 0:
+                    near = True
+                else:
+                    # Радиус допуска через квадрат расстояния: 4² + 4² = 32.
+                    dx = prev.x - x
+                    dy = prev.y - y
+                    near = prev.button == button and dx * dx + dy * dy <= _DOUBLE_CLICK_RADIUS_SQ
+            else:
+                near = False
+            if near:
+                self._pending_click = None
+                return self._commit_action(self._alloc("double_click", click.ts, click.button, click.x, click.y))
+
+            produced = self._flush_pending_click()
+
+        self._pending_click = click
+        return produced
+
+    def _feed_key(self, raw: dict) -> List[RecordingEvent]:
+        produced = self._flush_pending_click()
+        produced.extend(self._commit_action(self._alloc("key", int(raw["ts"]), key=str(raw.get("key", "")))))
         return produced
 
     def flush(self) -> List[RecordingEvent]:
         return self._flush_pending_click()
 
     def events(self) -> List[RecordingEvent]:
+        """Копия записанных событий; сами объекты действительны до reset()."""
         return list(self._events)
 
+    def reset(self):
+        """Подготовить буфер к новой сессии.
+
+        События прошлой сессии к этому моменту уже сохранены в backend,
+        поэтому они возвращаются в пул.
+        """
+        room = _EVENT_POOL_LIMIT - len(self._pool)
+        if room > 0:
+            self._pool.extend(islice(self._events, room))
+        self._events.clear()
+        self._last_action_ts = None
+        self._pending_click = None
+
+    def _alloc(self, type: str, ts: int, button: str = "", x: int = 0, y: int = 0,
+               key: str = "", delay_before: int = 0) -> RecordingEvent:
+        pool = self._pool
+        if pool:
+            return pool.pop()._reset(type, ts, button, x, y, key, delay_before)
+        return RecordingEvent(type, ts, button, x, y, key, delay_before)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
     def _flush_pending_click(self) -> List[RecordingEvent]:
         if not self._pending_click:
             return []
         click = self._pending_click
         self._pending_click = None
-        return self._commit_action(RecordingEvent(
-            type="click",
-            ts=click["ts"],
-            button=click["button"],
-            x=click["x"],
-            y=click["y"],
-        ))
+        return self._commit_action(self._alloc("click", click.ts, click.button, click.x, click.y))
 
     def _commit_action(self, event: RecordingEvent) -> List[RecordingEvent]:
-        produced: List[RecordingEvent] = []
-        if self._last_action_ts is not None:
-            delay = event.ts - self._last_action_ts
+        events = self._events
+        last_ts = self._last_action_ts
+        ts = event.ts
+        event.delay_before = 0
+        if last_ts is not None:
+            delay = ts - last_ts
             if delay >= self.min_wait_ms:
-                wait = RecordingEvent(type="wait", ts=event.ts, delay_before=delay)
-                self._events.append(wait)
-                produced.append(wait)
+                # Сюда приходят только клики и клавиши, и wait всегда добавляется
+                # перед ними: двух wait подряд в буфере не бывает, сливать нечего.
+                wait = self._alloc("wait", ts, delay_before=delay)
+                events.append(wait)
+                events.append(event)
+                self._last_action_ts = ts
+                return [wait, event]
+
+        events.append(event)
+        self._last_action_ts = ts
+        return [event]
+
+
+# Фабрики действий для записи: позиционные аргументы в порядке полей Action
+# (id, action_type, name, enabled, delay_before_ms, delay_after_ms,
+#  repeat_count, coordinates, color, key, mouse_button, metadata).
+
+def _make_wait_action(action_id: str, delay_ms: int) -> Action:
+    return Action(action_id, ActionType.WAIT_TIME, f"WAIT {delay_ms}ms", True, delay_ms)
+
+
+def _make_click_action(action_id: str, name: str, x: int, y: int, button: str, click_count: int) -> Action:
+    return Action(
+        action_id, ActionType.MOUSE_CLICK, name, True, 0, 0, 1,
+        Coordinates(x, y), None, None, button, {"click_count": click_count},
+    )
+
+
+def _make_key_action(action_id: str, key: str) -> Action:
+    return Action(action_id, ActionType.KEY_PRESS, f"Клавиша: {key}", True, 0, 0, 1, None, None, key)
 
-        event.delay_before = 0
-        self._events.append(event)
-        produced.append(event)
-        self._last_action_ts = event.ts
-        return produced
+
+class ListenerReader(QObject):
+    """Читает IPC-канал воркера в отдельном потоке.
+
+    Все дескрипторы (канал, stderr, пробуждение) ждутся одним select();
+    разбор кадров и JSON выполняется здесь, в GUI-поток уходят только
+    готовые dict-события через QueuedConnection.
+    """
+
+    parsed_event = pyqtSignal(dict)
+    stop_requested = pyqtSignal()
+    listener_error = pyqtSignal(str)
+    channel_closed = pyqtSignal()
+
+    def __init__(self, ipc_sock: socket.socket, stderr_fd: Optional[int] = None):
+        super().__init__()
+        self._ipc_sock: Optional[socket.socket] = ipc_sock
+        self._stderr_fd = stderr_fd
+        self._ipc_buffer = bytearray()
+        self._ipc_offset = 0
+        self._recv_chunk = bytearray(_PIPE_READ_CHUNK)
+        self._recv_view = memoryview(self._recv_chunk)
+        self.stderr_tail = b""
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._stderr_thread: Optional[Thread] = None
+        # Self-pipe: stop() из другого потока будит select() без таймаута.
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._stopping = False
+        self._dispatch = {
+            "event": self._on_worker_event,
+            "stop_requested": self._on_worker_stop_requested,
+            "error": self._on_worker_error,
+        }
+
+    def run(self):
+        """Цикл чтения; выполняется в потоке чтения до вызова stop()."""
+        sel = selectors.DefaultSelector()
+        self._selector = sel
+        try:
+            if self._ipc_sock is not None:
+                self._ipc_sock.setblocking(False)
+                sel.register(self._ipc_sock, selectors.EVENT_READ, self._drain_ipc)
+            if self._stderr_fd is not None:
+                if _SELECT_PIPES:
+                    os.set_blocking(self._stderr_fd, False)
+                    sel.register(self._stderr_fd, selectors.EVENT_READ, self._drain_stderr)
+                else:
+                    self._stderr_thread = Thread(
+                        target=self._pump_stderr, args=(self._stderr_fd,),
+                        name="listener-stderr", daemon=True,
+                    )
+                    self._stderr_thread.start()
+            sel.register(self._wake_r, selectors.EVENT_READ, None)
+            while not self._stopping:
+                for key, _mask in sel.select():
+                    if key.data is not None:
+                        key.data()
+        except Exception as exc:
+            logger.exception("Recording listener reader failed")
+            self.listener_error.emit(str(exc))
+        finally:
+            self._drain_stderr()
+            self._selector = None
+            sel.close()
+            for sock in (self._ipc_sock, self._wake_r, self._wake_w):
+                if sock is not None:
+                    try:
+                        sock.close()
+                    except OSError:
+                        logger.exception("Failed to close listener reader socket")
+            self._ipc_sock = None
+
+    def stop(self):
+        """Потокобезопасно: просит run() завершиться и будит select()."""
+        self._stopping = True
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass  # run() уже завершился и закрыл сокеты
+
+    def _unregister(self, fileobj):
+        if self._selector is not None:
+            try:
+                self._selector.unregister(fileobj)
+            except (KeyError, ValueError):
+                pass
+
+    def _drain_ipc(self):
+        sock = self._ipc_sock
+        if sock is None:
+            return
+        try:
+            eof = False
+            while True:
+                try:
+                    received = sock.recv_into(self._recv_view)
+                except BlockingIOError:
+                    break
+                except ConnectionResetError:
+                    # Воркер вышел, не дочитав наши команды; его данные уже получены.
+                    received = 0
+                if not received:
+                    eof = True
+                    break
+                self._ipc_buffer += self._recv_view[:received]
+            self._consume_frames()
+            if eof:
+                self._unregister(sock)
+                self.channel_closed.emit()
+        except Exception as exc:
+            logger.exception("Failed to read recording listener worker output")
+            self.listener_error.emit(str(exc))
+            self._unregister(sock)
+            self._stopping = True
+
+    def _consume_frames(self):
+        buf = self._ipc_buffer
+        off = self._ipc_offset
+        header_size = _FRAME_HEADER.size
+        while len(buf) - off >= header_size:
+            (size,) = _FRAME_HEADER.unpack_from(buf, off)
+            if size > _MAX_FRAME_SIZE:
+                raise ValueError(f"Listener worker frame too large: {size} bytes")
+            end = off + header_size + size
+            if len(buf) < end:
+                break
+            self._handle_worker_frame(buf[off + header_size:end])
+            off = end
+
+        # Сдвигаем буфер только когда он полностью прочитан или хвост разросся,
+        # чтобы не копировать данные на каждом кадре.
+        if off == len(buf):
+            buf.clear()
+            off = 0
+        elif off > _IPC_COMPACT_THRESHOLD:
+            del buf[:off]
+            off = 0
+        self._ipc_offset = off
+
+    @staticmethod
+    def _read_available(fd: int) -> tuple[bytes, bool]:
+        """Вычитать из неблокирующего fd всё доступное. Возвращает (данные, eof)."""
+        chunks: List[bytes] = []
+        while True:
+            try:
+                data = os.read(fd, _PIPE_READ_CHUNK)
+            except BlockingIOError:
+                return b"".join(chunks), False
+            if not data:
+                return b"".join(chunks), True
+            chunks.append(data)
+
+    def _pump_stderr(self, fd: int):
+        """Блокирующее чтение stderr в своём потоке (Windows); завершается на EOF."""
+        while True:
+            try:
+                data = os.read(fd, _PIPE_READ_CHUNK)
+            except OSError:
+                return
+            if not data:
+                return
+            self.stderr_tail = (self.stderr_tail + data)[-_STDERR_TAIL_LIMIT:]
+
+    def _drain_stderr(self):
+        thread = self._stderr_thread
+        if thread is not None:
+            # Пайп читает _pump_stderr: дождаться его EOF, чтобы хвост был полным.
+            thread.join(timeout=1.0)
+            return
+        fd = self._stderr_fd
+        if fd is None:
+            return
+        try:
+            data, eof = self._read_available(fd)
+        except OSError:
+            data, eof = b"", True
+        if data:
+            self.stderr_tail = (self.stderr_tail + data)[-_STDERR_TAIL_LIMIT:]
+        if eof:
+            self._unregister(fd)
+            self._stderr_fd = None
+
+    def _handle_worker_frame(self, body: bytearray):
+        try:
+            payload = _json_loads(body)
+        except ValueError:
+            logger.warning("Invalid listener worker frame: %r", bytes(body[:300]))
+            return
+        if not isinstance(payload, dict):
+            return
+        handler = self._dispatch.get(payload.get("type"))
+        if handler is not None:
+            handler(payload)
+
+    def _on_worker_event(self, payload: dict):
+        event = payload.get("event")
+        if isinstance(event, dict):
+            self.parsed_event.emit(event)
+
+    def _on_worker_stop_requested(self, _payload: dict):
+        self.stop_requested.emit()
+
+    def _on_worker_error(self, payload: dict):
+        self.listener_error.emit(str(payload.get("message", "Unknown listener worker error")))
 
 
 class InputListenerThread(QObject):
@@ -153,55 +484,145 @@ class InputListenerThread(QObject):
         self.stop_combo = stop_combo
         self.startup_ignore_ms = startup_ignore_ms
         self._process: Optional[subprocess.Popen] = None
-        self._stdout_buffer = ""
-        self._read_timer = QTimer(self)
-        self._read_timer.setInterval(20)
-        self._read_timer.timeout.connect(self._drain_stdout)
+        self._reader: Optional[ListenerReader] = None
+        self._reader_thread: Optional[QThread] = None
+        self._ipc_sock: Optional[socket.socket] = None  # для команд; читает и закрывает ListenerReader
+        self._stderr_tail = b""
 
     def start(self):
-        if self._process is not None and self._process.poll() is None:
+        """Включить запись. Процесс воркера запускается один раз и переиспользуется."""
+        if not self.is_running():
+            if self._process is not None or self._reader is not None:
+                # Воркер уже умер, но channel_closed ещё в очереди: прежний
+                # читатель останавливаем здесь, до запуска нового процесса.
+                self._stop_reader()
+                self._process = None
+            self._spawn()
+        self._send_command("start")
+
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _spawn(self):
+        parent_sock = None
+        child_sock = None
+        try:
+            self._stderr_tail = b""
+            parent_sock, child_sock = socket.socketpair()
+            if _PASS_FDS:
+                self._process = subprocess.Popen(
+                    self._worker_command(child_sock.fileno()),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    pass_fds=(child_sock.fileno(),),
+                    bufsize=0,
+                )
+            else:
+                self._process = subprocess.Popen(
+                    self._worker_command(None),
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    bufsize=0,
+                )
+                # Описание сокета действительно только для процесса с этим pid.
+                self._process.stdin.write(child_sock.share(self._process.pid))
+                self._process.stdin.close()
+            stderr_fd = self._process.stderr.fileno() if self._process.stderr is not None else None
+            self._start_reader(parent_sock, stderr_fd)
+            self._ipc_sock = parent_sock
+            parent_sock = None
+        except Exception as exc:
+            logger.exception("Failed to start recording listener worker")
+            if parent_sock is not None:
+                parent_sock.close()
+            proc = self._process
+            self._process = None
+            if proc is not None and proc.poll() is None:
+                # Воркер запущен, но канал до него не дошёл — без команд он не завершится.
+                proc.kill()
+            self.listener_error.emit(str(exc))
+        finally:
+            if child_sock is not None:
+                child_sock.close()
+
+    def _send_command(self, cmd: str):
+        sock = self._ipc_sock
+        if sock is None:
+            return
+        try:
+            sock.sendall(_WORKER_COMMANDS[cmd])
+        except OSError:
+            # Воркер уже завершился — об этом сообщит _check_process_exit.
+            logger.warning("Failed to send %r to listener worker", cmd)
+
+    def _start_reader(self, sock: socket.socket, stderr_fd: Optional[int]):
+        reader = ListenerReader(sock, stderr_fd)
+        thread = QThread()
+        reader.moveToThread(thread)
+        # started испускается в новом потоке, поэтому run() выполняется в нём.
+        thread.started.connect(reader.run)
+        queued = Qt.ConnectionType.QueuedConnection
+        reader.parsed_event.connect(self.input_event, queued)
+        reader.stop_requested.connect(self.stop_requested, queued)
+        reader.listener_error.connect(self.listener_error, queued)
+        reader.channel_closed.connect(self._on_channel_closed, queued)
+        self._reader = reader
+        self._reader_thread = thread
+        thread.start()
+
+    def _stop_reader(self):
+        reader = self._reader
+        thread = self._reader_thread
+        self._reader = None
+        self._reader_thread = None
+        self._ipc_sock = None
+        if reader is None or thread is None:
             return
+        if thread.isRunning():
+            reader.stop()
+            thread.quit()
+            thread.wait()
+        self._stderr_tail = reader.stderr_tail
+
+    def _worker_command(self, ipc_fd: Optional[int]) -> List[str]:
+        """ipc_fd=None — канал придёт через socket.share() в stdin (Windows)."""
         worker_path = os.path.join(os.path.dirname(__file__), "recording_listener_worker.py")
-        cmd = [
+        channel = ["--ipc-share"] if ipc_fd is None else ["--ipc-fd", str(ipc_fd)]
+        return [
             sys.executable,
             worker_path,
             "--stop-combo",
             self.stop_combo,
             "--startup-ignore-ms",
             str(self.startup_ignore_ms),
+            *channel,
         ]
-        try:
-            self._process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-            )
-            if self._process.stdout is not None:
-                os.set_blocking(self._process.stdout.fileno(), False)
-            if self._process.stderr is not None:
-                os.set_blocking(self._process.stderr.fileno(), False)
-            self._read_timer.start()
-        except Exception as exc:
-            logger.exception("Failed to start recording listener worker")
-            self.listener_error.emit(str(exc))
 
     def stop(self):
-        self._read_timer.stop()
+        """Снять хуки записи; процесс воркера остаётся запущенным до shutdown()."""
+        self._send_command("stop")
+
+    def shutdown(self):
+        self._send_command("exit")
         proc = self._process
         self._process = None
         if proc is not None and proc.poll() is None:
             try:
-                proc.terminate()
                 proc.wait(timeout=1.5)
             except subprocess.TimeoutExpired:
                 try:
-                    proc.kill()
-                except Exception:
-                    logger.exception("Failed to kill listener worker process")
+                    proc.terminate()
+                    proc.wait(timeout=1.5)
+                except subprocess.TimeoutExpired:
+                    try:
+                        proc.kill()
+                    except Exception:
+                        logger.exception("Failed to kill listener worker process")
             except Exception:
                 logger.exception("Failed to stop listener worker process")
+        # Канал закрываем после выхода воркера, чтобы он успел дописать последние кадры.
+        self._stop_reader()
 
     def wait(self, msecs: int = 0) -> bool:
         proc = self._process
@@ -215,60 +636,30 @@ class InputListenerThread(QObject):
             return False
 
     def requestInterruption(self):
-        self.stop()
+        self.shutdown()
 
-    def _drain_stdout(self):
-        proc = self._process
-        if proc is None:
-            self._read_timer.stop()
+    def _on_channel_closed(self):
+        # Запоздавший сигнал читателя, остановленного при перезапуске воркера,
+        # не относится к текущему процессу.
+        if self.sender() is not self._reader:
             return
-        try:
-            if proc.stdout is not None:
-                try:
-                    chunk = proc.stdout.read()
-                except BlockingIOError:
-                    chunk = ""
-                if chunk:
-                    self._stdout_buffer += chunk
-                    while "\n" in self._stdout_buffer:
-                        line, self._stdout_buffer = self._stdout_buffer.split("\n", 1)
-                        self._handle_worker_line(line)
-            if proc.poll() is not None:
-                self._read_timer.stop()
-                stderr_tail = ""
-                if proc.stderr is not None:
-                    try:
-                        stderr_tail = (proc.stderr.read() or "").strip()
-                    except Exception:
-                        stderr_tail = ""
-                code = int(proc.returncode or 0)
-                self._process = None
-                self.listener_stopped.emit(code)
-                if code != 0 and stderr_tail:
-                    self.listener_error.emit(f"Listener worker exited with {code}: {stderr_tail}")
-        except Exception as exc:
-            logger.exception("Failed to read recording listener worker output")
-            self.listener_error.emit(str(exc))
-            self.stop()
+        self._check_process_exit()
 
-    def _handle_worker_line(self, line: str):
-        payload_raw = line.strip()
-        if not payload_raw:
+    def _check_process_exit(self):
+        proc = self._process
+        if proc is None:
             return
-        try:
-            payload = json.loads(payload_raw)
-        except Exception:
-            logger.warning("Invalid listener worker output: %s", payload_raw[:300])
+        if proc.poll() is None:
+            # Канал уже закрыт, процесс завершается — проверим чуть позже.
+            QTimer.singleShot(20, self._check_process_exit)
             return
-        msg_type = payload.get("type")
-        if msg_type == "event":
-            event = payload.get("event")
-            if isinstance(event, dict):
-                self.input_event.emit(event)
-        elif msg_type == "stop_requested":
-            self.stop_requested.emit()
-        elif msg_type == "error":
-            self.listener_error.emit(str(payload.get("message", "Unknown listener worker error")))
+        self._stop_reader()
+        stderr_tail = self._stderr_tail.decode("utf-8", "replace").strip()
+        code = int(proc.returncode or 0)
+        self._process = None
+        self.listener_stopped.emit(code)
+        if code != 0 and stderr_tail:
+            self.listener_error.emit(f"Listener worker exited with {code}: {stderr_tail}")
 
 
 class OverlayController:
@@ -287,10 +678,26 @@ class OverlayController:
 
 
 class MiniActionHUD(QWidget):
+    _FORMATTERS = {
+        "click": lambda e: f"Click ({e.x}, {e.y})",
+        "double_click": lambda e: f"DoubleClick ({e.x}, {e.y})",
+        "key": lambda e: e.key.upper(),
+        "wait": lambda e: f"WAIT {e.delay_before} ms",
+    }
+
     def __init__(self, max_lines: int = 8):
         super().__init__()
         self.max_lines = max_lines
-        self.lines: Deque[str] = deque(maxlen=max_lines)
+        # Кольцо фиксированного размера: _head указывает на следующую (и самую старую) ячейку.
+        self.lines: List[str] = [""] * max_lines
+        self._head = 0
+        self._full = False
+        self._joined = ""  # строки кольца от самой старой к новой через "\n", поддерживается инкрементально
+        self._dirty = False
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(_HUD_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
         self._init_ui()
 
     def _init_ui(self):
@@ -330,25 +737,36 @@ class MiniActionHUD(QWidget):
         self.show()
 
     def add_event(self, event: RecordingEvent):
-        if event.type == "click":
-            text = f"Click ({event.x}, {event.y})"
-        elif event.type == "double_click":
-            text = f"DoubleClick ({event.x}, {event.y})"
-        elif event.type == "key":
-            text = event.key.upper()
-        elif event.type == "wait":
-            text = f"WAIT {event.delay_before} ms"
+        formatter = self._FORMATTERS.get(event.type)
+        text = formatter(event) if formatter is not None else event.type
+        head = self._head
+        if self._full:
+            # Перезаписываем самую старую строку — срезаем её вместе с "\n".
+            self._joined = self._joined[len(self.lines[head]) + 1:]
+            kept = self.max_lines - 1
         else:
-            text = event.type
-        self.lines.append(text)
-        self.body.setText("\n".join(self.lines))
+            kept = head
+        self._joined = f"{self._joined}\n{text}" if kept else text
+        self.lines[head] = text
+        head += 1
+        if head == self.max_lines:
+            head = 0
+            self._full = True
+        self._head = head
+        if not self._dirty:
+            self._dirty = True
+            self._flush_timer.start()
+
+    def _flush(self):
+        self.body.setText(self._joined)
+        self._dirty = False
 
 
 class RecordingManager(QObject):
     recording_started = pyqtSignal()
     recording_stopped = pyqtSignal(int)  # count of recorded events
     recording_error = pyqtSignal(str)
-    hud_updated = pyqtSignal(dict)
+    hud_updated = pyqtSignal(dict)  # последнее событие за интервал _HUD_FLUSH_INTERVAL_MS
 
     def __init__(self, backend: BackendApplication, parent_window=None):
         super().__init__(parent_window)
@@ -362,6 +780,16 @@ class RecordingManager(QObject):
         self.target_row_id: Optional[str] = None
         self._state_lock = RLock()
         self._is_stopping = False
+        self._id_pool: List[str] = []
+        self._pending_hud_event: Optional[RecordingEvent] = None
+        self._hud_timer = QTimer(self)
+        self._hud_timer.setSingleShot(True)
+        self._hud_timer.setInterval(_HUD_FLUSH_INTERVAL_MS)
+        self._hud_timer.timeout.connect(self._flush_hud_updates)
+        self._pending_actions: List[Action] = []
+        self._action_flush_timer = QTimer(self)
+        self._action_flush_timer.setInterval(_ACTION_FLUSH_INTERVAL_MS)
+        self._action_flush_timer.timeout.connect(self._flush_actions)
 
     def start(self):
         with self._state_lock:
@@ -369,17 +797,20 @@ class RecordingManager(QObject):
                 logger.warning("Recording start ignored: already running")
                 return
 
+            _refresh_debug_flag()
             logger.info("Recording start requested")
             self.is_recording = True
             self._is_stopping = False
-            self.buffer = ActionBuffer()
+            self.buffer.reset()
             self.target_row_id = None
+            self._pending_actions = []
 
             try:
                 if not self.backend.current_board:
                     self.backend.create_board("Без названия")
                 row = self.backend.add_row("Запись")
                 self.target_row_id = row.id
+                self._action_flush_timer.start()
 
                 self.overlay.show()
                 self.hud = MiniActionHUD()
@@ -388,12 +819,8 @@ class RecordingManager(QObject):
                 if self.parent_window is not None:
                     self.parent_window.showMinimized()
 
-                self.listener_thread = InputListenerThread(stop_combo=DEFAULT_RECORDING_STOP_COMBO, startup_ignore_ms=350)
-                self.listener_thread.input_event.connect(self._on_raw_event, Qt.ConnectionType.QueuedConnection)
-                self.listener_thread.stop_requested.connect(self._queue_stop, Qt.ConnectionType.QueuedConnection)
-                self.listener_thread.listener_error.connect(self._on_listener_error, Qt.ConnectionType.QueuedConnection)
-                self.listener_thread.start()
-                logger.info("Recording listener thread started")
+                self._ensure_listener().start()
+                logger.info("Recording listener started")
             except Exception as exc:
                 logger.exception("Recording start failed")
                 self._rollback_start()
@@ -413,17 +840,14 @@ class RecordingManager(QObject):
         try:
             if self.listener_thread is not None:
                 self.listener_thread.stop()
-                if not self.listener_thread.wait(2000):
-                    logger.warning("Listener thread did not stop in 2000ms, forcing interruption")
-                    self.listener_thread.requestInterruption()
-                    self.listener_thread.wait(1000)
-                self.listener_thread = None
 
             extra = self.buffer.flush()
             for event in extra:
                 self._append_action(event)
                 self._update_hud(event)
         finally:
+            self._action_flush_timer.stop()
+            self._flush_actions()
             self.overlay.hide()
             if self.hud is not None:
                 self.hud.hide()
@@ -435,7 +859,8 @@ class RecordingManager(QObject):
                 self.parent_window.raise_()
                 self.parent_window.activateWindow()
 
-            event_count = len(self.buffer.events())
+            self._flush_hud_updates()
+            event_count = len(self.buffer)
             with self._state_lock:
                 self._is_stopping = False
             logger.info("Recording stopped, events=%s", event_count)
@@ -444,6 +869,25 @@ class RecordingManager(QObject):
     def shutdown(self):
         if self.is_recording:
             self.stop()
+        listener = self.listener_thread
+        self.listener_thread = None
+        if listener is not None:
+            try:
+                listener.shutdown()
+            except Exception:
+                logger.exception("Failed to shut down listener worker")
+
+    def _ensure_listener(self) -> InputListenerThread:
+        """Listener создаётся при первой записи и живёт до shutdown()."""
+        if self.listener_thread is None:
+            listener = InputListenerThread(stop_combo=DEFAULT_RECORDING_STOP_COMBO, startup_ignore_ms=350)
+            # input_event испускается уже в GUI-потоке (ListenerReader шлёт его через очередь),
+            # поэтому второй QueuedConnection здесь не нужен.
+            listener.input_event.connect(self._on_raw_event)
+            listener.stop_requested.connect(self._queue_stop, Qt.ConnectionType.QueuedConnection)
+            listener.listener_error.connect(self._on_listener_error, Qt.ConnectionType.QueuedConnection)
+            self.listener_thread = listener
+        return self.listener_thread
 
     def _queue_stop(self):
         # Вызывается через QueuedConnection, поэтому уже в GUI thread.
@@ -455,61 +899,80 @@ class RecordingManager(QObject):
         self.stop()
 
     def _on_raw_event(self, raw: dict):
+        if not self.is_recording:
+            return  # хвост событий, пришедший после stop()
         produced = self.buffer.feed(raw)
+        if _DEBUG:
+            logger.debug("Raw event %r -> %s recorded", raw, [e.type for e in produced])
         for event in produced:
             self._append_action(event)
             self._update_hud(event)
 
+    def _next_id(self) -> str:
+        """UUID4 для записанного действия; случайные байты читаются пачкой на весь пул."""
+        if not self._id_pool:
+            buf = os.urandom(16 * _ID_POOL_SIZE)
+            self._id_pool = [
+                str(uuid.UUID(bytes=buf[i:i + 16], version=4))
+                for i in range(0, len(buf), 16)
+            ]
+        return self._id_pool.pop()
+
     def _append_action(self, event: RecordingEvent):
         if not self.target_row_id:
             return
-        if event.type == "wait":
-            action = Action(
-                id=str(uuid.uuid4()),
-                action_type=ActionType.WAIT_TIME,
-                name=f"WAIT {event.delay_before}ms",
-                delay_before_ms=event.delay_before,
-            )
-            self.backend.add_action(self.target_row_id, action)
+        event_type = event.type
+        if event_type == "wait":
+            action = _make_wait_action(self._next_id(), event.delay_before)
+        elif event_type == "click":
+            action = _make_click_action(self._next_id(), "Клик мышью", event.x, event.y, event.button or "left", 1)
+        elif event_type == "double_click":
+            action = _make_click_action(self._next_id(), "Двойной клик", event.x, event.y, event.button or "left", 2)
+        elif event_type == "key":
+            action = _make_key_action(self._next_id(), event.key)
+        else:
             return
+        self._pending_actions.append(action)
 
-        if event.type in {"click", "double_click"}:
-            action = Action(
-                id=str(uuid.uuid4()),
-                action_type=ActionType.MOUSE_CLICK,
-                name="Двойной клик" if event.type == "double_click" else "Клик мышью",
-                coordinates=Coordinates(event.x, event.y),
-                mouse_button=event.button or "left",
-                metadata={"click_count": 2 if event.type == "double_click" else 1},
-            )
-            self.backend.add_action(self.target_row_id, action)
+    def _flush_actions(self):
+        if not self._pending_actions:
             return
-
-        if event.type == "key":
-            action = Action(
-                id=str(uuid.uuid4()),
-                action_type=ActionType.KEY_PRESS,
-                name=f"Клавиша: {event.key}",
-                key=event.key,
-            )
-            self.backend.add_action(self.target_row_id, action)
+        pending = self._pending_actions
+        self._pending_actions = []
+        if not self.target_row_id:
+            return
+        try:
+            self.backend.add_actions(self.target_row_id, pending)
+        except ValueError:
+            logger.exception("Failed to flush %s recorded actions", len(pending))
 
     def _update_hud(self, event: RecordingEvent):
         if self.hud is not None:
             self.hud.add_event(event)
-        self.hud_updated.emit(event.to_dict())
+        self._pending_hud_event = event
+        if not self._hud_timer.isActive():
+            self._hud_timer.start()
+
+    def _flush_hud_updates(self):
+        self._hud_timer.stop()
+        event = self._pending_hud_event
+        self._pending_hud_event = None
+        if event is not None:
+            # По hud_updated окно перерисовывает доску: к этому моменту все
+            # записанные действия должны быть в backend, не дожидаясь таймера.
+            self._flush_actions()
+            self.hud_updated.emit(event.to_dict())
 
     def _rollback_start(self):
         self.is_recording = False
         self._is_stopping = False
+        self._action_flush_timer.stop()
+        self._pending_actions = []
         if self.listener_thread is not None:
             try:
                 self.listener_thread.stop()
-                self.listener_thread.wait(1000)
             except Exception:
                 logger.exception("Failed to rollback listener thread")
-            finally:
-                self.listener_thread = None
         self.overlay.hide()
         if self.hud is not None:
             self.hud.hide()
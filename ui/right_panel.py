@@ -3,15 +3,18 @@
 """
 import logging
 import uuid
+from contextlib import contextmanager
+from datetime import datetime
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QSpinBox, QComboBox, QCheckBox,
     QGroupBox, QFormLayout, QLineEdit,
-    QFrame, QScrollArea, QStackedWidget
+    QFrame, QScrollArea, QStackedWidget, QSizePolicy, QAbstractScrollArea,
+    QCompleter
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtCore import Qt, QSignalBlocker, QTimer, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut, QStandardItem, QStandardItemModel
 
 from backend import BackendApplication, Action, ActionType, Coordinates, TaskRow
 from ui.key_recorder_dialog import KeyRecorderDialog
@@ -19,6 +22,128 @@ from ui.action_property_panels import get_panel
 
 logger = logging.getLogger(__name__)
 
+# Индексы страниц в RightPanel.stack
+_PAGE_ADD = 0
+_PAGE_PROPERTIES = 1
+_PAGE_ROW = 2
+_PAGE_EMPTY = 3
+
+# Типы действий в порядке комбобокса добавления
+_ACTION_TYPES = (
+    (ActionType.MOUSE_CLICK, "🖱 Клик мышью"),
+    (ActionType.MOUSE_MOVE, "➡ Перемещение мыши"),
+    (ActionType.KEY_PRESS, "⌨ Нажатие клавиши"),
+    (ActionType.WAIT_TIME, "⏱ Ожидание времени"),
+    (ActionType.WAIT_PIXEL_COLOR, "🎨 Ожидание цвета пикселя"),
+    (ActionType.WAIT_PIXEL_CHANGE, "🔄 Ожидание изменения"),
+    (ActionType.WAIT_IMAGE, "🖼 Ожидание изображения"),
+    (ActionType.WAIT_TEXT, "📝 Ожидание текста (OCR)"),
+    (ActionType.CONDITIONAL, "❓ Условное действие"),
+    (ActionType.LOOP, "🔁 Цикл"),
+    (ActionType.SCREENSHOT, "📸 Скриншот"),
+    (ActionType.LOG, "📋 Логирование"),
+    # Действия с базами данных
+    (ActionType.DB_SEARCH, "🔍 Поиск в БД"),
+    (ActionType.DB_GET_VALUE, "📥 Получить из БД"),
+    (ActionType.DB_ITERATE, "🔁 Пройти по БД"),
+    (ActionType.DB_SAVE, "💾 Сохранить в БД"),
+    (ActionType.CHECK_VALUE, "✅ Проверка значения"),
+    # Управление
+    (ActionType.RUN_ROW, "▶ Запустить строку"),
+)
+
+# ActionType -> строка комбобокса, чтобы не искать findData линейно
+_ACTION_TYPE_INDEX = {action_type: i for i, (action_type, _name) in enumerate(_ACTION_TYPES)}
+# Отображаемое имя -> ActionType для поиска типа по тексту
+_NAME_TO_TYPE = {name: action_type for action_type, name in _ACTION_TYPES}
+
+# Поле поиска типа с автодополнением над комбобоксом; False — только комбобокс
+_ACTION_TYPE_SEARCH = True
+
+_DEFAULT_NAMES = {
+    ActionType.MOUSE_CLICK: "Клик",
+    ActionType.MOUSE_MOVE: "Перемещение",
+    ActionType.KEY_PRESS: "Нажатие",
+    ActionType.WAIT_TIME: "Ожидание",
+    ActionType.WAIT_PIXEL_COLOR: "Ожидание цвета",
+    ActionType.WAIT_PIXEL_CHANGE: "Ожидание изменения",
+    ActionType.WAIT_IMAGE: "Ожидание изображения",
+    ActionType.WAIT_TEXT: "Ожидание текста",
+    ActionType.CONDITIONAL: "Условие",
+    ActionType.LOOP: "Цикл",
+    ActionType.SCREENSHOT: "Скриншот",
+    ActionType.LOG: "Лог",
+}
+
+# Действия, для которых в свойствах показываются координаты
+_COORD_ACTIONS = frozenset({
+    ActionType.MOUSE_CLICK,
+    ActionType.MOUSE_MOVE,
+    ActionType.WAIT_PIXEL_COLOR,
+    ActionType.WAIT_PIXEL_CHANGE,
+})
+
+# Правки спинбоксов свойств собираются за этот интервал и применяются одной пачкой.
+_SPIN_DEBOUNCE_MS = 80
+# Пауза ввода, после которой текст применяется, даже если поле не потеряло фокус.
+_TEXT_DEBOUNCE_MS = 150
+# Все правки свойств (спинбоксы, текст, флажки) уведомляют не чаще раза за этот интервал.
+_MODIFIED_COALESCE_MS = 150
+
+
+# Модель типов действий общая для всех комбобоксов; строится при первом обращении,
+# когда QApplication уже создан.
+_action_type_model = None
+
+
+def _get_action_type_model() -> QStandardItemModel:
+    """Общая модель комбобокса типов действий (текст + ActionType в UserRole)."""
+    global _action_type_model
+    if _action_type_model is None:
+        model = QStandardItemModel()
+        for action_type, display_name in _ACTION_TYPES:
+            item = QStandardItem(display_name)
+            item.setData(action_type, Qt.ItemDataRole.UserRole)
+            model.appendRow(item)
+        _action_type_model = model
+    return _action_type_model
+
+
+class _HLine(QFrame):
+    """Горизонтальный разделитель; цвет задаётся темой через #panelSeparator."""
+
+    def __init__(self):
+        super().__init__()
+        self.setFrameShape(QFrame.Shape.HLine)
+        self.setObjectName("panelSeparator")
+        self.setMaximumHeight(1)
+
+
+@contextmanager
+def _updates_suspended(widget: QWidget):
+    """Отложить перерисовку виджета; setUpdatesEnabled(True) сам запланирует одну update()."""
+    widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        widget.setUpdatesEnabled(True)
+
+
+@contextmanager
+def _batched_relayout(widget: QWidget):
+    """Отключить перерисовку и пересчёт layout виджета на время пачки изменений."""
+    layout = widget.layout()
+    widget.setUpdatesEnabled(False)
+    if layout is not None:
+        layout.setEnabled(False)
+    try:
+        yield
+    finally:
+        if layout is not None:
+            layout.setEnabled(True)
+            layout.activate()
+        widget.setUpdatesEnabled(True)
+
 
 class RightPanel(QWidget):
     """Контекстная правая панель"""
@@ -34,6 +159,35 @@ class RightPanel(QWidget):
         self.current_action = None
         self.current_row = None
 
+        # Виджеты страниц, которые строятся лениво: до постройки — None
+        self.add_dynamic_stack = None
+        self.prop_title = None
+        self.prop_x_spin = None
+        self.prop_y_spin = None
+        self.prop_key_input = None
+
+        self._pending_spin = {}  # поле Action -> значение, ждущее применения
+        self._spin_debounce = QTimer(self)
+        self._spin_debounce.setSingleShot(True)
+        self._spin_debounce.setInterval(_SPIN_DEBOUNCE_MS)
+        self._spin_debounce.timeout.connect(self._flush_pending_spin)
+
+        # Текстовые поля применяются по editingFinished; таймер — на случай,
+        # если фокус так и не ушёл из поля (например, переключение окна)
+        self._pending_text = {}  # "name" | "key" | "row_name" -> текст
+        self._text_debounce = QTimer(self)
+        self._text_debounce.setSingleShot(True)
+        self._text_debounce.setInterval(_TEXT_DEBOUNCE_MS)
+        self._text_debounce.timeout.connect(self._flush_pending_text)
+
+        # Правки свойств сообщаются одним action_modified/row_modified на серию
+        self._modified_action = None
+        self._modified_row = None
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(_MODIFIED_COALESCE_MS)
+        self._emit_timer.timeout.connect(self._emit_pending_modified)
+
         self._init_ui()
         self._setup_shortcuts()
     
@@ -53,21 +207,22 @@ class RightPanel(QWidget):
         # Stack widget для переключения между режимами
         self.stack = QStackedWidget()
 
-        # Страница добавления действия
+        # Страница добавления действия (видна сразу, строится сразу)
         self.add_action_widget = self._create_add_action_widget()
         self.stack.addWidget(self.add_action_widget)
 
-        # Страница свойств действия (динамическая)
-        self.properties_widget = self._create_properties_widget()
-        self.stack.addWidget(self.properties_widget)
-
-        # Страница свойств строки
-        self.row_properties_widget = self._create_row_properties_widget()
-        self.stack.addWidget(self.row_properties_widget)
-
-        # Страница "нет выбора"
-        self.empty_widget = self._create_empty_widget()
-        self.stack.addWidget(self.empty_widget)
+        # Остальные страницы строятся при первом показе, до этого в стеке заглушки:
+        # индекс -> (атрибут страницы, фабрика)
+        self.properties_widget = None
+        self.row_properties_widget = None
+        self.empty_widget = None
+        self._page_factories = {
+            _PAGE_PROPERTIES: ("properties_widget", self._create_properties_widget),
+            _PAGE_ROW: ("row_properties_widget", self._create_row_properties_widget),
+            _PAGE_EMPTY: ("empty_widget", self._create_empty_widget),
+        }
+        for _index in sorted(self._page_factories):
+            self.stack.addWidget(QWidget())
 
         layout.addWidget(self.stack)
 
@@ -77,8 +232,11 @@ class RightPanel(QWidget):
     def _setup_shortcuts(self):
         """Настройка горячих клавиш"""
         # Cmd+Shift+R (macOS) или Ctrl+Shift+R (Windows/Linux)
-        shortcut = QShortcut(QKeySequence("Ctrl+Shift+R"), self)
-        shortcut.activated.connect(self._capture_coordinates)
+        # Контекст приложения: захват работает, на какой бы странице стека ни был фокус.
+        # Модальные диалоги (запись клавиш) по-прежнему блокируют его.
+        self.capture_shortcut = QShortcut(QKeySequence("Ctrl+Shift+R"), self)
+        self.capture_shortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)
+        self.capture_shortcut.activated.connect(self._capture_coordinates)
     
     def _create_add_action_widget(self) -> QWidget:
         """Создать виджет добавления действия"""
@@ -86,31 +244,39 @@ class RightPanel(QWidget):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(8, 8, 8, 8)
         layout.setSpacing(8)
+        # Пока форма собирается, layout не пересчитывается на каждый addWidget
+        layout.setEnabled(False)
 
         # Заголовок
         title = QLabel("Добавить действие")
-        title.setStyleSheet("""
-            font-size: 14px; 
-            font-weight: bold;
-        """)
+        title.setObjectName("addActionTitle")
         layout.addWidget(title)
 
         # Горячие клавиши подсказка
         self.add_shortcut_label = QLabel("Cmd+Shift+R — захват координат")
-        self.add_shortcut_label.setStyleSheet("""
-            color: #999999;
-            font-size: 11px;
-            padding: 4px;
-        """)
+        self.add_shortcut_label.setObjectName("shortcutHint")
         layout.addWidget(self.add_shortcut_label)
 
         # Разделитель
-        layout.addWidget(self._create_separator())
+        layout.addWidget(_HLine())
 
         # Тип действия
         type_group = QGroupBox("Тип действия")
         type_layout = QFormLayout()
 
+        self.action_type_search = None
+        if _ACTION_TYPE_SEARCH:
+            self.action_type_search = QLineEdit()
+            self.action_type_search.setPlaceholderText("Поиск типа...")
+            completer = QCompleter(_get_action_type_model(), self.action_type_search)
+            completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+            completer.setFilterMode(Qt.MatchFlag.MatchContains)
+            completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+            completer.activated.connect(self._on_action_type_searched)
+            self.action_type_search.setCompleter(completer)
+            self.action_type_search.returnPressed.connect(self._on_action_type_search_entered)
+            type_layout.addRow("Найти:", self.action_type_search)
+
         self.action_type_combo = QComboBox()
         self._populate_action_types()
         self.action_type_combo.currentIndexChanged.connect(self._update_add_action_type_panel)
@@ -227,13 +393,16 @@ class RightPanel(QWidget):
         self.add_dynamic_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.add_dynamic_scroll.setMinimumHeight(160)
         self.add_dynamic_scroll.setMaximumHeight(320)
+        self._setup_static_scroll(self.add_dynamic_scroll)
 
+        # Панели параметров типа живут страницами стека: тип -> (panel, индекс, defaults).
+        # Страница 0 — пустая, для типов без панели.
         self.add_action_panel = None
-        self.add_dynamic_container = QWidget()
-        self.add_dynamic_layout = QVBoxLayout(self.add_dynamic_container)
-        self.add_dynamic_layout.setContentsMargins(0, 0, 0, 0)
-        self.add_dynamic_layout.setSpacing(6)
-        self.add_dynamic_scroll.setWidget(self.add_dynamic_container)
+        self._add_panel_for_type = None
+        self._add_panel_cache = {}
+        self.add_dynamic_stack = QStackedWidget()
+        self.add_dynamic_stack.addWidget(QWidget())
+        self.add_dynamic_scroll.setWidget(self.add_dynamic_stack)
         dynamic_group_layout.addWidget(self.add_dynamic_scroll)
         layout.addWidget(dynamic_group)
 
@@ -247,27 +416,22 @@ class RightPanel(QWidget):
 
         self._update_add_action_type_panel()
 
+        layout.setEnabled(True)
+        layout.activate()
         return widget
 
     def _update_add_action_type_panel(self):
-        """Обновить динамический блок свойств для add-mode."""
-        if not hasattr(self, "add_dynamic_layout"):
+        """Показать в add-mode панель параметров выбранного типа."""
+        if self.add_dynamic_stack is None:
             return
 
-        while self.add_dynamic_layout.count():
-            item = self.add_dynamic_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
         action_type = self.action_type_combo.currentData()
-        self.add_action_panel = get_panel(action_type)
-        if self.add_action_panel:
-            try:
-                panel_widget = self.add_action_panel.create_panel(self)
-                self.add_dynamic_layout.addWidget(panel_widget)
-            except Exception:
-                logger.exception("Ошибка создания панели свойств для типа %s", action_type)
-                self.add_action_panel = None
+        if action_type is self._add_panel_for_type:
+            return
+        self._add_panel_for_type = action_type
+        panel, index, _defaults = self._cached_panel(self._add_panel_cache, self.add_dynamic_stack, action_type)
+        self.add_action_panel = panel
+        self._show_stack_page(self.add_dynamic_stack, index)
     
     def _create_properties_widget(self) -> QWidget:
         """Создать виджет свойств действия (динамический)"""
@@ -275,79 +439,36 @@ class RightPanel(QWidget):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(10)
+        # Пока форма собирается, layout не пересчитывается на каждый addWidget
+        layout.setEnabled(False)
         
         # Заголовок
         self.prop_title = QLabel("⚙ Свойства действия")
-        self.prop_title.setStyleSheet("font-size: 16px; font-weight: bold; color: #e67e22;")
+        self.prop_title.setObjectName("actionPropsTitle")
         layout.addWidget(self.prop_title)
         
         # Горячие клавиши подсказка
         self.prop_shortcut_label = QLabel("Cmd+Shift+R — захват координат")
-        self.prop_shortcut_label.setStyleSheet("""
-            color: #999999;
-            font-size: 11px;
-            padding: 4px;
-        """)
+        self.prop_shortcut_label.setObjectName("shortcutHint")
         layout.addWidget(self.prop_shortcut_label)
-        layout.addWidget(self._create_separator())
+        layout.addWidget(_HLine())
         
         # Scroll area для динамического контента
         self.prop_scroll = QScrollArea()
         self.prop_scroll.setWidgetResizable(True)
         self.prop_scroll.setMinimumHeight(260)
+        self._setup_static_scroll(self.prop_scroll)
         
         self.prop_content = QWidget()
         self.prop_content_layout = QVBoxLayout(self.prop_content)
+        self.prop_content_layout.setEnabled(False)
         self.prop_content_layout.setSpacing(10)
-        
-        self.prop_scroll.setWidget(self.prop_content)
-        layout.addWidget(self.prop_scroll)
-        
-        # Кнопка удаления
-        delete_btn = QPushButton("🗑 Удалить действие")
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #c0392b;
-                color: white;
-                padding: 8px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #e74c3c;
-            }
-        """)
-        delete_btn.clicked.connect(self._on_delete_action)
-        layout.addWidget(delete_btn)
-        
-        return widget
-    
-    def _update_properties_panel(self):
-        """Обновить панель свойств в соответствии с типом действия"""
-        if not self.current_action:
-            return
-        
-        # Проверка что layout существует
-        if getattr(self, "prop_content_layout", None) is None:
-            return
 
-        # Сохранить текущие значения из панели перед обновлением
-        if self.current_action_panel:
-            try:
-                self.current_action.metadata = self.current_action_panel.get_values()
-            except Exception:
-                pass
-
-        # Очистить текущий контент
-        while self.prop_content_layout.count():
-            item = self.prop_content_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        action_type = self.current_action.action_type
-        
-        # Общие поля
-        self.prop_name_input = QLineEdit(self.current_action.name)
-        self.prop_name_input.textChanged.connect(self._on_name_changed)
+        # Общие поля строятся один раз; при смене действия меняются только
+        # значения, видимость групп и панель параметров типа.
+        self.prop_name_input = QLineEdit()
+        self.prop_name_input.textEdited.connect(lambda text: self._queue_text("name", text))
+        self.prop_name_input.editingFinished.connect(self._flush_pending_text)
         name_group = QGroupBox("Название")
         name_layout = QVBoxLayout()
         name_layout.addWidget(self.prop_name_input)
@@ -355,129 +476,77 @@ class RightPanel(QWidget):
         self.prop_content_layout.addWidget(name_group)
         
         self.prop_enabled_cb = QCheckBox("Включено")
-        self.prop_enabled_cb.setChecked(self.current_action.enabled)
-        self.prop_enabled_cb.stateChanged.connect(self._on_enabled_changed)
+        self.prop_enabled_cb.toggled.connect(self._on_enabled_changed)
         self.prop_content_layout.addWidget(self.prop_enabled_cb)
         
         # Поля для координат (для действий с координатами)
-        if action_type in [ActionType.MOUSE_CLICK, ActionType.MOUSE_MOVE, 
-                           ActionType.WAIT_PIXEL_COLOR, ActionType.WAIT_PIXEL_CHANGE]:
-            coord_group = QGroupBox("📍 Координаты")
-            coord_layout = QFormLayout()
-            
-            self.prop_x_spin = QSpinBox()
-            self.prop_x_spin.setRange(-32768, 32767)
-            
-            self.prop_y_spin = QSpinBox()
-            self.prop_y_spin.setRange(-32768, 32767)
-            
-            if self.current_action.coordinates:
-                self.prop_x_spin.setValue(self.current_action.coordinates.x)
-                self.prop_y_spin.setValue(self.current_action.coordinates.y)
-
-            # Подключаем сигналы только после установки стартовых значений,
-            # чтобы не затирать координаты при построении панели.
-            self.prop_x_spin.valueChanged.connect(self._on_coordinates_changed)
-            self.prop_y_spin.valueChanged.connect(self._on_coordinates_changed)
-            
-            self.prop_capture_btn = QPushButton("📍 Захватить")
-            self.prop_capture_btn.setToolTip("Cmd+Shift+R для захвата координат")
-            self.prop_capture_btn.setMinimumHeight(32)
-            self.prop_capture_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3498db;
-                    color: white;
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }
-                QPushButton:hover {
-                    background-color: #2980b9;
-                }
-            """)
-            self.prop_capture_btn.clicked.connect(self._capture_coordinates)
-            
-            coord_layout.addRow("X:", self.prop_x_spin)
-            coord_layout.addRow("Y:", self.prop_y_spin)
-            coord_layout.addRow(self.prop_capture_btn)
-            coord_group.setLayout(coord_layout)
-            self.prop_content_layout.addWidget(coord_group)
+        self.prop_coord_group = QGroupBox("📍 Координаты")
+        coord_layout = QFormLayout()
+        
+        self.prop_x_spin = QSpinBox()
+        self.prop_x_spin.setRange(-32768, 32767)
+        self._connect_prop_spin(self.prop_x_spin, "x")
+        
+        self.prop_y_spin = QSpinBox()
+        self.prop_y_spin.setRange(-32768, 32767)
+        self._connect_prop_spin(self.prop_y_spin, "y")
+        
+        self.prop_capture_btn = QPushButton("📍 Захватить")
+        self.prop_capture_btn.setToolTip("Cmd+Shift+R для захвата координат")
+        self.prop_capture_btn.setMinimumHeight(32)
+        self.prop_capture_btn.setObjectName("captureButton")
+        self.prop_capture_btn.clicked.connect(self._capture_coordinates)
+        
+        coord_layout.addRow("X:", self.prop_x_spin)
+        coord_layout.addRow("Y:", self.prop_y_spin)
+        coord_layout.addRow(self.prop_capture_btn)
+        self.prop_coord_group.setLayout(coord_layout)
+        self.prop_content_layout.addWidget(self.prop_coord_group)
         
         # Поле для клавиши (для KEY_PRESS)
-        if action_type == ActionType.KEY_PRESS:
-            key_group = QGroupBox("⌨ Клавиша")
-            key_layout = QFormLayout()
-            
-            key_input_layout = QHBoxLayout()
-            self.prop_key_input = QLineEdit()
-            self.prop_key_input.setPlaceholderText("Введите или запишите клавишу")
-            self.prop_key_input.setReadOnly(False)
-            self.prop_key_input.textChanged.connect(self._on_key_changed)
-            
-            if self.current_action.key:
-                self.prop_key_input.setText(self.current_action.key)
-            
-            self.prop_key_clear_btn = QPushButton("✕")
-            self.prop_key_clear_btn.setMaximumWidth(30)
-            self.prop_key_clear_btn.setToolTip("Очистить")
-            self.prop_key_clear_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #e74c3c;
-                    color: white;
-                    padding: 8px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #c0392b;
-                }
-            """)
-            self.prop_key_clear_btn.clicked.connect(self._clear_key_input)
-            
-            self.prop_key_record_btn = QPushButton("⌨ Записать")
-            self.prop_key_record_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #9b59b6;
-                    color: white;
-                    padding: 8px 15px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #8e44ad;
-                }
-            """)
-            self.prop_key_record_btn.clicked.connect(self._open_key_recorder)
-            
-            key_input_layout.addWidget(self.prop_key_input)
-            key_input_layout.addWidget(self.prop_key_clear_btn)
-            key_input_layout.addWidget(self.prop_key_record_btn)
-            key_layout.addRow("Клавиша:", key_input_layout)
-            key_group.setLayout(key_layout)
-            self.prop_content_layout.addWidget(key_group)
-        
-        # Динамическая панель для типа действия
-        self.current_action_panel = get_panel(action_type)
-        if self.current_action_panel:
-            try:
-                panel_widget = self.current_action_panel.create_panel(self)
-                self.prop_content_layout.addWidget(panel_widget)
-                
-                # Загрузить сохранённые значения
-                if self.current_action.metadata:
-                    self.current_action_panel.set_values(self.current_action.metadata)
-            except Exception:
-                logger.exception("Ошибка создания панели свойств для %s", action_type)
-                self.current_action_panel = None
-        else:
-            fallback_group = QGroupBox("Параметры")
-            fallback_layout = QVBoxLayout()
-            fallback_label = QLabel("Для этого действия дополнительные параметры отсутствуют.")
-            fallback_label.setWordWrap(True)
-            fallback_layout.addWidget(fallback_label)
-            fallback_group.setLayout(fallback_layout)
-            self.prop_content_layout.addWidget(fallback_group)
+        self.prop_key_group = QGroupBox("⌨ Клавиша")
+        key_layout = QFormLayout()
+        
+        key_input_layout = QHBoxLayout()
+        self.prop_key_input = QLineEdit()
+        self.prop_key_input.setPlaceholderText("Введите или запишите клавишу")
+        self.prop_key_input.setReadOnly(False)
+        self.prop_key_input.textEdited.connect(lambda text: self._queue_text("key", text))
+        self.prop_key_input.editingFinished.connect(self._flush_pending_text)
+        
+        self.prop_key_clear_btn = QPushButton("✕")
+        self.prop_key_clear_btn.setMaximumWidth(30)
+        self.prop_key_clear_btn.setToolTip("Очистить")
+        self.prop_key_clear_btn.setObjectName("keyClearButton")
+        self.prop_key_clear_btn.clicked.connect(self._clear_key_input)
+        
+        self.prop_key_record_btn = QPushButton("⌨ Записать")
+        self.prop_key_record_btn.setObjectName("keyRecordButton")
+        self.prop_key_record_btn.clicked.connect(self._open_key_recorder)
+        
+        key_input_layout.addWidget(self.prop_key_input)
+        key_input_layout.addWidget(self.prop_key_clear_btn)
+        key_input_layout.addWidget(self.prop_key_record_btn)
+        key_layout.addRow("Клавиша:", key_input_layout)
+        self.prop_key_group.setLayout(key_layout)
+        self.prop_content_layout.addWidget(self.prop_key_group)
+
+        # Панели параметров типа: по одной на тип, переиспользуются между действиями.
+        # Страница 0 — заглушка для типов без панели.
+        self._prop_panel_cache = {}
+        # (тип, запись кэша) показанной формы — при выборе действия того же типа
+        # меняются только значения, без поиска в кэше и пересчёта layout
+        self._prop_panel_entry = (None, (None, 0, {}))
+        self.prop_dynamic_stack = QStackedWidget()
+        self.prop_content_layout.addWidget(self.prop_dynamic_stack)
+
+        fallback_group = QGroupBox("Параметры")
+        fallback_layout = QVBoxLayout()
+        fallback_label = QLabel("Для этого действия дополнительные параметры отсутствуют.")
+        fallback_label.setWordWrap(True)
+        fallback_layout.addWidget(fallback_label)
+        fallback_group.setLayout(fallback_layout)
+        self.prop_dynamic_stack.addWidget(fallback_group)
         
         # Задержки
         delay_group = QGroupBox("⏱ Задержки (мс)")
@@ -485,13 +554,11 @@ class RightPanel(QWidget):
         
         self.prop_delay_before_spin = QSpinBox()
         self.prop_delay_before_spin.setRange(0, 60000)
-        self.prop_delay_before_spin.setValue(self.current_action.delay_before_ms)
-        self.prop_delay_before_spin.valueChanged.connect(self._on_delay_before_changed)
+        self._connect_prop_spin(self.prop_delay_before_spin, "delay_before_ms")
         
         self.prop_delay_after_spin = QSpinBox()
         self.prop_delay_after_spin.setRange(0, 60000)
-        self.prop_delay_after_spin.setValue(self.current_action.delay_after_ms)
-        self.prop_delay_after_spin.valueChanged.connect(self._on_delay_after_changed)
+        self._connect_prop_spin(self.prop_delay_after_spin, "delay_after_ms")
         
         delay_layout.addRow("Перед действием:", self.prop_delay_before_spin)
         delay_layout.addRow("После действия:", self.prop_delay_after_spin)
@@ -504,14 +571,129 @@ class RightPanel(QWidget):
         
         self.prop_repeat_spin = QSpinBox()
         self.prop_repeat_spin.setRange(1, 1000)
-        self.prop_repeat_spin.setValue(self.current_action.repeat_count)
-        self.prop_repeat_spin.valueChanged.connect(self._on_repeat_changed)
+        self._connect_prop_spin(self.prop_repeat_spin, "repeat_count")
         
         repeat_layout.addRow("Количество:", self.prop_repeat_spin)
         repeat_group.setLayout(repeat_layout)
         self.prop_content_layout.addWidget(repeat_group)
 
         self.prop_content_layout.addStretch()
+        self.prop_content_layout.setEnabled(True)
+        
+        self.prop_scroll.setWidget(self.prop_content)
+        layout.addWidget(self.prop_scroll)
+        
+        # Кнопка удаления
+        delete_btn = QPushButton("🗑 Удалить действие")
+        delete_btn.setObjectName("deleteButton")
+        delete_btn.clicked.connect(self._on_delete_action)
+        layout.addWidget(delete_btn)
+        
+        layout.setEnabled(True)
+        layout.activate()
+        return widget
+
+    def _cached_panel(self, cache: dict, stack: QStackedWidget, action_type: ActionType):
+        """Панель параметров типа из кэша: (panel, индекс страницы, defaults).
+
+        Панель создаётся один раз на тип и добавляется страницей в stack;
+        defaults — её начальные значения, чтобы сбрасывать поля при повторном использовании.
+        Для типов без панели возвращается страница 0.
+        """
+        entry = cache.get(action_type)
+        if entry is not None:
+            return entry
+        entry = (None, 0, {})
+        panel = get_panel(action_type)
+        if panel:
+            widget = panel.create_panel(self)
+            widget.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+            entry = (panel, stack.addWidget(widget), panel.get_values())
+        cache[action_type] = entry
+        return entry
+
+    @staticmethod
+    def _setup_static_scroll(scroll: QScrollArea):
+        """Scroll area с редко меняющимся содержимым.
+
+        Размер по содержимому считается один раз при первом показе, а не при
+        каждой смене панели; при ресайзе перерисовывается только открывшаяся область.
+        """
+        scroll.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContentsOnFirstShow)
+        scroll.viewport().setAttribute(Qt.WidgetAttribute.WA_StaticContents, True)
+
+    @staticmethod
+    def _show_stack_page(stack: QStackedWidget, index: int):
+        """Переключить страницу; размер стека считается только по видимой странице."""
+        current = stack.currentWidget()
+        page = stack.widget(index)
+        if page is current:
+            return
+        # QStackedWidget берёт sizeHint по всем страницам, кроме Ignored
+        current.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        page.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
+        stack.setCurrentIndex(index)
+
+    def _commit_panel_values(self):
+        """Сохранить значения панели параметров в действие, которое она показывает."""
+        if self.current_action and self.current_action_panel:
+            self.current_action.metadata.update(self.current_action_panel.get_values())
+
+    def _update_properties_panel(self):
+        """Обновить панель свойств в соответствии с типом действия"""
+        action = self.current_action
+        if not action:
+            return
+        
+        # Проверка что layout существует
+        if getattr(self, "prop_content_layout", None) is None:
+            return
+
+        if self._prop_panel_entry[0] is action.action_type:
+            # Тип тот же: группы и панель параметров уже на месте, геометрия не меняется
+            self._fill_properties_values(action)
+            return
+
+        # Все правки формы применяются одним проходом layout и одной перерисовкой
+        with _batched_relayout(self.prop_content):
+            self._show_properties_type(action.action_type)
+            self._fill_properties_values(action)
+
+    def _show_properties_type(self, action_type: ActionType):
+        """Показать в форме свойств группы и панель параметров для типа действия."""
+        self.prop_coord_group.setVisible(action_type in _COORD_ACTIONS)
+        self.prop_key_group.setVisible(action_type == ActionType.KEY_PRESS)
+
+        entry = self._cached_panel(self._prop_panel_cache, self.prop_dynamic_stack, action_type)
+        self._prop_panel_entry = (action_type, entry)
+        self.current_action_panel = entry[0]
+        self._show_stack_page(self.prop_dynamic_stack, entry[1])
+
+    def _fill_properties_values(self, action: Action):
+        """Заполнить форму свойств значениями действия (тип уже показан)."""
+        with QSignalBlocker(self.prop_name_input):
+            self.prop_name_input.setText(action.name)
+        with QSignalBlocker(self.prop_enabled_cb):
+            self.prop_enabled_cb.setChecked(action.enabled)
+
+        if action.coordinates:
+            with QSignalBlocker(self.prop_x_spin), QSignalBlocker(self.prop_y_spin):
+                self.prop_x_spin.setValue(action.coordinates.x)
+                self.prop_y_spin.setValue(action.coordinates.y)
+
+        with QSignalBlocker(self.prop_key_input):
+            self.prop_key_input.setText(action.key or "")
+
+        panel, _index, defaults = self._prop_panel_entry[1]
+        if panel:
+            # Сначала значения по умолчанию, чтобы не остались поля прошлого действия
+            panel.set_values({**defaults, **(action.metadata or {})})
+
+        with QSignalBlocker(self.prop_delay_before_spin), QSignalBlocker(self.prop_delay_after_spin), \
+                QSignalBlocker(self.prop_repeat_spin):
+            self.prop_delay_before_spin.setValue(action.delay_before_ms)
+            self.prop_delay_after_spin.setValue(action.delay_after_ms)
+            self.prop_repeat_spin.setValue(action.repeat_count)
 
     def _create_row_properties_widget(self) -> QWidget:
         """Создать виджет свойств строки"""
@@ -522,15 +704,16 @@ class RightPanel(QWidget):
         
         # Заголовок
         title = QLabel("📋 Свойства строки")
-        title.setStyleSheet("font-size: 16px; font-weight: bold; color: #9b59b6;")
+        title.setObjectName("rowPropsTitle")
         layout.addWidget(title)
         
         # Разделитель
-        layout.addWidget(self._create_separator())
+        layout.addWidget(_HLine())
         
         # Название строки
         self.row_name_input = QLineEdit()
-        self.row_name_input.textChanged.connect(self._on_row_name_changed)
+        self.row_name_input.textEdited.connect(lambda text: self._queue_text("row_name", text))
+        self.row_name_input.editingFinished.connect(self._flush_pending_text)
         name_group = QGroupBox("Название строки")
         name_layout = QVBoxLayout()
         name_layout.addWidget(self.row_name_input)
@@ -539,24 +722,14 @@ class RightPanel(QWidget):
         
         # Enabled
         self.row_enabled_cb = QCheckBox("Включена")
-        self.row_enabled_cb.stateChanged.connect(self._on_row_enabled_changed)
+        self.row_enabled_cb.toggled.connect(self._on_row_enabled_changed)
         layout.addWidget(self.row_enabled_cb)
         
         layout.addStretch()
         
         # Кнопка удаления строки
         delete_row_btn = QPushButton("🗑 Удалить строку")
-        delete_row_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #c0392b;
-                color: white;
-                padding: 8px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #e74c3c;
-            }
-        """)
+        delete_row_btn.setObjectName("deleteButton")
         delete_row_btn.clicked.connect(self._on_delete_row)
         layout.addWidget(delete_row_btn)
         
@@ -570,7 +743,7 @@ class RightPanel(QWidget):
         
         empty_label = QLabel("Выберите действие\nили строку для редактирования\n\nИли добавьте новое действие")
         empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        empty_label.setStyleSheet("color: #888; font-size: 14px;")
+        empty_label.setObjectName("emptyHint")
         layout.addWidget(empty_label)
         
         # Кнопка добавления действия
@@ -582,41 +755,29 @@ class RightPanel(QWidget):
         
         return widget
     
-    def _create_separator(self) -> QFrame:
-        """Создать разделитель"""
-        line = QFrame()
-        line.setFrameShape(QFrame.Shape.HLine)
-        line.setStyleSheet("background-color: #444;")
-        line.setMaximumHeight(1)
-        return line
-    
     def _populate_action_types(self):
         """Заполнить комбобокс типами действий"""
-        types = [
-            (ActionType.MOUSE_CLICK, "🖱 Клик мышью"),
-            (ActionType.MOUSE_MOVE, "➡ Перемещение мыши"),
-            (ActionType.KEY_PRESS, "⌨ Нажатие клавиши"),
-            (ActionType.WAIT_TIME, "⏱ Ожидание времени"),
-            (ActionType.WAIT_PIXEL_COLOR, "🎨 Ожидание цвета пикселя"),
-            (ActionType.WAIT_PIXEL_CHANGE, "🔄 Ожидание изменения"),
-            (ActionType.WAIT_IMAGE, "🖼 Ожидание изображения"),
-            (ActionType.WAIT_TEXT, "📝 Ожидание текста (OCR)"),
-            (ActionType.CONDITIONAL, "❓ Условное действие"),
-            (ActionType.LOOP, "🔁 Цикл"),
-            (ActionType.SCREENSHOT, "📸 Скриншот"),
-            (ActionType.LOG, "📋 Логирование"),
-            # Действия с базами данных
-            (ActionType.DB_SEARCH, "🔍 Поиск в БД"),
-            (ActionType.DB_GET_VALUE, "📥 Получить из БД"),
-            (ActionType.DB_ITERATE, "🔁 Пройти по БД"),
-            (ActionType.DB_SAVE, "💾 Сохранить в БД"),
-            (ActionType.CHECK_VALUE, "✅ Проверка значения"),
-            # Управление
-            (ActionType.RUN_ROW, "▶ Запустить строку"),
-        ]
-
-        for action_type, display_name in types:
-            self.action_type_combo.addItem(display_name, action_type)
+        self.action_type_combo.setModel(_get_action_type_model())
+
+    def _on_action_type_searched(self, name: str):
+        """Выбор типа из подсказок поиска."""
+        action_type = _NAME_TO_TYPE.get(name)
+        if action_type is not None:
+            self.select_action_type(action_type)
+
+    def _on_action_type_search_entered(self):
+        """Enter в поле поиска: точное имя или первая подсказка."""
+        completer = self.action_type_search.completer()
+        name = self.action_type_search.text()
+        if name not in _NAME_TO_TYPE and completer.completionCount():
+            name = completer.currentCompletion()
+        self._on_action_type_searched(name)
+
+    def select_action_type(self, action_type: ActionType):
+        """Выбрать тип действия в форме добавления."""
+        index = _ACTION_TYPE_INDEX.get(action_type)
+        if index is not None:
+            self.action_type_combo.setCurrentIndex(index)
     
     def _capture_coordinates(self):
         """Захватить текущие координаты"""
@@ -624,16 +785,22 @@ class RightPanel(QWidget):
             pos = self.backend.mouse.get_position()
             
             # Обновить координаты в зависимости от режима
-            if hasattr(self, 'current_action') and self.current_action:
-                # Режим свойств действия
-                if self.current_action.coordinates:
-                    self.current_action.coordinates.x = pos.x
-                    self.current_action.coordinates.y = pos.y
-                if hasattr(self, 'prop_x_spin'):
-                    self.prop_x_spin.setValue(pos.x)
-                if hasattr(self, 'prop_y_spin'):
-                    self.prop_y_spin.setValue(pos.y)
-            elif hasattr(self, 'x_spin'):
+            action = self.current_action
+            if action:
+                # Режим свойств действия: координаты пишем в действие сами,
+                # а спинбоксы обновляем без сигналов, чтобы не ставить правку в очередь.
+                self._flush_pending_spin()
+                if action.coordinates:
+                    action.coordinates.x = pos.x
+                    action.coordinates.y = pos.y
+                if self.prop_x_spin is not None:
+                    with QSignalBlocker(self.prop_x_spin), QSignalBlocker(self.prop_y_spin):
+                        self.prop_x_spin.setValue(pos.x)
+                        self.prop_y_spin.setValue(pos.y)
+                # Вместе с правками, ждавшими в очереди, — одно уведомление сразу
+                self._notify_action_modified(action)
+                self._emit_pending_modified()
+            else:
                 # Режим добавления действия
                 self.x_spin.setValue(pos.x)
                 self.y_spin.setValue(pos.y)
@@ -651,17 +818,19 @@ class RightPanel(QWidget):
     def _on_keys_recorded(self, keys_str: str):
         """Обработать записанные клавиши"""
         self.key_input.setText(keys_str)
-        if hasattr(self, "prop_key_input"):
+        if self.prop_key_input is not None:
             self.prop_key_input.setText(keys_str)
+            self._queue_text("key", keys_str)
+            self._flush_pending_text()
 
     def _clear_key_input(self):
         """Очистить поле ввода клавиши"""
         self.key_input.clear()
-        if hasattr(self, "prop_key_input"):
+        if self.prop_key_input is not None:
             self.prop_key_input.clear()
         if self.current_action:
             self.current_action.key = None
-            self.action_modified.emit(self.current_action)
+            self._notify_action_modified(self.current_action)
     
     def _add_action(self):
         """Добавить действие"""
@@ -670,7 +839,7 @@ class RightPanel(QWidget):
 
         # Создать действие
         action = Action(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             action_type=action_type,
             name=self.action_name_input.text() or self._get_default_name(action_type),
             enabled=True,
@@ -683,10 +852,7 @@ class RightPanel(QWidget):
         )
 
         if self.add_action_panel:
-            try:
-                action.metadata.update(self.add_action_panel.get_values())
-            except Exception:
-                logger.exception("Ошибка чтения параметров add-панели")
+            action.metadata.update(self.add_action_panel.get_values())
 
         # Добавить в текущую строку (или создать новую)
         if not self.backend.current_board or not self.backend.current_board.rows:
@@ -703,44 +869,45 @@ class RightPanel(QWidget):
     
     def _get_default_name(self, action_type: ActionType) -> str:
         """Получить имя по умолчанию"""
-        names = {
-            ActionType.MOUSE_CLICK: "Клик",
-            ActionType.MOUSE_MOVE: "Перемещение",
-            ActionType.KEY_PRESS: "Нажатие",
-            ActionType.WAIT_TIME: "Ожидание",
-            ActionType.WAIT_PIXEL_COLOR: "Ожидание цвета",
-            ActionType.WAIT_PIXEL_CHANGE: "Ожидание изменения",
-            ActionType.WAIT_IMAGE: "Ожидание изображения",
-            ActionType.WAIT_TEXT: "Ожидание текста",
-            ActionType.CONDITIONAL: "Условие",
-            ActionType.LOOP: "Цикл",
-            ActionType.SCREENSHOT: "Скриншот",
-            ActionType.LOG: "Лог",
-        }
-        return names.get(action_type, "Действие")
+        return _DEFAULT_NAMES.get(action_type, "Действие")
     
     # ===== Переключение режимов =====
     
+    def _ensure_page(self, index: int) -> QWidget:
+        """Построить страницу стека при первом обращении вместо заглушки."""
+        entry = self._page_factories.pop(index, None)
+        if entry is None:
+            return self.stack.widget(index)
+        attr, factory = entry
+        page = factory()
+        placeholder = self.stack.widget(index)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.stack.insertWidget(index, page)
+        setattr(self, attr, page)
+        return page
+
     def _show_add_action(self):
         """Показать режим добавления действия"""
-        self.stack.setCurrentIndex(0)
+        self.stack.setCurrentIndex(_PAGE_ADD)
     
     def _show_properties(self):
         """Показать режим свойств"""
-        self.stack.setCurrentIndex(1)
+        self.stack.setCurrentWidget(self._ensure_page(_PAGE_PROPERTIES))
     
     def _show_row_properties(self):
         """Показать режим свойств строки"""
-        self.stack.setCurrentIndex(2)
+        self.stack.setCurrentWidget(self._ensure_page(_PAGE_ROW))
     
     def _show_empty(self):
         """Показать пустой режим"""
-        self.stack.setCurrentIndex(3)
+        self.stack.setCurrentWidget(self._ensure_page(_PAGE_EMPTY))
     
     # ===== Публичные методы =====
     
     def set_action(self, action: Action):
         """Установить текущее действие для редактирования"""
+        self._commit_pending_edits()
         self.current_row = None
         self.current_action = action
 
@@ -748,30 +915,20 @@ class RightPanel(QWidget):
             self._show_add_action()
             return
 
-        # Принудительно создаём виджет свойств если нужно
-        if getattr(self, "prop_content_layout", None) is None:
-            # Пересоздаём виджет свойств
-            old_widget = self.stack.widget(1)
-            if old_widget:
-                self.stack.removeWidget(old_widget)
-                old_widget.deleteLater()
-            
-            new_widget = self._create_properties_widget()
-            self.stack.insertWidget(1, new_widget)
-            self.properties_widget = new_widget
-
-        # Переключиться на страницу свойств
-        self._show_properties()
+        # Смена страницы и заполнение формы — одна перерисовка панели
+        with _updates_suspended(self):
+            # Переключиться на страницу свойств (при первом вызове она будет построена)
+            self._show_properties()
 
-        # Обновить заголовок
-        if hasattr(self, 'prop_title'):
+            # Обновить заголовок
             self.prop_title.setText(f"⚙ Свойства: {action.name}")
 
-        # Обновить панель свойств
-        self._update_properties_panel()
+            # Обновить панель свойств
+            self._update_properties_panel()
     
     def set_row(self, row: TaskRow):
         """Установить текущую строку для редактирования"""
+        self._commit_pending_edits()
         self.current_action = None
         self.current_row = row
         
@@ -779,80 +936,153 @@ class RightPanel(QWidget):
             self._show_add_action()
             return
         
-        self.row_name_input.setText(row.name)
-        self.row_enabled_cb.setChecked(row.enabled)
-        
-        self._show_row_properties()
+        with _updates_suspended(self):
+            self._ensure_page(_PAGE_ROW)
+            # Заполнение формы не должно возвращаться в строку через сигналы
+            with QSignalBlocker(self.row_name_input), QSignalBlocker(self.row_enabled_cb):
+                self.row_name_input.setText(row.name)
+                self.row_enabled_cb.setChecked(row.enabled)
+
+            self._show_row_properties()
     
     def reset(self):
         """Сбросить выбор"""
+        self._commit_pending_edits()
         self.current_action = None
         self.current_row = None
         self._show_add_action()
     
     # ===== Обработчики изменений свойств =====
     
-    def _on_name_changed(self, text: str):
-        if self.current_action:
-            self.current_action.name = text
-            self.prop_title.setText(f"⚙ Свойства: {text}")
-            self.action_modified.emit(self.current_action)
-    
-    def _on_enabled_changed(self, state):
-        if self.current_action:
-            self.current_action.enabled = state == Qt.CheckState.Checked
-            self.action_modified.emit(self.current_action)
+    def _on_enabled_changed(self, checked: bool):
+        if self.current_action and self.current_action.enabled != checked:
+            self.current_action.enabled = checked
+            self._notify_action_modified(self.current_action)
     
-    def _on_coordinates_changed(self):
-        if self.current_action and self.current_action.coordinates:
-            self.current_action.coordinates.x = self.prop_x_spin.value()
-            self.current_action.coordinates.y = self.prop_y_spin.value()
-            self.action_modified.emit(self.current_action)
+    def _commit_pending_edits(self):
+        """Дописать в текущее действие все отложенные правки перед сменой выбора."""
+        self._flush_pending_spin()
+        self._flush_pending_text()
+        self._commit_panel_values()
+        self._emit_pending_modified()
+
+    def _notify_action_modified(self, action: Action):
+        """Отложить action_modified; серия правок даст одно уведомление."""
+        self._modified_action = action
+        self._emit_timer.start()
+
+    def _notify_row_modified(self, row: TaskRow):
+        """Отложить row_modified; серия правок даст одно уведомление."""
+        self._modified_row = row
+        self._emit_timer.start()
+
+    def _emit_pending_modified(self):
+        """Отправить отложенные уведомления об изменении."""
+        self._emit_timer.stop()
+        action, self._modified_action = self._modified_action, None
+        row, self._modified_row = self._modified_row, None
+        if action is not None:
+            self.action_modified.emit(action)
+        if row is not None:
+            self.row_modified.emit(row)
+
+    def _connect_prop_spin(self, spin: QSpinBox, field: str):
+        """Подключить спинбокс свойства: правки копятся и применяются пачкой.
+
+        Без keyboardTracking набор числа с клавиатуры не шлёт valueChanged на
+        каждую цифру; editingFinished применяет правку сразу.
+        """
+        spin.setKeyboardTracking(False)
+        spin.valueChanged.connect(lambda value: self._queue_spin(field, value))
+        spin.editingFinished.connect(self._flush_pending_spin)
+
+    def _queue_spin(self, field: str, value: int):
+        """Запомнить правку спинбокса; применится в _flush_pending_spin."""
+        self._pending_spin[field] = value
+        self._spin_debounce.start()
+
+    def _flush_pending_spin(self):
+        """Применить накопленные правки спинбоксов (уведомление — через _notify_action_modified).
+
+        Значения, совпадающие с текущими (например, вернули число обратно),
+        не считаются правкой и уведомления не дают.
+        """
+        self._spin_debounce.stop()
+        pending = self._pending_spin
+        if not pending:
+            return
+        self._pending_spin = {}
+        action = self.current_action
+        if not action:
+            return
+        changed = False
+        x = pending.pop("x", None)
+        y = pending.pop("y", None)
+        coords = action.coordinates
+        if coords:
+            if x is not None and coords.x != x:
+                coords.x = x
+                changed = True
+            if y is not None and coords.y != y:
+                coords.y = y
+                changed = True
+        for field, value in pending.items():
+            if getattr(action, field) != value:
+                setattr(action, field, value)
+                changed = True
+        if changed:
+            self._notify_action_modified(action)
+
+    def _queue_text(self, field: str, text: str):
+        """Запомнить ввод в текстовое поле; применится в _flush_pending_text."""
+        self._pending_text[field] = text
+        self._text_debounce.start()
+
+    def _flush_pending_text(self):
+        """Применить отложенный ввод названий и клавиши."""
+        self._text_debounce.stop()
+        pending = self._pending_text
+        if not pending:
+            return
+        self._pending_text = {}
+        action = self.current_action
+        if action:
+            changed = False
+            name = pending.get("name")
+            if name is not None and name != action.name:
+                action.name = name
+                self.prop_title.setText(f"⚙ Свойства: {name}")
+                changed = True
+            key = pending.get("key")
+            if key is not None and key != (action.key or ""):
+                action.key = key
+                changed = True
+            if changed:
+                self._notify_action_modified(action)
+        row = self.current_row
+        name = pending.get("row_name")
+        if row and name is not None and name != row.name:
+            row.name = name
+            self._notify_row_modified(row)
     
     def _on_mouse_button_changed(self, text: str):
-        if self.current_action:
+        if self.current_action and self.current_action.mouse_button != text:
             self.current_action.mouse_button = text
-            self.action_modified.emit(self.current_action)
-    
-    def _on_key_changed(self, text: str):
-        if self.current_action:
-            self.current_action.key = text
-            self.action_modified.emit(self.current_action)
-    
-    def _on_delay_before_changed(self, value: int):
-        if self.current_action:
-            self.current_action.delay_before_ms = value
-            self.action_modified.emit(self.current_action)
-    
-    def _on_delay_after_changed(self, value: int):
-        if self.current_action:
-            self.current_action.delay_after_ms = value
-            self.action_modified.emit(self.current_action)
-    
-    def _on_repeat_changed(self, value: int):
-        if self.current_action:
-            self.current_action.repeat_count = value
-            self.action_modified.emit(self.current_action)
+            self._notify_action_modified(self.current_action)
     
     def _on_delete_action(self):
         """Удалить действие"""
         if self.current_action and self.backend.current_board:
-            for row in self.backend.current_board.rows:
-                if row.remove_action(self.current_action.id):
-                    self.backend.current_board.modified_at = __import__('datetime').datetime.now()
-                    self.action_modified.emit(self.current_action)
-                    self.reset()
-                    break
-    
-    def _on_row_name_changed(self, text: str):
-        if self.current_row:
-            self.current_row.name = text
-            self.row_modified.emit(self.current_row)
+            board = self.backend.current_board
+            if board.remove_action(self.current_action.id):
+                board.modified_at = datetime.now()
+                self.action_modified.emit(self.current_action)
+                self.reset()
     
-    def _on_row_enabled_changed(self, state):
-        if self.current_row:
-            self.current_row.enabled = state == Qt.CheckState.Checked
-            self.row_modified.emit(self.current_row)
+    def _on_row_enabled_changed(self, checked: bool):
+        if self.current_row and self.current_row.enabled != checked:
+            self.current_row.enabled = checked
+            self._notify_row_modified(self.current_row)
     
     def _on_delete_row(self):
         """Удалить строку"""
@@ -2,15 +2,38 @@
 Экранный оверлей для захвата координат и визуализации
 """
 import logging
+from functools import lru_cache
 
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import Qt, QTimer, QPoint
-from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QFont
+from PyQt6.QtCore import Qt, QTimer, QLine, QPoint, QRect
+from PyQt6.QtGui import (
+    QPainter, QColor, QPen, QBrush, QCursor, QFont, QFontMetrics, QPixmap, QRegion, QStaticText
+)
 
 from backend import BackendApplication
 
 logger = logging.getLogger(__name__)
 
+# Радиус прицела и запас под толщину пера
+_CROSSHAIR_SIZE = 20
+_CROSSHAIR_MARGIN = 2
+# Интервал опроса курсора для оверлея, прозрачного для мыши
+_PASSIVE_POLL_MS = 100
+# Панель с координатами в левом верхнем углу
+_INFO_PANEL_RECT = QRect(20, 20, 200, 80)
+
+
+@lru_cache(maxsize=4096)
+def _coord_text(axis: str, value: int) -> QStaticText:
+    """Подпись координаты; QStaticText хранит раскладку глифов между кадрами."""
+    return QStaticText(f"{axis}: {value}")
+
+
+def _crosshair_rect(pos: QPoint) -> QRect:
+    """Область, которую занимает прицел с центром в pos."""
+    extent = _CROSSHAIR_SIZE + _CROSSHAIR_MARGIN
+    return QRect(pos.x() - extent, pos.y() - extent, 2 * extent + 1, 2 * extent + 1)
+
 
 class ScreenOverlay(QWidget):
     """Прозрачный оверлей на весь экран"""
@@ -51,27 +74,70 @@ class ScreenOverlay(QWidget):
         self.mouse_pos = QPoint(0, 0)
         self.is_capturing = True
 
-        # Таймер обновления
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self._update_mouse_pos)
-        self.update_timer.start(50)  # 50ms
+        # Перья, кисти и шрифты создаются один раз, а не в каждом paintEvent
+        self._background_color = QColor(0, 0, 0, 50)
+        self._crosshair_pen = QPen(QColor(255, 0, 0))
+        self._crosshair_pen.setWidth(2)
+        self._crosshair_brush = QBrush(QColor(255, 0, 0, 50))
+        self._crosshair_lines = [QLine(), QLine()]  # переиспользуются каждый кадр
+        self._panel_brush = QBrush(QColor(0, 0, 0, 200))
+        self._panel_pen = QPen(QColor(100, 100, 100))
+        self._text_font = QFont("Consolas", 14)
+        self._small_font = QFont("Consolas", 10)
+        # drawStaticText рисует от верхнего края строки, drawText — от базовой линии
+        self._text_ascent = QFontMetrics(self._text_font).ascent()
+        self._small_ascent = QFontMetrics(self._small_font).ascent()
+        self._hint_text = QStaticText("Нажмите ESC для выхода")
+        # Фон панели координат не меняется — растеризуется один раз
+        self._panel_pixmap = None
+        self._white = QColor(255, 255, 255)
+        self._grey = QColor(150, 150, 150)
+        self._grid_pen = QPen(QColor(255, 255, 255, 30))
+        self._grid_pen.setWidth(1)
+
+        # Интерактивный оверлей получает движения мыши от Qt. Прозрачный для ввода
+        # событий не получает — ему остаётся опрос, пока оверлей показан.
+        self.update_timer = None
+        if self.interactive:
+            self.setMouseTracking(True)
+        else:
+            self.update_timer = QTimer(self)
+            self.update_timer.setInterval(_PASSIVE_POLL_MS)
+            self.update_timer.timeout.connect(self._update_mouse_pos)
     
     def _update_mouse_pos(self):
         """Обновить позицию мыши"""
-        try:
-            pos = self.backend.mouse.get_position()
-            self.mouse_pos = self.mapFromGlobal(QPoint(pos.x, pos.y))
-            self.update()  # Перерисовать
-        except Exception as e:
-            logger.exception("Ошибка обновления позиции мыши")
+        # Для прицела хватает позиции курсора из Qt; бэкенд опрашивается только при захвате
+        self._move_crosshair(self.mapFromGlobal(QCursor.pos()))
+
+    def mouseMoveEvent(self, event):
+        """Движение мыши над интерактивным оверлеем"""
+        self._move_crosshair(event.position().toPoint())
+
+    def _move_crosshair(self, new_pos: QPoint):
+        """Передвинуть прицел и перерисовать только затронутые области"""
+        if new_pos == self.mouse_pos:
+            return
+        # Перерисовать только старый и новый прицел и панель с координатами. QRegion,
+        # а не объединённый прямоугольник: при далёком скачке курсора между ними
+        # оказалась бы почти вся область экрана.
+        dirty = QRegion(_crosshair_rect(self.mouse_pos))
+        dirty = dirty.united(_crosshair_rect(new_pos)).united(_INFO_PANEL_RECT)
+        self.mouse_pos = new_pos
+        self.update(dirty)
     
     def paintEvent(self, event):
         """Отрисовка оверлея"""
+        # Без сглаживания: фон и прямые линии выровнены по пикселям, сглаживание
+        # включается только для круга прицела
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Полупрозрачный фон
-        painter.fillRect(self.rect(), QColor(0, 0, 0, 50))
+        # Полупрозрачный фон — только в перерисовываемой области (painter обрезан по
+        # event.region()). Source: цвет пишется как есть, без смешивания с
+        # очищенным фоном окна.
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(event.rect(), self._background_color)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
         
         # Прицел на курсоре
         self._draw_crosshair(painter, self.mouse_pos)
@@ -84,55 +150,68 @@ class ScreenOverlay(QWidget):
     
     def _draw_crosshair(self, painter: QPainter, pos: QPoint):
         """Нарисовать прицел"""
-        pen = QPen(QColor(255, 0, 0))
-        pen.setWidth(2)
-        painter.setPen(pen)
-        
-        size = 20
+        painter.setPen(self._crosshair_pen)
         
-        # Горизонтальная линия
-        painter.drawLine(pos.x() - size, pos.y(), pos.x() + size, pos.y())
+        size = _CROSSHAIR_SIZE
+        x, y = pos.x(), pos.y()
         
-        # Вертикальная линия
-        painter.drawLine(pos.x(), pos.y() - size, pos.x(), pos.y() + size)
+        # Горизонтальная и вертикальная линии одним вызовом
+        horizontal, vertical = self._crosshair_lines
+        horizontal.setLine(x - size, y, x + size, y)
+        vertical.setLine(x, y - size, x, y + size)
+        painter.drawLines(self._crosshair_lines)
         
         # Круг вокруг курсора
-        painter.setBrush(QBrush(QColor(255, 0, 0, 50)))
+        painter.setBrush(self._crosshair_brush)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         painter.drawEllipse(pos, size, size)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
     
     def _draw_coordinates(self, painter: QPainter):
         """Нарисовать координаты"""
         # Панель с координатами
-        panel_x = 20
-        panel_y = 20
-        panel_width = 200
-        panel_height = 80
+        panel_x = _INFO_PANEL_RECT.x()
+        panel_y = _INFO_PANEL_RECT.y()
+        panel_width = _INFO_PANEL_RECT.width()
+        panel_height = _INFO_PANEL_RECT.height()
         
         # Фон панели
-        painter.setBrush(QBrush(QColor(0, 0, 0, 200)))
-        painter.setPen(QPen(QColor(100, 100, 100)))
-        painter.drawRoundedRect(panel_x, panel_y, panel_width, panel_height, 10, 10)
+        if self._panel_pixmap is None:
+            self._panel_pixmap = self._render_panel_pixmap(panel_width, panel_height)
+        # Пиксмап на 1px шире с каждой стороны: обводка выходит за край прямоугольника
+        painter.drawPixmap(panel_x - 1, panel_y - 1, self._panel_pixmap)
         
         # Текст
-        painter.setPen(QColor(255, 255, 255))
-        font = QFont("Consolas", 14)
-        painter.setFont(font)
+        painter.setPen(self._white)
+        painter.setFont(self._text_font)
         
-        text_y = panel_y + 30
-        painter.drawText(panel_x + 15, text_y, f"X: {self.mouse_pos.x()}")
-        painter.drawText(panel_x + 15, text_y + 25, f"Y: {self.mouse_pos.y()}")
+        text_x = panel_x + 15
+        text_y = panel_y + 30  # базовая линия первой строки
+        painter.drawStaticText(text_x, text_y - self._text_ascent, _coord_text("X", self.mouse_pos.x()))
+        painter.drawStaticText(text_x, text_y + 25 - self._text_ascent, _coord_text("Y", self.mouse_pos.y()))
         
         # Инструкция
-        small_font = QFont("Consolas", 10)
-        painter.setFont(small_font)
-        painter.setPen(QColor(150, 150, 150))
-        painter.drawText(panel_x + 15, text_y + 50, "Нажмите ESC для выхода")
+        painter.setFont(self._small_font)
+        painter.setPen(self._grey)
+        painter.drawStaticText(text_x, text_y + 50 - self._small_ascent, self._hint_text)
     
+    def _render_panel_pixmap(self, width: int, height: int) -> QPixmap:
+        """Растеризовать фон панели координат (скруглённый прямоугольник с рамкой)."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round((width + 2) * ratio), round((height + 2) * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setBrush(self._panel_brush)
+        painter.setPen(self._panel_pen)
+        painter.drawRoundedRect(1, 1, width, height, 10, 10)
+        painter.end()
+        return pixmap
+
     def _draw_grid(self, painter: QPainter):
         """Нарисовать сетку"""
-        pen = QPen(QColor(255, 255, 255, 30))
-        pen.setWidth(1)
-        painter.setPen(pen)
+        painter.setPen(self._grid_pen)
         
         grid_size = 100
         
@@ -172,14 +251,24 @@ class ScreenOverlay(QWidget):
     
     def showEvent(self, event):
         """При показе окна"""
+        self._update_mouse_pos()
+        if self.update_timer is not None:
+            self.update_timer.start()
         if self.interactive:
             self.activateWindow()
             self.setFocus()
     
+    def hideEvent(self, event):
+        """Скрытый оверлей не опрашивает мышь"""
+        if self.update_timer is not None:
+            self.update_timer.stop()
+        super().hideEvent(event)
+
     def closeEvent(self, event):
         """При закрытии"""
         try:
-            self.update_timer.stop()
+            if self.update_timer is not None:
+                self.update_timer.stop()
         except Exception as e:
             logger.exception("Ошибка при закрытии оверлея")
         finally:
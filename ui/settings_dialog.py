@@ -7,9 +7,9 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QListWidget, QListWidgetItem,
     QGroupBox, QFormLayout, QFileDialog, QComboBox,
-    QScrollArea, QWidget, QLineEdit
+    QScrollArea, QStackedWidget, QLineEdit
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QUrl
+from PyQt6.QtCore import Qt, pyqtSignal, QSignalBlocker, QUrl
 from PyQt6.QtGui import QDesktopServices
 
 
@@ -25,6 +25,9 @@ class SettingsDialog(QDialog):
         self.setMinimumSize(600, 500)
         
         self.databases = databases or []
+        # Путь -> имя файла для списка; считается один раз на базу.
+        # Ключи словаря заодно служат множеством путей для проверки дубликатов
+        self._db_names = {path: os.path.basename(path) for path in self.databases}
         self.db_list = None  # Будет создан при показе панели БД
         
         self._init_ui()
@@ -52,14 +55,21 @@ class SettingsDialog(QDialog):
         self.settings_list.currentRowChanged.connect(self._on_category_changed)
         layout.addWidget(self.settings_list)
         
-        # Scroll area для панелей настроек
+        # Scroll area для панелей настроек; панели строятся при первом
+        # открытии категории и дальше только переключаются в стеке
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
         
-        self.settings_content = QWidget()
-        self.settings_layout = QVBoxLayout(self.settings_content)
+        self.settings_stack = QStackedWidget()
+        self._panels = {}
+        self._panel_builders = {
+            0: self._build_database_settings,
+            1: self._build_theme_settings,
+            2: self._build_hotkey_settings,
+            3: self._build_path_settings,
+        }
         
-        self.scroll.setWidget(self.settings_content)
+        self.scroll.setWidget(self.settings_stack)
         layout.addWidget(self.scroll)
         
         # Кнопки
@@ -91,32 +101,20 @@ class SettingsDialog(QDialog):
         # Показать первую категорию по умолчанию
         self.settings_list.setCurrentRow(0)
     
-    def _clear_settings_layout(self):
-        """Очистить layout настроек"""
-        while self.settings_layout.count():
-            item = self.settings_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-    
     def _on_category_changed(self, index: int):
         """Изменение категории настроек"""
-        self._clear_settings_layout()
-        
-        # Показать нужную панель
-        if index == 0:
-            self._show_database_settings()
-        elif index == 1:
-            self._show_theme_settings()
-        elif index == 2:
-            self._show_hotkey_settings()
-        elif index == 3:
-            self._show_path_settings()
+        panel = self._panels.get(index)
+        if panel is None:
+            builder = self._panel_builders.get(index)
+            if builder is None:
+                return
+            # Панель строится один раз: введённые значения сохраняются между переключениями
+            panel = self._panels[index] = builder()
+            self.settings_stack.addWidget(panel)
+        self.settings_stack.setCurrentWidget(panel)
     
-    def _show_database_settings(self):
-        """Показать настройки баз данных"""
-        # Сначала очистить текущий layout
-        self._clear_settings_layout()
-        
+    def _build_database_settings(self) -> QGroupBox:
+        """Построить панель настроек баз данных"""
         group = QGroupBox("📊 Базы данных (Excel)")
         layout = QVBoxLayout()
 
@@ -129,12 +127,9 @@ class SettingsDialog(QDialog):
         # Список баз данных
         self.db_list = QListWidget()
         self.db_list.setMinimumHeight(200)
-
-        for db_path in self.databases:
-            item = QListWidgetItem(f"📄 {os.path.basename(db_path)}")
-            item.setToolTip(db_path)
-            item.setData(Qt.ItemDataRole.UserRole, db_path)
-            self.db_list.addItem(item)
+        # Все строки одной высоты: список не измеряет каждую при раскладке
+        self.db_list.setUniformItemSizes(True)
+        self._fill_database_list()
 
         layout.addWidget(self.db_list)
 
@@ -157,9 +152,27 @@ class SettingsDialog(QDialog):
 
         layout.addLayout(btn_layout)
         group.setLayout(layout)
-
-        self.settings_layout.addWidget(group)
+        return group
     
+    def _fill_database_list(self):
+        """Заполнить список баз одной пачкой: без перерисовок и сигналов на каждую строку"""
+        db_list = self.db_list
+        db_names = self._db_names
+        db_list.setUpdatesEnabled(False)
+        try:
+            with QSignalBlocker(db_list):
+                for db_path in self.databases:
+                    self._add_database_item(db_path, db_names[db_path])
+        finally:
+            db_list.setUpdatesEnabled(True)
+
+    def _add_database_item(self, db_path: str, name: str):
+        """Добавить строку базы данных в список"""
+        item = QListWidgetItem(f"📄 {name}")
+        item.setToolTip(db_path)
+        item.setData(Qt.ItemDataRole.UserRole, db_path)
+        self.db_list.addItem(item)
+
     def _add_database(self):
         """Добавить базу данных"""
         filepath, _ = QFileDialog.getOpenFileName(
@@ -168,10 +181,12 @@ class SettingsDialog(QDialog):
         )
         
         if filepath:
-            if filepath not in self.databases:
+            if filepath not in self._db_names:
                 self.databases.append(filepath)
-                # Полностью пересоздать панель настроек БД
-                self._show_database_settings()
+                name = self._db_names[filepath] = os.path.basename(filepath)
+                # Дописать одну строку, не пересоздавая панель
+                self._add_database_item(filepath, name)
+                self.db_list.setCurrentRow(self.db_list.count() - 1)
     
     def _remove_database(self):
         """Удалить базу данных"""
@@ -181,7 +196,7 @@ class SettingsDialog(QDialog):
         current_item = self.db_list.currentItem()
         if current_item:
             db_path = current_item.data(Qt.ItemDataRole.UserRole)
-            if db_path in self.databases:
+            if self._db_names.pop(db_path, None) is not None:
                 self.databases.remove(db_path)
             row = self.db_list.row(current_item)
             self.db_list.takeItem(row)
@@ -197,8 +212,8 @@ class SettingsDialog(QDialog):
             if db_path and os.path.exists(db_path):
                 QDesktopServices.openUrl(QUrl.fromLocalFile(db_path))
     
-    def _show_theme_settings(self):
-        """Показать настройки темы"""
+    def _build_theme_settings(self) -> QGroupBox:
+        """Построить панель настроек темы"""
         group = QGroupBox("🎨 Тема оформления")
         layout = QFormLayout()
         
@@ -220,10 +235,10 @@ class SettingsDialog(QDialog):
         
         layout.addRow(color_layout)
         group.setLayout(layout)
-        self.settings_layout.addWidget(group)
+        return group
     
-    def _show_hotkey_settings(self):
-        """Показать настройки горячих клавиш"""
+    def _build_hotkey_settings(self) -> QGroupBox:
+        """Построить панель настроек горячих клавиш"""
         group = QGroupBox("⌨ Горячие клавиши")
         layout = QFormLayout()
         
@@ -246,10 +261,10 @@ class SettingsDialog(QDialog):
         layout.addRow(note)
         
         group.setLayout(layout)
-        self.settings_layout.addWidget(group)
+        return group
     
-    def _show_path_settings(self):
-        """Показать настройки путей"""
+    def _build_path_settings(self) -> QGroupBox:
+        """Построить панель настроек путей"""
         group = QGroupBox("📁 Пути по умолчанию")
         layout = QFormLayout()
         
@@ -278,7 +293,7 @@ class SettingsDialog(QDialog):
         layout.addRow("Проекты:", proj_layout)
         
         group.setLayout(layout)
-        self.settings_layout.addWidget(group)
+        return group
     
     def _save_settings(self):
         """Сохранить настройки"""
@@ -419,6 +419,86 @@ QFrame#actionChipFrame:hover {
     background-color: #4c5052;
     border-color: #6c7275;
 }
+/* ===== Правая панель ===== */
+QLabel#addActionTitle {
+    font-size: 14px;
+    font-weight: bold;
+}
+
+QLabel#actionPropsTitle {
+    font-size: 16px;
+    font-weight: bold;
+    color: #e67e22;
+}
+
+QLabel#rowPropsTitle {
+    font-size: 16px;
+    font-weight: bold;
+    color: #9b59b6;
+}
+
+QLabel#shortcutHint {
+    color: #999999;
+    font-size: 11px;
+    padding: 4px;
+}
+
+QLabel#emptyHint {
+    color: #888888;
+    font-size: 14px;
+}
+
+QFrame#panelSeparator {
+    background-color: #444444;
+}
+
+QPushButton#captureButton {
+    background-color: #3498db;
+    color: white;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+    font-size: 13px;
+}
+
+QPushButton#captureButton:hover {
+    background-color: #2980b9;
+}
+
+QPushButton#keyClearButton {
+    background-color: #e74c3c;
+    color: white;
+    padding: 8px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+
+QPushButton#keyClearButton:hover {
+    background-color: #c0392b;
+}
+
+QPushButton#keyRecordButton {
+    background-color: #9b59b6;
+    color: white;
+    padding: 8px 15px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+
+QPushButton#keyRecordButton:hover {
+    background-color: #8e44ad;
+}
+
+QPushButton#deleteButton {
+    background-color: #c0392b;
+    color: white;
+    padding: 8px;
+    border-radius: 4px;
+}
+
+QPushButton#deleteButton:hover {
+    background-color: #e74c3c;
+}
 """
 
 # ===== Светлая тема =====
@@ -517,11 +597,104 @@ QPushButton#dangerButton {
 QPushButton#dangerButton:hover {
     background-color: #e53935;
 }
+/* ===== Правая панель ===== */
+QLabel#addActionTitle {
+    font-size: 14px;
+    font-weight: bold;
+}
+
+QLabel#actionPropsTitle {
+    font-size: 16px;
+    font-weight: bold;
+    color: #e67e22;
+}
+
+QLabel#rowPropsTitle {
+    font-size: 16px;
+    font-weight: bold;
+    color: #9b59b6;
+}
+
+QLabel#shortcutHint {
+    color: #999999;
+    font-size: 11px;
+    padding: 4px;
+}
+
+QLabel#emptyHint {
+    color: #888888;
+    font-size: 14px;
+}
+
+QFrame#panelSeparator {
+    background-color: #cccccc;
+}
+
+QPushButton#captureButton {
+    background-color: #3498db;
+    color: white;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+    font-size: 13px;
+}
+
+QPushButton#captureButton:hover {
+    background-color: #2980b9;
+}
+
+QPushButton#keyClearButton {
+    background-color: #e74c3c;
+    color: white;
+    padding: 8px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+
+QPushButton#keyClearButton:hover {
+    background-color: #c0392b;
+}
+
+QPushButton#keyRecordButton {
+    background-color: #9b59b6;
+    color: white;
+    padding: 8px 15px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+
+QPushButton#keyRecordButton:hover {
+    background-color: #8e44ad;
+}
+
+QPushButton#deleteButton {
+    background-color: #c0392b;
+    color: white;
+    padding: 8px;
+    border-radius: 4px;
+}
+
+QPushButton#deleteButton:hover {
+    background-color: #e74c3c;
+}
 """
 
 
+# Тема -> готовая строка stylesheet; неизвестная тема даёт тёмную
+STYLESHEETS = {
+    "dark": PROFESSIONAL_DARK_STYLESHEET,
+    "light": PROFESSIONAL_LIGHT_STYLESHEET,
+}
+
+
 def get_stylesheet(theme: str = "dark") -> str:
     """Получить stylesheet по теме"""
-    if theme == "light":
-        return PROFESSIONAL_LIGHT_STYLESHEET
-    return PROFESSIONAL_DARK_STYLESHEET
+    return STYLESHEETS.get(theme, PROFESSIONAL_DARK_STYLESHEET)
+
+
+def apply_stylesheet(widget, theme: str = "dark"):
+    """Применить тему к виджету; повторное применение той же темы не перепарсивает QSS."""
+    if widget.property("appliedTheme") == theme:
+        return
+    widget.setStyleSheet(get_stylesheet(theme))
+    widget.setProperty("appliedTheme", theme)
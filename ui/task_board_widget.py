@@ -4,18 +4,142 @@
 
 import logging
 import uuid
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import replace
+from functools import partial
+from typing import Optional
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QScrollArea,
+    QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QStackedWidget,
     QFrame, QLabel, QPushButton, QCheckBox, QMenu, QSizePolicy, QApplication
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QPoint, QMimeData
-from PyQt6.QtGui import QDrag
+from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QRect, QMimeData, QSignalBlocker, QTimer
+from PyQt6.QtGui import QDrag, QPainter
 
 from backend import BackendApplication, TaskBoard, TaskRow, Action, ActionType, Coordinates
 
 logger = logging.getLogger(__name__)
 
+# Ширина строки доски, пока она ни разу не собиралась (TaskRowWidget: 280..350)
+_ROW_ESTIMATED_WIDTH = 280
+_ROW_SPACING = 8
+# Сколько строк держать собранными за каждым краем видимой области
+_ROW_OVERSCAN = 1
+# Не чаще одного пересчёта позиции вставки за кадр (~60 Гц) при перетаскивании
+_DRAG_HOVER_MS = 16
+
+# Иконка чипа и имя нового действия по типу
+_ACTION_META = {
+    ActionType.MOUSE_CLICK: ("🖱", "Клик мышью"),
+    ActionType.MOUSE_MOVE: ("➡", "Перемещение"),
+    ActionType.KEY_PRESS: ("⌨", "Нажатие клавиши"),
+    ActionType.WAIT_TIME: ("⏱", "Ожидание"),
+    ActionType.WAIT_PIXEL_COLOR: ("🎨", "Ожидание цвета"),
+    ActionType.WAIT_PIXEL_CHANGE: ("🔄", "Ожидание изменения"),
+    ActionType.WAIT_IMAGE: ("🖼", "Ожидание изображения"),
+    ActionType.WAIT_TEXT: ("📝", "Ожидание текста"),
+    ActionType.CONDITIONAL: ("❓", "Условие"),
+    ActionType.LOOP: ("🔁", "Цикл"),
+    ActionType.SCREENSHOT: ("📸", "Скриншот"),
+    ActionType.LOG: ("📋", "Лог"),
+    # Действия с базами данных
+    ActionType.DB_SEARCH: ("🔍", "Поиск в БД"),
+    ActionType.DB_GET_VALUE: ("📥", "Получить из БД"),
+    ActionType.DB_ITERATE: ("🔁", "Пройти по БД"),
+    ActionType.DB_SAVE: ("💾", "Сохранить в БД"),
+    ActionType.CHECK_VALUE: ("✅", "Проверка значения"),
+    # Управление
+    ActionType.RUN_ROW: ("▶", "Запустить строку"),
+}
+_DEFAULT_ACTION_META = ("•", "Действие")
+
+
+def _action_meta(action_type: ActionType) -> tuple:
+    """(иконка, имя по умолчанию) для типа действия"""
+    return _ACTION_META.get(action_type, _DEFAULT_ACTION_META)
+
+
+# Типы, которым при создании подставляется текущая позиция мыши
+_COORD_ACTIONS = frozenset({
+    ActionType.MOUSE_CLICK, ActionType.MOUSE_MOVE,
+    ActionType.WAIT_PIXEL_COLOR, ActionType.WAIT_PIXEL_CHANGE,
+})
+
+
+# Стили строк и чипов задаются один раз на доске (дочерние виджеты — по objectName);
+# состояние выбирается свойством state, поэтому переключение enabled — это только
+# repolish виджета
+_BOARD_STYLESHEET = """
+    TaskRowWidget[state="on"] {
+        background-color: #323232;
+        border: 1px solid #5c6265;
+        border-radius: 4px;
+    }
+    TaskRowWidget[state="off"] {
+        background-color: #2b2b2b;
+        border: 1px dashed #5c6265;
+        border-radius: 4px;
+    }
+    ActionChip[state="on"] {
+        background-color: #3c3f41;
+        border: 1px solid #5c6265;
+        border-radius: 3px;
+    }
+    ActionChip[state="on"]:hover {
+        background-color: #4c5052;
+    }
+    ActionChip[state="off"] {
+        background-color: #2b2b2b;
+        border: 1px dashed #5c6265;
+        border-radius: 3px;
+    }
+    QLabel#rowName {
+        font-weight: bold;
+    }
+    QLabel#chipName {
+        font-size: 12px;
+        font-weight: bold;
+    }
+    QLabel#chipDetail {
+        color: #888;
+        font-size: 10px;
+    }
+    QPushButton#chipDeleteButton {
+        background-color: transparent;
+        color: #888;
+        border: none;
+        font-size: 14px;
+    }
+    QPushButton#chipDeleteButton:hover {
+        background-color: #c0392b;
+        color: white;
+        border-radius: 3px;
+    }
+"""
+
+
+@contextmanager
+def _updates_suspended(widget: QWidget):
+    """Не перерисовывать widget, пока пересобираются его дочерние виджеты.
+
+    Включение обратно само ставит в очередь одну update() на весь виджет.
+    """
+    widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        widget.setUpdatesEnabled(True)
+
+
+def _set_style_state(widget: QWidget, enabled: bool):
+    """Выставить свойство state для _BOARD_STYLESHEET и перерисовать виджет в новом стиле."""
+    widget.setProperty("state", "on" if enabled else "off")
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
 
 class TaskBoardWidget(QWidget):
     """Виджет task-доски"""
@@ -27,11 +151,21 @@ class TaskBoardWidget(QWidget):
     def __init__(self, backend: BackendApplication):
         super().__init__()
         self.backend = backend
+        # Виджеты собираются только для строк в видимой области прокрутки:
+        # row.id -> виджет для собранных строк, пул — свободные виджеты для повторного bind
+        self._row_widgets = {}
+        self._row_pool = []
+        self._row_widths = {}  # row.id -> измеренная ширина
+        # Доска и окно собранных строк (число строк, first, last) при последней синхронизации
+        self._rows_window_board = None
+        self._rows_window = None
         self._init_ui()
         self.refresh()
     
     def _init_ui(self):
         """Инициализация UI"""
+        self.setStyleSheet(_BOARD_STYLESHEET)
+
         layout = QVBoxLayout(self)
         layout.setContentsMargins(8, 8, 8, 8)
         layout.setSpacing(8)
@@ -66,55 +200,142 @@ class TaskBoardWidget(QWidget):
         self.rows_container = QWidget()
         self.rows_layout = QHBoxLayout(self.rows_container)
         self.rows_layout.setContentsMargins(0, 0, 0, 0)
-        self.rows_layout.setSpacing(8)
+        self.rows_layout.setSpacing(_ROW_SPACING)
+
+        # Распорки на месте несобранных строк слева и справа от видимых:
+        # общая ширина контейнера (и диапазон прокрутки) остаётся как у всей доски
+        self._lead_spacer = QWidget()
+        self._lead_spacer.hide()
+        self.rows_layout.addWidget(self._lead_spacer)
+        self._trail_spacer = QWidget()
+        self._trail_spacer.hide()
+        self.rows_layout.addWidget(self._trail_spacer)
         self.rows_layout.addStretch()
 
         self.scroll_area.setWidget(self.rows_container)
-        layout.addWidget(self.scroll_area)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self._update_visible_rows)
+
+        # Пустая доска: отдельная страница стека, строки и распорки её не касаются
+        self.empty_label = QLabel("Нет активной доски\nСоздайте новую или откройте существующую")
+        self.empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.empty_label.setStyleSheet("color: gray; font-size: 14px;")
+
+        self._stack = QStackedWidget()
+        self._stack.addWidget(self.empty_label)  # 0 — нет доски
+        self._stack.addWidget(self.scroll_area)  # 1 — строки доски
+        layout.addWidget(self._stack)
     
     def refresh(self):
         """Обновить отображение доски"""
-        # Очистить текущие строки
-        while self.rows_layout.count() > 1:  # 1 = stretch
-            item = self.rows_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        if not self.backend.current_board:
-            # Пустая доска
-            empty_label = QLabel("Нет активной доски\nСоздайте новую или откройте существующую")
-            empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            empty_label.setStyleSheet("color: gray; font-size: 14px;")
-            self.rows_layout.insertWidget(0, empty_label)
+        board = self.backend.current_board
+        self._stack.setCurrentIndex(0 if board is None else 1)
+        if board is not None:
+            # Обновить заголовок
+            self.title_label.setText(f"Task-доска: {board.name}")
+        self._update_visible_rows(rebind=True)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_visible_rows()
+
+    def _update_visible_rows(self, *_args, rebind: bool = False):
+        """Собрать виджеты для строк в видимой области, остальные вернуть в пул.
+
+        rebind=True — строки могли измениться: уже собранные виджеты
+        заново привязываются к своим строкам.
+        """
+        board = self.backend.current_board
+        rows = board.rows if board else []
+
+        # Начало каждой строки по измеренным (или оценочным) ширинам
+        widths = self._row_widths
+        starts = []
+        x = 0
+        for row in rows:
+            starts.append(x)
+            x += widths.get(row.id, _ROW_ESTIMATED_WIDTH) + _ROW_SPACING
+        total = x
+
+        left = self.scroll_area.horizontalScrollBar().value()
+        right = left + self.scroll_area.viewport().width()
+        first = max(0, bisect_right(starts, left) - 1 - _ROW_OVERSCAN)
+        last = min(len(rows), bisect_left(starts, right) + _ROW_OVERSCAN)
+
+        window = (len(rows), first, last)
+        if not rebind and board is self._rows_window_board and window == self._rows_window:
+            # Прокрутка внутри уже собранного окна: контейнер не трогаем,
+            # QScrollArea сдвигает готовое изображение и дорисовывает только открывшуюся полосу
             return
-
-        # Обновить заголовок
-        self.title_label.setText(f"Task-доска: {self.backend.current_board.name}")
-
-        # Добавить строки
-        for row in self.backend.current_board.rows:
-            row_widget = TaskRowWidget(row, self.backend)
-            row_widget.action_selected.connect(self.action_selected.emit)
-            row_widget.row_selected.connect(self.row_selected.emit)
-            row_widget.row_modified.connect(self.board_modified.emit)
-            row_widget.delete_requested.connect(self._delete_row)
-            self.rows_layout.insertWidget(
-                self.rows_layout.count() - 1,
-                row_widget
-            )
+        self._rows_window_board = board
+        self._rows_window = window
+        visible = rows[first:last]
+
+        with _updates_suspended(self.rows_container):
+            # Освободить виджеты строк, ушедших из видимой области
+            keep = {row.id for row in visible}
+            for row_id in [row_id for row_id in self._row_widgets if row_id not in keep]:
+                widget = self._row_widgets.pop(row_id)
+                self.rows_layout.removeWidget(widget)
+                widget.hide()
+                self._row_pool.append(widget)
+
+            offset = self.rows_layout.indexOf(self._lead_spacer) + 1
+            for i, row in enumerate(visible):
+                widget = self._row_widgets.get(row.id)
+                if widget is None:
+                    widget = self._take_row_widget(row)
+                    self._row_widgets[row.id] = widget
+                elif rebind:
+                    widget.bind(row)
+                if self.rows_layout.indexOf(widget) != offset + i:
+                    self.rows_layout.removeWidget(widget)
+                    self.rows_layout.insertWidget(offset + i, widget)
+                widget.show()
+                hint = widget.sizeHint().width()
+                widths[row.id] = max(widget.minimumWidth(), min(widget.maximumWidth(), hint))
+
+            # Распорки: ширина несобранных строк минус интервал до самой распорки
+            lead = starts[first] - _ROW_SPACING if first > 0 else 0
+            trail = total - starts[last] - _ROW_SPACING if last < len(rows) else 0
+            self._set_spacer(self._lead_spacer, lead)
+            self._set_spacer(self._trail_spacer, trail)
+
+    @staticmethod
+    def _set_spacer(spacer: QWidget, width: int):
+        if width > 0:
+            spacer.setFixedWidth(width)
+            spacer.show()
+        else:
+            spacer.hide()
+
+    def _take_row_widget(self, row: TaskRow) -> 'TaskRowWidget':
+        """Виджет строки из пула (привязанный к row) или новый."""
+        if self._row_pool:
+            widget = self._row_pool.pop()
+            widget.bind(row)
+            return widget
+        widget = TaskRowWidget(row, self.backend)
+        widget.action_selected.connect(self.action_selected.emit)
+        widget.row_selected.connect(self.row_selected.emit)
+        widget.row_modified.connect(self._emit_modified)
+        widget.delete_requested.connect(self._delete_row)
+        return widget
+
+    def _emit_modified(self):
+        """Показать изменения доски и сообщить о них: один refresh на правку."""
+        self.refresh()
+        self.board_modified.emit()
 
     def _add_row(self):
         """Добавить новую строку"""
-        row = self.backend.add_row()
-        self.refresh()
-        self.board_modified.emit()
+        self.backend.add_row()
+        self._emit_modified()
 
     def _delete_row(self, row_id: str):
         """Удалить строку"""
         if self.backend.current_board:
             self.backend.current_board.remove_row(row_id)
-            self.refresh()
-            self.board_modified.emit()
+            self._emit_modified()
 
 
 class TaskRowWidget(QFrame):
@@ -125,14 +346,49 @@ class TaskRowWidget(QFrame):
     row_modified = pyqtSignal()
     delete_requested = pyqtSignal(str)  # row_id
 
+    # Пункты меню "+ Действие": (текст, тип действия)
+    _ACTION_MENU_ITEMS = (
+        ("🖱 Клик", ActionType.MOUSE_CLICK),
+        ("➡ Перемещение", ActionType.MOUSE_MOVE),
+        ("⌨ Клавиша", ActionType.KEY_PRESS),
+        ("⏱ Ожидание времени", ActionType.WAIT_TIME),
+        ("🎨 Ожидание цвета", ActionType.WAIT_PIXEL_COLOR),
+        ("🔄 Ожидание изменения", ActionType.WAIT_PIXEL_CHANGE),
+        ("🖼 Ожидание изображения", ActionType.WAIT_IMAGE),
+        ("📝 Текст (OCR)", ActionType.WAIT_TEXT),
+        ("❓ Условие", ActionType.CONDITIONAL),
+        ("🔁 Цикл", ActionType.LOOP),
+        ("📸 Скриншот", ActionType.SCREENSHOT),
+        ("📋 Лог", ActionType.LOG),
+        # Действия с базами данных
+        ("🔍 Поиск в БД", ActionType.DB_SEARCH),
+        ("📥 Получить из БД", ActionType.DB_GET_VALUE),
+        ("🔁 Пройти по БД", ActionType.DB_ITERATE),
+        ("💾 Сохранить в БД", ActionType.DB_SAVE),
+        ("✅ Проверка значения", ActionType.CHECK_VALUE),
+        # Управление
+        ("▶ Запустить строку", ActionType.RUN_ROW),
+    )
+
     def __init__(self, row: TaskRow, backend: BackendApplication):
         super().__init__()
         self.row = row
         self.backend = backend
         self._drag_hover_index = -1
+        # Последняя позиция dragMoveEvent; обрабатывается таймером раз в кадр
+        self._pending_hover_pos = None
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(_DRAG_HOVER_MS)
+        self._hover_timer.timeout.connect(self._update_drag_hover)
+        self._action_chips = []  # чипы в порядке row.actions
+        # Центры чипов по y для поиска позиции вставки; None — пересчитать
+        self._chip_centers_y = None
+        self._add_action_menu = None
+        self._styled_enabled = None  # row.enabled, для которого выставлен стиль
 
         self._init_ui()
-        self._update_style()
+        self.bind(row)
 
     def _init_ui(self):
         """Инициализация UI"""
@@ -150,13 +406,13 @@ class TaskRowWidget(QFrame):
 
         # Checkbox enabled
         self.enabled_cb = QCheckBox()
-        self.enabled_cb.setChecked(self.row.enabled)
-        self.enabled_cb.stateChanged.connect(self._on_enabled_changed)
+        self.enabled_cb.toggled.connect(self._on_enabled_changed)
         header_layout.addWidget(self.enabled_cb)
 
         # Название строки (кликом можно выбрать строку)
-        self.name_label = QLabel(self.row.name)
-        self.name_label.setStyleSheet("font-weight: bold; cursor: pointer;")
+        self.name_label = QLabel()
+        self.name_label.setObjectName("rowName")
+        self.name_label.setCursor(Qt.CursorShape.PointingHandCursor)
         self.name_label.mousePressEvent = lambda e: self._on_row_click()
         header_layout.addWidget(self.name_label)
 
@@ -178,84 +434,121 @@ class TaskRowWidget(QFrame):
         # Контейнер действий (вертикальное расположение)
         self.actions_layout = QVBoxLayout()
         self.actions_layout.setSpacing(5)
+        self.actions_layout.addStretch()
         layout.addLayout(self.actions_layout)
 
-        # Обновить действия
+    def bind(self, row: TaskRow):
+        """Показать в виджете строку row (виджеты строк переиспользуются доской)"""
+        self.row = row
+        with QSignalBlocker(self.enabled_cb):
+            self.enabled_cb.setChecked(row.enabled)
+        self.name_label.setText(row.name)
+        if self._styled_enabled != row.enabled:
+            self._update_style()
         self._refresh_actions()
 
     def _update_style(self):
         """Обновить стиль в зависимости от состояния"""
-        if self.row.enabled:
-            self.setStyleSheet("""
-                TaskRowWidget {
-                    background-color: #323232;
-                    border: 1px solid #5c6265;
-                    border-radius: 4px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                TaskRowWidget {
-                    background-color: #2b2b2b;
-                    border: 1px dashed #5c6265;
-                    border-radius: 4px;
-                }
-            """)
+        self._styled_enabled = self.row.enabled
+        _set_style_state(self, self.row.enabled)
     
     def _refresh_actions(self):
-        """Обновить отображение действий"""
-        # Очистить
-        while self.actions_layout.count():
-            item = self.actions_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        # Добавить действия
-        for action in self.row.actions:
-            action_widget = ActionChip(action, self.backend, self.row)
-            action_widget.selected.connect(self.action_selected.emit)
-            action_widget.modified.connect(self.row_modified.emit)
-            action_widget.delete_requested.connect(self._delete_action)
-            self.actions_layout.addWidget(action_widget)
+        """Обновить отображение действий.
+
+        Чипы сопоставляются с действиями по action.id: существующие
+        перепривязываются и при необходимости переставляются. Чипы удалённых
+        действий перепривязываются к новым, так что при перепривязке строки
+        к другой TaskRow виджеты не пересоздаются; новые чипы создаются и
+        лишние удаляются, только когда меняется количество действий.
+        """
+        actions = self.row.actions
+        chips = self._action_chips
+        if len(chips) == len(actions) and all(c.action.id == a.id for c, a in zip(chips, actions)):
+            # Состав и порядок те же: только обновить подписи; строка перерисуется,
+            # лишь если какая-то подпись действительно изменилась
+            for i, (chip, action) in enumerate(zip(chips, actions)):
+                chip.bind(action, self.row)
+                chip._index = i
+            self._chip_centers_y = None
+            return
 
-        self.actions_layout.addStretch()
+        with _updates_suspended(self):
+            reusable = {}
+            spare = []  # чипы без пары по id — перепривязываются к новым действиям
+            for chip in self._action_chips:
+                if chip.action.id in reusable:
+                    spare.append(chip)
+                else:
+                    reusable[chip.action.id] = chip
+            action_ids = {action.id for action in actions}
+            for action_id in [i for i in reusable if i not in action_ids]:
+                spare.append(reusable.pop(action_id))
+            spare.reverse()  # pop() берёт чипы в исходном порядке
+
+            layout = self.actions_layout
+            chips = []
+            for i, action in enumerate(actions):
+                chip = reusable.pop(action.id, None)
+                if chip is None and spare:
+                    chip = spare.pop()
+                if chip is None:
+                    chip = ActionChip(action, self.backend, self.row)
+                    chip.selected.connect(self.action_selected.emit)
+                    chip.modified.connect(self.row_modified.emit)
+                    chip.delete_requested.connect(self._delete_action)
+                    chip.moved.connect(self._on_chip_moved)
+                else:
+                    chip.bind(action, self.row)
+                chip._index = i
+                if layout.indexOf(chip) != i:
+                    layout.removeWidget(chip)
+                    layout.insertWidget(i, chip)
+                chips.append(chip)
+
+            for chip in spare:
+                self._discard_chip(chip)
+            self._action_chips = chips
+            self._chip_centers_y = None
+
+    def _move_chip(self, src: int, dst: int):
+        """Переставить чип вслед за действием (row.actions уже изменён), без пересборки."""
+        chips = self._action_chips
+        actions = self.row.actions
+        if len(chips) != len(actions) or src >= len(chips) or chips[src].action is not actions[dst]:
+            # Список действий меняли в обход виджета — полная синхронизация
+            self._refresh_actions()
+            return
+        chip = chips.pop(src)
+        chips.insert(dst, chip)
+        self.actions_layout.removeWidget(chip)
+        self.actions_layout.insertWidget(dst, chip)
+        for i in range(min(src, dst), max(src, dst) + 1):
+            chips[i]._index = i
+        self._chip_centers_y = None
+
+    def _on_chip_moved(self, src: int, dst: int):
+        self._move_chip(src, dst)
+        self.row_modified.emit()
+
+    def _discard_chip(self, chip: 'ActionChip'):
+        self.actions_layout.removeWidget(chip)
+        chip.hide()
+        chip.deleteLater()
     
     def _show_add_action_menu(self):
         """Показать меню добавления действия"""
-        menu = QMenu(self)
-
-        actions = [
-            ("🖱 Клик", ActionType.MOUSE_CLICK),
-            ("➡ Перемещение", ActionType.MOUSE_MOVE),
-            ("⌨ Клавиша", ActionType.KEY_PRESS),
-            ("⏱ Ожидание времени", ActionType.WAIT_TIME),
-            ("🎨 Ожидание цвета", ActionType.WAIT_PIXEL_COLOR),
-            ("🔄 Ожидание изменения", ActionType.WAIT_PIXEL_CHANGE),
-            ("🖼 Ожидание изображения", ActionType.WAIT_IMAGE),
-            ("📝 Текст (OCR)", ActionType.WAIT_TEXT),
-            ("❓ Условие", ActionType.CONDITIONAL),
-            ("🔁 Цикл", ActionType.LOOP),
-            ("📸 Скриншот", ActionType.SCREENSHOT),
-            ("📋 Лог", ActionType.LOG),
-            # Действия с базами данных
-            ("🔍 Поиск в БД", ActionType.DB_SEARCH),
-            ("📥 Получить из БД", ActionType.DB_GET_VALUE),
-            ("🔁 Пройти по БД", ActionType.DB_ITERATE),
-            ("💾 Сохранить в БД", ActionType.DB_SAVE),
-            ("✅ Проверка значения", ActionType.CHECK_VALUE),
-            # Управление
-            ("▶ Запустить строку", ActionType.RUN_ROW),
-        ]
-
-        for text, action_type in actions:
-            action = menu.addAction(text)
-            action.triggered.connect(lambda checked, at=action_type: self._add_action(at))
+        menu = self._add_action_menu
+        if menu is None:
+            # Меню строится один раз на виджет строки и переиспользуется
+            menu = self._add_action_menu = QMenu(self)
+            for text, action_type in self._ACTION_MENU_ITEMS:
+                menu.addAction(text).triggered.connect(partial(self._add_action, action_type))
 
         # Показать меню под кнопкой "+ Действие"
         # Используем фиксированную позицию вместо sender()
         menu.exec(self.mapToGlobal(self.pos()))
     
-    def _add_action(self, action_type: ActionType):
+    def _add_action(self, action_type: ActionType, _checked: bool = False):
         """Добавить действие"""
         action = Action(
             id=str(uuid.uuid4()),
@@ -265,8 +558,7 @@ class TaskRowWidget(QFrame):
         )
 
         # Если требуется координата - получить текущую позицию мыши
-        if action_type in [ActionType.MOUSE_CLICK, ActionType.MOUSE_MOVE,
-                           ActionType.WAIT_PIXEL_COLOR, ActionType.WAIT_PIXEL_CHANGE]:
+        if action_type in _COORD_ACTIONS:
             action.coordinates = self.backend.mouse.get_position()
 
         # Добавляем действие напрямую в строку
@@ -276,27 +568,7 @@ class TaskRowWidget(QFrame):
     
     def _get_action_name(self, action_type: ActionType) -> str:
         """Получить имя действия по типу"""
-        names = {
-            ActionType.MOUSE_CLICK: "Клик мышью",
-            ActionType.MOUSE_MOVE: "Перемещение",
-            ActionType.KEY_PRESS: "Нажатие клавиши",
-            ActionType.WAIT_TIME: "Ожидание",
-            ActionType.WAIT_PIXEL_COLOR: "Ожидание цвета",
-            ActionType.WAIT_PIXEL_CHANGE: "Ожидание изменения",
-            ActionType.WAIT_IMAGE: "Ожидание изображения",
-            ActionType.WAIT_TEXT: "Ожидание текста",
-            ActionType.CONDITIONAL: "Условие",
-            ActionType.LOOP: "Цикл",
-            ActionType.SCREENSHOT: "Скриншот",
-            ActionType.LOG: "Лог",
-            ActionType.DB_SEARCH: "Поиск в БД",
-            ActionType.DB_GET_VALUE: "Получить из БД",
-            ActionType.DB_ITERATE: "Пройти по БД",
-            ActionType.DB_SAVE: "Сохранить в БД",
-            ActionType.CHECK_VALUE: "Проверка значения",
-            ActionType.RUN_ROW: "Запустить строку",
-        }
-        return names.get(action_type, "Действие")
+        return _action_meta(action_type)[1]
     
     def _delete_action(self, action_id: str):
         """Удалить действие"""
@@ -304,9 +576,9 @@ class TaskRowWidget(QFrame):
         self._refresh_actions()
         self.row_modified.emit()
     
-    def _on_enabled_changed(self, state):
+    def _on_enabled_changed(self, checked: bool):
         """Изменение enabled"""
-        self.row.enabled = state == Qt.CheckState.Checked
+        self.row.enabled = checked
         self._update_style()
         self.row_modified.emit()
 
@@ -318,44 +590,96 @@ class TaskRowWidget(QFrame):
         """Удалить строку"""
         self.delete_requested.emit(self.row.id)
 
-    def _action_widgets(self):
-        widgets = []
-        for i in range(self.actions_layout.count()):
-            item = self.actions_layout.itemAt(i)
-            widget = item.widget() if item else None
-            if isinstance(widget, ActionChip):
-                widgets.append(widget)
-        return widgets
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._chip_centers_y = None
 
     def _drop_index_for_pos(self, pos: QPoint) -> int:
-        widgets = self._action_widgets()
-        for idx, widget in enumerate(widgets):
-            if pos.y() < widget.geometry().center().y():
-                return idx
-        return len(widgets)
+        centers = self._chip_centers_y
+        if centers is None:
+            # Чипы идут сверху вниз, поэтому список центров уже отсортирован
+            centers = self._chip_centers_y = [
+                chip.geometry().center().y() for chip in self._action_chips
+            ]
+        return bisect_right(centers, pos.y())
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasFormat("application/x-ahk-action-id"):
+            # Геометрия могла поменяться без resize строки: центры считаются заново на каждое перетаскивание
+            self._chip_centers_y = None
             event.acceptProposedAction()
             return
         event.ignore()
 
     def dragMoveEvent(self, event):
         if event.mimeData().hasFormat("application/x-ahk-action-id"):
-            self._drag_hover_index = self._drop_index_for_pos(event.position().toPoint())
+            self._pending_hover_pos = event.position().toPoint()
+            if not self._hover_timer.isActive():
+                self._hover_timer.start()
             event.acceptProposedAction()
             return
         event.ignore()
 
+    def _update_drag_hover(self):
+        """Пересчитать позицию вставки по последнему dragMoveEvent и перерисовать маркер."""
+        pos, self._pending_hover_pos = self._pending_hover_pos, None
+        if pos is not None:
+            self._set_drag_hover_index(self._drop_index_for_pos(pos))
+
+    def _set_drag_hover_index(self, index: int):
+        if index == self._drag_hover_index:
+            return  # маркер на месте — перерисовка не нужна
+        self._drag_hover_index = index
+        self.update()
+
+    def _clear_drag_hover(self):
+        self._hover_timer.stop()
+        self._pending_hover_pos = None
+        self._set_drag_hover_index(-1)
+
+    def _drop_marker_rect(self) -> Optional[QRect]:
+        """Полоса маркера вставки перед чипом _drag_hover_index (или после последнего)."""
+        index = self._drag_hover_index
+        if index < 0:
+            return None
+        area = self.actions_layout.geometry()
+        chips = self._action_chips
+        half_gap = self.actions_layout.spacing() // 2
+        if not chips:
+            y = area.top()
+        elif index < len(chips):
+            y = chips[index].geometry().top() - half_gap - 1
+        else:
+            y = chips[-1].geometry().bottom() + half_gap
+        return QRect(area.left(), y, area.width(), 2)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        rect = self._drop_marker_rect()
+        if rect is not None:
+            painter = QPainter(self)
+            painter.fillRect(rect, self.palette().highlight())
+            painter.end()
+
+    def dragLeaveEvent(self, event):
+        self._clear_drag_hover()
+        super().dragLeaveEvent(event)
+
     def dropEvent(self, event):
+        self._clear_drag_hover()
         mime = event.mimeData()
         if not mime.hasFormat("application/x-ahk-action-id"):
             event.ignore()
             return
 
-        action_id = bytes(mime.data("application/x-ahk-action-id")).decode("utf-8", errors="ignore")
-        source_row_id = bytes(mime.data("application/x-ahk-source-row")).decode("utf-8", errors="ignore")
-        if not action_id or source_row_id != self.row.id:
+        # QByteArray.data() уже отдаёт bytes — без лишней копии через bytes(...);
+        # чужая строка отсекается до декодирования id действия
+        source_row_id = mime.data("application/x-ahk-source-row").data().decode("utf-8", errors="ignore")
+        if source_row_id != self.row.id:
+            event.ignore()
+            return
+        action_id = mime.data("application/x-ahk-action-id").data().decode("utf-8", errors="ignore")
+        if not action_id:
             event.ignore()
             return
 
@@ -376,7 +700,7 @@ class TaskRowWidget(QFrame):
 
             action = self.row.actions.pop(current_index)
             self.row.actions.insert(target_index, action)
-            self._refresh_actions()
+            self._move_chip(current_index, target_index)
             self.row_modified.emit()
             self.action_selected.emit(action)
             event.acceptProposedAction()
@@ -390,6 +714,7 @@ class ActionChip(QFrame):
 
     selected = pyqtSignal(object)  # Action
     modified = pyqtSignal()
+    moved = pyqtSignal(int, int)  # старая и новая позиция в row.actions
     delete_requested = pyqtSignal(str)  # action_id
 
     def __init__(self, action: Action, backend: BackendApplication, row=None):
@@ -398,9 +723,12 @@ class ActionChip(QFrame):
         self.backend = backend
         self.row = row  # Сохраняем ссылку на строку
         self._drag_start_pos = QPoint()
+        self._styled_enabled = None  # action.enabled, для которого выставлен стиль
+        self._context_menu = None
+        self._index = -1  # позиция action в row.actions при последнем _refresh_actions
 
         self._init_ui()
-        self._update_style()
+        self.bind(action, row)
 
     def _init_ui(self):
         """Инициализация UI"""
@@ -413,51 +741,34 @@ class ActionChip(QFrame):
         layout.setSpacing(5)
 
         # Иконка типа
-        icon_label = QLabel(self._get_action_icon())
-        layout.addWidget(icon_label)
-        icon_label.installEventFilter(self)
+        self.icon_label = QLabel()
+        layout.addWidget(self.icon_label)
+        # Подписи прозрачны для мыши: клик и начало перетаскивания получает сам чип
+        self.icon_label.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
 
         # Название и информация
         info_layout = QVBoxLayout()
         info_layout.setSpacing(2)
 
         # Название
-        name_label = QLabel(self.action.name)
-        name_label.setStyleSheet("font-size: 12px; font-weight: bold;")
-        info_layout.addWidget(name_label)
-        name_label.installEventFilter(self)
+        self.name_label = QLabel()
+        self.name_label.setObjectName("chipName")
+        info_layout.addWidget(self.name_label)
+        self.name_label.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
 
         # Доп информация (координаты или клавиша)
-        if self.action.coordinates:
-            coord_label = QLabel(f"({self.action.coordinates.x}, {self.action.coordinates.y})")
-            coord_label.setStyleSheet("color: #888; font-size: 10px;")
-            info_layout.addWidget(coord_label)
-            coord_label.installEventFilter(self)
-        elif self.action.key:
-            key_label = QLabel(f"⌨ {self.action.key}")
-            key_label.setStyleSheet("color: #888; font-size: 10px;")
-            info_layout.addWidget(key_label)
-            key_label.installEventFilter(self)
+        self.detail_label = QLabel()
+        self.detail_label.setObjectName("chipDetail")
+        info_layout.addWidget(self.detail_label)
+        self.detail_label.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
 
         layout.addLayout(info_layout)
         layout.addStretch()
 
         # Кнопка удаления
         delete_btn = QPushButton("×")
+        delete_btn.setObjectName("chipDeleteButton")
         delete_btn.setMaximumWidth(20)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #888;
-                border: none;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-                color: white;
-                border-radius: 3px;
-            }
-        """)
         delete_btn.clicked.connect(self._on_delete)
         layout.addWidget(delete_btn)
 
@@ -468,68 +779,100 @@ class ActionChip(QFrame):
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
 
+    def bind(self, action: Action, row=None):
+        """Показать в чипе действие action (чипы переиспользуются строкой)"""
+        self.action = action
+        self.row = row
+        # Данные для QMimeData при перетаскивании
+        self._action_id_bytes = action.id.encode("utf-8")
+        self._row_id_bytes = row.id.encode("utf-8") if row else b""
+        self.icon_label.setText(self._get_action_icon())
+        self.name_label.setText(action.name)
+        if action.coordinates:
+            detail = f"({action.coordinates.x}, {action.coordinates.y})"
+        elif action.key:
+            detail = f"⌨ {action.key}"
+        else:
+            detail = ""
+        self.detail_label.setText(detail)
+        self.detail_label.setVisible(bool(detail))
+        if self._styled_enabled != action.enabled:
+            self._update_style()
+
     def _show_context_menu(self, pos):
         """Показать контекстное меню для перемещения"""
-        menu = QMenu(self)
-        
-        # Пункты для перемещения вверх/вниз
-        move_up = menu.addAction("⬆ Переместить выше")
-        move_up.triggered.connect(self._move_up)
-        move_up.setEnabled(self._can_move_up())
-        
-        move_down = menu.addAction("⬇ Переместить ниже")
-        move_down.triggered.connect(self._move_down)
-        move_down.setEnabled(self._can_move_down())
-        
-        # Разделитель
-        menu.addSeparator()
-        
-        # Копировать/Удалить
-        copy_action = menu.addAction("📋 Копировать")
-        copy_action.triggered.connect(self._copy_action)
-        
-        delete_action = menu.addAction("🗑 Удалить")
-        delete_action.triggered.connect(self._on_delete)
+        menu = self._context_menu
+        if menu is None:
+            # Меню строится при первом вызове; дальше обновляется только доступность пунктов
+            menu = self._context_menu = QMenu(self)
+            
+            # Пункты для перемещения вверх/вниз
+            self._move_up_action = menu.addAction("⬆ Переместить выше")
+            self._move_up_action.triggered.connect(self._move_up)
+            
+            self._move_down_action = menu.addAction("⬇ Переместить ниже")
+            self._move_down_action.triggered.connect(self._move_down)
+            
+            # Разделитель
+            menu.addSeparator()
+            
+            # Копировать/Удалить
+            menu.addAction("📋 Копировать").triggered.connect(self._copy_action)
+            menu.addAction("🗑 Удалить").triggered.connect(self._on_delete)
         
+        self._move_up_action.setEnabled(self._can_move_up())
+        self._move_down_action.setEnabled(self._can_move_down())
         menu.exec(self.mapToGlobal(pos))
 
+    def _position(self) -> int:
+        """Позиция действия в строке или -1.
+
+        Обычно это индекс, запомненный строкой при последнем _refresh_actions;
+        список действий могли поменять в обход виджета, поэтому индекс
+        проверяется и при промахе ищется заново (по идентичности, без __eq__).
+        """
+        if not self.row:
+            return -1
+        actions = self.row.actions
+        idx = self._index
+        if 0 <= idx < len(actions) and actions[idx] is self.action:
+            return idx
+        idx = next((i for i, a in enumerate(actions) if a is self.action), -1)
+        self._index = idx
+        return idx
+
     def _can_move_up(self) -> bool:
         """Можно ли переместить выше"""
-        if not self.row:
-            return False
-        idx = self.row.actions.index(self.action) if self.action in self.row.actions else -1
-        return idx > 0
+        return self._position() > 0
 
     def _can_move_down(self) -> bool:
         """Можно ли переместить ниже"""
-        if not self.row:
-            return False
-        idx = self.row.actions.index(self.action) if self.action in self.row.actions else -1
-        return idx >= 0 and idx < len(self.row.actions) - 1
+        idx = self._position()
+        return 0 <= idx < len(self.row.actions) - 1
 
     def _move_up(self):
         """Переместить действие выше"""
         try:
-            if self.row and self.action in self.row.actions:
+            idx = self._position()
+            if idx > 0:
+                # Поменять местами с предыдущим
                 actions = self.row.actions
-                idx = actions.index(self.action)
-                if idx > 0:
-                    # Поменять местами с предыдущим
-                    actions[idx], actions[idx - 1] = actions[idx - 1], actions[idx]
-                    self.modified.emit()
+                actions[idx], actions[idx - 1] = actions[idx - 1], actions[idx]
+                self._index = idx - 1
+                self.moved.emit(idx, idx - 1)
         except Exception as e:
             logger.exception("Ошибка перемещения действия вверх")
 
     def _move_down(self):
         """Переместить действие ниже"""
         try:
-            if self.row and self.action in self.row.actions:
+            idx = self._position()
+            if 0 <= idx < len(self.row.actions) - 1:
+                # Поменять местами со следующим
                 actions = self.row.actions
-                idx = actions.index(self.action)
-                if idx >= 0 and idx < len(actions) - 1:
-                    # Поменять местами со следующим
-                    actions[idx], actions[idx + 1] = actions[idx + 1], actions[idx]
-                    self.modified.emit()
+                actions[idx], actions[idx + 1] = actions[idx + 1], actions[idx]
+                self._index = idx + 1
+                self.moved.emit(idx, idx + 1)
         except Exception as e:
             logger.exception("Ошибка перемещения действия вниз")
 
@@ -538,21 +881,19 @@ class ActionChip(QFrame):
         if not self.row:
             return
         try:
-            copy_action = Action(
-                id=str(uuid.uuid4()),
-                action_type=self.action.action_type,
-                name=f"{self.action.name} (copy)",
-                enabled=self.action.enabled,
-                delay_before_ms=self.action.delay_before_ms,
-                delay_after_ms=self.action.delay_after_ms,
-                repeat_count=self.action.repeat_count,
-                coordinates=Coordinates(self.action.coordinates.x, self.action.coordinates.y) if self.action.coordinates else None,
-                color=self.action.color,
-                key=self.action.key,
-                mouse_button=self.action.mouse_button,
-                metadata=dict(self.action.metadata),
+            action = self.action
+            coords = action.coordinates
+            # Остальные поля копируются как есть; свои экземпляры нужны только изменяемым
+            copy_action = replace(
+                action,
+                id=uuid.uuid4().hex,
+                name=f"{action.name} (copy)",
+                coordinates=Coordinates(coords.x, coords.y) if coords else None,
+                metadata=action.metadata.copy(),
             )
-            idx = self.row.actions.index(self.action) if self.action in self.row.actions else len(self.row.actions)
+            idx = self._position()
+            if idx < 0:
+                idx = len(self.row.actions)
             self.row.actions.insert(idx + 1, copy_action)
             self.modified.emit()
         except Exception:
@@ -560,51 +901,12 @@ class ActionChip(QFrame):
 
     def _update_style(self):
         """Обновить стиль"""
-        if self.action.enabled:
-            self.setStyleSheet("""
-                ActionChip {
-                    background-color: #3c3f41;
-                    border: 1px solid #5c6265;
-                    border-radius: 3px;
-                }
-                ActionChip:hover {
-                    background-color: #4c5052;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                ActionChip {
-                    background-color: #2b2b2b;
-                    border: 1px dashed #5c6265;
-                    border-radius: 3px;
-                }
-            """)
+        self._styled_enabled = self.action.enabled
+        _set_style_state(self, self.action.enabled)
     
     def _get_action_icon(self) -> str:
         """Получить иконку действия"""
-        icons = {
-            ActionType.MOUSE_CLICK: "🖱",
-            ActionType.MOUSE_MOVE: "➡",
-            ActionType.KEY_PRESS: "⌨",
-            ActionType.WAIT_TIME: "⏱",
-            ActionType.WAIT_PIXEL_COLOR: "🎨",
-            ActionType.WAIT_PIXEL_CHANGE: "🔄",
-            ActionType.WAIT_IMAGE: "🖼",
-            ActionType.WAIT_TEXT: "📝",
-            ActionType.CONDITIONAL: "❓",
-            ActionType.LOOP: "🔁",
-            ActionType.SCREENSHOT: "📸",
-            ActionType.LOG: "📋",
-            # Действия с базами данных
-            ActionType.DB_SEARCH: "🔍",
-            ActionType.DB_GET_VALUE: "📥",
-            ActionType.DB_ITERATE: "🔁",
-            ActionType.DB_SAVE: "💾",
-            ActionType.CHECK_VALUE: "✅",
-            # Управление
-            ActionType.RUN_ROW: "▶",
-        }
-        return icons.get(self.action.action_type, "•")
+        return _action_meta(self.action.action_type)[0]
     
     def mousePressEvent(self, event):
         """Обработка клика"""
@@ -628,17 +930,10 @@ class ActionChip(QFrame):
 
         drag = QDrag(self)
         mime = QMimeData()
-        mime.setData("application/x-ahk-action-id", self.action.id.encode("utf-8"))
-        mime.setData("application/x-ahk-source-row", self.row.id.encode("utf-8"))
+        mime.setData("application/x-ahk-action-id", self._action_id_bytes)
+        mime.setData("application/x-ahk-source-row", self._row_id_bytes)
         drag.setMimeData(mime)
         drag.exec(Qt.DropAction.MoveAction)
-
-    def eventFilter(self, obj, event):
-        """Клик по дочерним виджетам также выбирает действие."""
-        if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
-            self.selected.emit(self.action)
-            return True
-        return super().eventFilter(obj, event)
     
     def _on_delete(self):
         """Удалить действие"""